@@ -0,0 +1,139 @@
+# api/cache.py
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+from rest_framework.response import Response
+
+from .conditional import BOOKS_VERSION, TableVersionMixin, bump_table_version
+
+
+class LRUResponseCache:
+    """
+    A size-bounded, thread-safe, least-recently-used cache of serialized
+    response data, with hit/miss/eviction counters.
+
+    It lives in process memory: each worker keeps its own entries. Keys
+    include the table version, so a write made through any worker makes
+    every older entry unreachable; `clear()` just frees the memory early.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+            }
+
+
+book_list_cache = LRUResponseCache(max_entries=getattr(settings, 'BOOK_LIST_CACHE_MAX_ENTRIES', 256))
+
+_local = threading.local()
+
+
+def invalidate_book_list():
+    """
+    Bump the books table version and drop cached list responses.
+    Called from api/signals.py after every Book/Author write.
+    """
+    if getattr(_local, 'deferred', False):
+        return
+    bump_table_version(BOOKS_VERSION)
+    # Entries for the old version can no longer be hit; free them now.
+    book_list_cache.clear()
+
+
+@contextmanager
+def deferred_invalidation():
+    """
+    Collapse the per-row invalidations of a bulk write into a single one at
+    the end. Use inside the write's transaction.
+    """
+    _local.deferred = True
+    try:
+        yield
+    finally:
+        _local.deferred = False
+    invalidate_book_list()
+
+
+def normalize_query_params(query_params):
+    """
+    Turn request query parameters into a canonical, hashable form with the
+    keys sorted, so `?search=Orwell&ordering=title` and
+    `?ordering=title&search=Orwell` hit the same entry. Values are kept
+    as-is: an empty `cursor=` or a padded filter value changes the response.
+    """
+    return tuple((key, tuple(query_params.getlist(key))) for key in sorted(query_params))
+
+
+class CachedListMixin(TableVersionMixin):
+    """
+    Serves list responses from `response_cache`, keyed on the table version,
+    the request's scheme and host (the cached Link header holds absolute URLs)
+    and the normalized query parameters. Adds an `X-Cache: HIT/MISS` header.
+    """
+    response_cache = book_list_cache
+    # Pagination headers are part of the cached response
+    cached_headers = ('Link', 'X-Total-Count')
+
+    def get_cache_key(self, request):
+        version, _ = self.get_current_version()
+        return (
+            self.version_name, version, request.scheme, request.get_host(),
+            normalize_query_params(request.query_params),
+        )
+
+    def list(self, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            data, headers = cached
+            response = Response(data, headers=headers)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            headers = {name: response[name] for name in self.cached_headers if name in response}
+            self.response_cache.set(key, (response.data, headers))
+        response['X-Cache'] = 'MISS'
+        return response
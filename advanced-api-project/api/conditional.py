@@ -0,0 +1,126 @@
+# api/conditional.py
+
+import hashlib
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .models import TableVersion
+
+# Version bumped by any write to Book or Author (author names are searchable
+# from the book list, so they change its output too).
+BOOKS_VERSION = 'books'
+
+
+def bump_table_version(name):
+    """
+    Increment a table version. Called from api/signals.py on every write.
+    """
+    updated = TableVersion.objects.filter(name=name).update(
+        version=F('version') + 1, updated_at=timezone.now()
+    )
+    if not updated:
+        TableVersion.objects.get_or_create(name=name, defaults={'version': 1})
+
+
+def get_table_version(name):
+    """
+    Return (version, updated_at) for a table, creating the row on first use.
+    """
+    row = TableVersion.objects.filter(name=name).values_list('version', 'updated_at').first()
+    if row is None:
+        obj, _ = TableVersion.objects.get_or_create(name=name)
+        row = (obj.version, obj.updated_at)
+    return row
+
+
+def _timestamp(value):
+    return int(value.timestamp())
+
+
+def _apply_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(_timestamp(last_modified))
+    return response
+
+
+class TableVersionMixin:
+    """
+    Looks up the version of `version_name` once per request.
+    """
+    version_name = BOOKS_VERSION
+
+    def get_current_version(self):
+        if not hasattr(self, '_current_version'):
+            self._current_version = get_table_version(self.version_name)
+        return self._current_version
+
+
+class ConditionalListMixin(TableVersionMixin):
+    """
+    Adds ETag/Last-Modified headers and 304 responses to a list view.
+
+    The validators come from the table version named by `version_name`, so a
+    matching request costs one primary-key lookup instead of a full query
+    and serialization. The ETag also covers the query string (filters,
+    search, ordering) and the negotiated media type.
+    """
+
+    def get_list_etag(self, request, version):
+        params = '&'.join(
+            f'{key}={value}'
+            for key in sorted(request.query_params)
+            for value in request.query_params.getlist(key)
+        )
+        raw = f'{version}|{params}|{request.accepted_media_type}'
+        return f'"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+    def get(self, request, *args, **kwargs):
+        # The browsable API renders per-user HTML; leave it alone.
+        if request.accepted_renderer.format == 'html':
+            return super().get(request, *args, **kwargs)
+
+        version, last_modified = self.get_current_version()
+        etag = self.get_list_etag(request, version)
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=_timestamp(last_modified)
+        )
+        if not_modified is not None:
+            return _apply_validators(not_modified, etag, last_modified)
+        return _apply_validators(super().get(request, *args, **kwargs), etag, last_modified)
+
+
+class ConditionalRetrieveMixin:
+    """
+    Adds ETag/Last-Modified headers and 304 responses to a detail view,
+    derived from the object's own `updated_at` column (and the `?fields=`
+    projection, if any).
+    """
+
+    def get(self, request, *args, **kwargs):
+        if request.accepted_renderer.format == 'html':
+            return super().get(request, *args, **kwargs)
+
+        lookup = {self.lookup_field: self.kwargs[self.lookup_url_kwarg or self.lookup_field]}
+        last_modified = (
+            self.get_queryset().filter(**lookup).values_list('updated_at', flat=True).first()
+        )
+        if last_modified is None:
+            # Let the normal retrieve path produce the 404.
+            return super().get(request, *args, **kwargs)
+
+        model_name = self.get_queryset().model._meta.model_name
+        tag = f'{model_name}-{lookup[self.lookup_field]}-{int(last_modified.timestamp() * 1_000_000)}'
+        fields = request.query_params.get('fields')
+        if fields:
+            # A projection is a different representation of the same object
+            tag += '-' + hashlib.sha1(fields.encode()).hexdigest()[:12]
+        etag = f'"{tag}"'
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=_timestamp(last_modified)
+        )
+        if not_modified is not None:
+            return _apply_validators(not_modified, etag, last_modified)
+        return _apply_validators(super().get(request, *args, **kwargs), etag, last_modified)
@@ -0,0 +1,77 @@
+# api/eager_loading.py
+
+from rest_framework import serializers
+
+
+def get_eager_loading(serializer_class, prefix='', fields=None):
+    """
+    Collect the related lookups a serializer needs, as (select_related, prefetch_related).
+
+    Serializers declare them on their Meta:
+
+        class Meta:
+            select_related = ['author']
+            prefetch_related = ['books']
+
+    Declarations of nested serializers are included too, prefixed with the
+    nested field's source (e.g. `books__...`).
+
+    `fields` limits the result to the lookups needed by those top-level fields
+    (a lookup is kept when its first part is the source of a requested field).
+    """
+    meta = getattr(serializer_class, 'Meta', None)
+    select = list(getattr(meta, 'select_related', ()))
+    prefetch = list(getattr(meta, 'prefetch_related', ()))
+    declared = getattr(serializer_class, '_declared_fields', {})
+
+    if fields is not None:
+        sources = {(declared[name].source or name) if name in declared else name for name in fields}
+        sources = {source.split('.')[0] for source in sources}
+        select = [lookup for lookup in select if lookup.split('__')[0] in sources]
+        prefetch = [lookup for lookup in prefetch if lookup.split('__')[0] in sources]
+        declared = {name: field for name, field in declared.items() if name in fields}
+
+    select = [prefix + lookup for lookup in select]
+    prefetch = [prefix + lookup for lookup in prefetch]
+
+    for name, field in declared.items():
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if not isinstance(nested, serializers.BaseSerializer):
+            continue
+        source = (field.source or name).replace('.', '__')
+        if source == '*':
+            continue
+        nested_select, nested_prefetch = get_eager_loading(type(nested), f'{prefix}{source}__')
+        # Anything below a prefetched relation must be prefetched as well.
+        if isinstance(field, serializers.ListSerializer):
+            nested_prefetch = nested_select + nested_prefetch
+            nested_select = []
+        select.extend(nested_select)
+        prefetch.extend(nested_prefetch)
+    return select, prefetch
+
+
+def setup_eager_loading(queryset, serializer_class, fields=None):
+    """Apply a serializer's declared select_related/prefetch_related to a queryset."""
+    select, prefetch = get_eager_loading(serializer_class, fields=fields)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class EagerLoadingMixin:
+    """
+    For generic views: eager-load whatever the view's serializer declares,
+    so listing N objects with nested relations costs a constant number of queries.
+    """
+
+    def get_eager_loading_fields(self):
+        """Top-level fields to eager-load relations for; None means all of them."""
+        return None
+
+    def get_queryset(self):
+        return setup_eager_loading(
+            super().get_queryset(), self.get_serializer_class(), fields=self.get_eager_loading_fields()
+        )
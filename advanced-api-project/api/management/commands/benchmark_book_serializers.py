@@ -0,0 +1,68 @@
+# api/management/commands/benchmark_book_serializers.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from api.fast_serializers import ValuesSerializer
+from api.models import Author, Book
+from api.serializers import BookSerializer
+
+
+class Rollback(Exception):
+    """Raised to discard the benchmark rows once timing is done."""
+
+
+class Command(BaseCommand):
+    help = (
+        'Time BookSerializer against the values()-based ValuesSerializer on N '
+        'books (created in a transaction that is rolled back) and check that '
+        'both render byte-identical JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Number of books to serialize.')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per serializer; the best is reported.')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options['rows'], options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, rows, repeat):
+        authors = Author.objects.bulk_create(Author(name=f'Benchmark author {i}') for i in range(max(rows // 10, 1)))
+        Book.objects.bulk_create(
+            (Book(title=f'Benchmark book {i}', publication_year=1900 + i % 120, author=authors[i % len(authors)])
+             for i in range(rows)),
+            batch_size=1000,
+        )
+        queryset = Book.objects.order_by('pk')
+        fast = ValuesSerializer(BookSerializer)
+        renderer = JSONRenderer()
+
+        def model_serializer():
+            return renderer.render(BookSerializer(queryset.all(), many=True).data)
+
+        def values_serializer():
+            return renderer.render(fast.serialize(queryset.values(*fast.columns)))
+
+        if model_serializer() != values_serializer():
+            raise CommandError('ValuesSerializer output differs from BookSerializer.')
+
+        results = {}
+        for name, func in [('BookSerializer', model_serializer), ('ValuesSerializer', values_serializer)]:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - start)
+            results[name] = min(timings)
+            self.stdout.write(f'{name:<18} {results[name] * 1000:9.1f} ms  ({rows / results[name]:,.0f} rows/s)')
+
+        speedup = results['BookSerializer'] / results['ValuesSerializer']
+        self.stdout.write(self.style.SUCCESS(f'Output identical; values() path is {speedup:.1f}x faster.'))
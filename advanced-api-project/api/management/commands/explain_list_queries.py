@@ -0,0 +1,163 @@
+# api/management/commands/explain_list_queries.py
+
+import datetime
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models
+from django.db.models.constants import LOOKUP_SEP
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.filters import SearchFilter
+
+# Plan lines that mean every row of a table is read:
+#   SQLite:     "SCAN api_book"  (but not "SCAN api_book USING INDEX ...")
+#   PostgreSQL: "Seq Scan on api_book"
+FULL_SCAN_PATTERNS = [
+    re.compile(r'\bSCAN (?P<table>\w+)(?! USING)\s*$', re.MULTILINE),
+    re.compile(r'Seq Scan on (?P<table>\w+)'),
+]
+# The ORDER BY is done by sorting instead of walking an index.
+SORT_PATTERNS = [
+    re.compile(r'USE TEMP B-TREE FOR ORDER BY'),
+    re.compile(r'^\s*(->\s*)?Sort\b', re.MULTILINE),
+]
+
+
+def iter_list_views(patterns=None):
+    """Yield (route, view class) for every URL whose view declares filter/search/ordering fields."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            for route, view_class in iter_list_views(pattern.url_patterns):
+                yield str(pattern.pattern) + route, view_class
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, 'cls', None) or getattr(pattern.callback, 'view_class', None)
+            if view_class is not None and any(
+                getattr(view_class, attr, None)
+                for attr in ('filterset_fields', 'search_fields', 'ordering_fields')
+            ):
+                yield str(pattern.pattern), view_class
+
+
+def resolve_field(model, path):
+    """Follow a `__`-separated path (e.g. `author__name`) to the model field at its end."""
+    field = None
+    for part in path.split(LOOKUP_SEP):
+        field = model._meta.get_field(part)
+        if field.is_relation:
+            model = field.related_model
+    return field
+
+
+def placeholder(field):
+    """A value of the right type for an EXPLAIN; the plan does not depend on it."""
+    if field.is_relation:
+        return 1
+    if isinstance(field, models.BooleanField):
+        return True
+    if isinstance(field, (models.IntegerField, models.FloatField, models.DecimalField)):
+        return 1
+    if isinstance(field, models.DateTimeField):
+        return datetime.datetime(2000, 1, 1)
+    if isinstance(field, models.DateField):
+        return datetime.date(2000, 1, 1)
+    return 'x'
+
+
+def search_lookup(search_field):
+    """The ORM lookup SearchFilter uses for a search field (honouring ^, =, @ and $)."""
+    prefix = search_field[:1]
+    if prefix in SearchFilter.lookup_prefixes:
+        return f'{search_field[1:]}__{SearchFilter.lookup_prefixes[prefix]}'
+    return f'{search_field}__icontains'
+
+
+def representative_queries(view_class, limit):
+    """
+    Build (label, queryset) pairs shaped like the queries the view's filter,
+    search and ordering backends produce, each limited to one page.
+    """
+    queryset = view_class.queryset.all()
+    model = queryset.model
+    filters = list(getattr(view_class, 'filterset_fields', None) or [])
+    searches = list(getattr(view_class, 'search_fields', None) or [])
+    orderings = getattr(view_class, 'ordering_fields', None) or []
+    if orderings == '__all__':
+        orderings = [field.name for field in model._meta.concrete_fields]
+    orderings = list(orderings)
+
+    for name in filters:
+        lookup = {name: placeholder(resolve_field(model, name))}
+        yield f'?{name}=', queryset.filter(**lookup).order_by('pk')[:limit]
+        for ordering in orderings:
+            yield f'?{name}=&ordering={ordering}', queryset.filter(**lookup).order_by(ordering)[:limit]
+    for ordering in orderings:
+        yield f'?ordering={ordering}', queryset.order_by(ordering)[:limit]
+    search_backend = next(
+        (backend for backend in view_class.filter_backends if issubclass(backend, SearchFilter)), None
+    )
+    if hasattr(search_backend, 'search'):
+        # A custom backend (e.g. TrigramSearchFilter) that builds its own query
+        yield f'?search= ({search_backend.__name__})', search_backend().search(queryset, 'orwell')[:limit]
+    else:
+        for name in searches:
+            lookup = search_lookup(name)
+            yield f'?search= ({lookup})', queryset.filter(**{lookup: 'x'}).order_by('pk')[:limit]
+
+
+def find_problems(plan):
+    """Return (full scans, sorts) found in an EXPLAIN output."""
+    scans = [
+        f'full scan of {match.group("table")}'
+        for pattern in FULL_SCAN_PATTERNS
+        for match in pattern.finditer(plan)
+    ]
+    sorts = ['sort'] if any(pattern.search(plan) for pattern in SORT_PATTERNS) else []
+    return scans, sorts
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN the queries produced by the filterset_fields, search_fields and '
+        'ordering_fields of every list view, and report those that scan a whole table '
+        '(or sort the matched rows instead of reading them in index order).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--view', action='append', default=[], help='Only check views with this class name.')
+        parser.add_argument('--limit', type=int, default=50, help='Page size used for the queries.')
+        parser.add_argument('--fail-on-scan', action='store_true', help='Exit with an error if any query scans a table.')
+
+    def handle(self, *args, **options):
+        flagged = 0
+        seen = set()
+        for route, view_class in iter_list_views():
+            if view_class in seen or (options['view'] and view_class.__name__ not in options['view']):
+                continue
+            seen.add(view_class)
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{view_class.__name__}  /{route}'))
+
+            for label, queryset in representative_queries(view_class, options['limit']):
+                plan = queryset.explain()
+                scans, sorts = find_problems(plan)
+                if scans:
+                    flagged += 1
+                    status = self.style.ERROR(', '.join(scans + sorts))
+                elif sorts:
+                    # Sorting the rows matched through an index; only slow if there are many.
+                    status = self.style.WARNING(', '.join(sorts))
+                else:
+                    status = self.style.SUCCESS('OK')
+                self.stdout.write(f'  {label:<45} {status}')
+                if options['verbosity'] > 1 or (scans and options['verbosity'] > 0):
+                    for line in plan.splitlines():
+                        self.stdout.write(f'      {line}')
+
+        if flagged:
+            message = f'{flagged} quer{"y needs" if flagged == 1 else "ies need"} a full table scan.'
+            if options['fail_on_scan']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS('No query needs a full table scan.'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from api.search import rebuild_index, uses_pg_trgm
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the trigram search index (BookTrigram) for all books.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if uses_pg_trgm():
+            self.stdout.write('Searching with pg_trgm; there is no table index to rebuild.')
+            return
+        count = rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} books.'))
@@ -0,0 +1,55 @@
+# Generated by Django 5.2 on 2026-10-18 18:26
+
+import django.db.models.deletion
+from django.apps import apps as global_apps
+from django.db import migrations, models
+
+PG_TRGM_INDEXES = [
+    ('api_book_title_trgm_idx', 'api_book', 'title'),
+    ('api_author_name_trgm_idx', 'api_author', 'name'),
+]
+
+
+def uses_pg_trgm(schema_editor):
+    # Same condition as api.search.uses_pg_trgm(): without django.contrib.postgres
+    # search reads the BookTrigram table, and GIN indexes would go unused.
+    return schema_editor.connection.vendor == 'postgresql' and global_apps.is_installed('django.contrib.postgres')
+
+
+def create_pg_trgm_indexes(apps, schema_editor):
+    """With pg_trgm search enabled, search uses GIN indexes instead of the BookTrigram table."""
+    if not uses_pg_trgm(schema_editor):
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in PG_TRGM_INDEXES:
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops)')
+
+
+def drop_pg_trgm_indexes(apps, schema_editor):
+    if not uses_pg_trgm(schema_editor):
+        return
+    for name, _, _ in PG_TRGM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gram', models.CharField(max_length=3)),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trigrams', to='api.book')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('gram', 'book'), name='api_book_trigram_gram_book_uniq')],
+            },
+        ),
+        migrations.RunPython(create_pg_trgm_indexes, drop_pg_trgm_indexes),
+    ]
@@ -8,6 +8,14 @@ class Author(models.Model):
     Each author can have multiple books.
     """
     name = models.CharField(max_length=100)
+    # Per-row version, refreshed on every save (used for ETag/Last-Modified)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # author__name lookups from the book list, name ordering of authors
+            models.Index(fields=['name'], name='api_author_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -21,6 +29,53 @@ class Book(models.Model):
     title = models.CharField(max_length=200)
     publication_year = models.IntegerField()
     author = models.ForeignKey(Author, related_name='books', on_delete=models.CASCADE)
+    # Per-row version, refreshed on every save (used for ETag/Last-Modified)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Backing the filterset/ordering fields of BookListView; check with
+        # `python manage.py explain_list_queries`.
+        indexes = [
+            models.Index(fields=['title'], name='api_book_title_idx'),
+            # ?publication_year=  and  ?publication_year=&ordering=title
+            models.Index(fields=['publication_year', 'title'], name='api_book_year_title_idx'),
+            # ?author=&ordering=publication_year / ?author=&ordering=title
+            models.Index(fields=['author', 'publication_year'], name='api_book_author_year_idx'),
+            models.Index(fields=['author', 'title'], name='api_book_author_title_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+class BookTrigram(models.Model):
+    """
+    One row of the book search index: a trigram of a book's title or author
+    name. `weight` is the trigram's score for that book (title trigrams count
+    more than author trigrams). Rows are maintained by api/signals.py and the
+    bulk endpoint; see api/search.py.
+    """
+    gram = models.CharField(max_length=3)
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='trigrams')
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            # Also the index the search looks trigrams up in
+            models.UniqueConstraint(fields=['gram', 'book'], name='api_book_trigram_gram_book_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.gram!r} in book {self.book_id}"
+
+class TableVersion(models.Model):
+    """
+    A per-table version number, bumped on every write to that table.
+    List endpoints derive their ETag/Last-Modified from it, so deletes
+    (which leave no row behind to carry an updated_at) still invalidate.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f"{self.name} v{self.version}"
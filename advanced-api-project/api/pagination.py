@@ -0,0 +1,79 @@
+# api/pagination.py
+
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class BookCursorPagination(CursorPagination):
+    """
+    Cursor mode: pages through `ordering` (the primary key by default, or the
+    view's OrderingFilter ordering) with `WHERE ... > cursor LIMIT n`, so every
+    page costs the same no matter how deep it is and no COUNT(*) is run.
+    """
+    ordering = '-id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class LinkHeaderPagination(PageNumberPagination):
+    """
+    Default pagination for the book APIs.
+
+    The response body stays a plain JSON list; navigation is sent in an RFC 8288
+    `Link` header (rel="first"/"prev"/"next"), as GitHub's API does.
+
+    - Page mode (default): `?page=N&page_size=M`, adds `X-Total-Count`.
+    - Cursor mode: any request with a `cursor` parameter (`?cursor=` for the
+      first page) is paginated by BookCursorPagination instead.
+
+    `page_size` is capped at `max_page_size` in both modes.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    cursor_class = BookCursorPagination
+
+    cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        if not queryset.ordered:
+            # Stable order for page mode; avoids UnorderedObjectListWarning
+            queryset = queryset.order_by('pk')
+
+        if self.cursor_class.cursor_query_param in request.query_params:
+            self.cursor_paginator = self.cursor_class()
+            self.cursor_paginator.page_size = self.get_page_size(request)
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+
+        self.cursor_paginator = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_links(self):
+        url = self.request.build_absolute_uri()
+        if self.cursor_paginator is not None:
+            cursor_param = self.cursor_paginator.cursor_query_param
+            return [
+                (replace_query_param(url, cursor_param, ''), 'first'),
+                (self.cursor_paginator.get_previous_link(), 'prev'),
+                (self.cursor_paginator.get_next_link(), 'next'),
+            ]
+        return [
+            (remove_query_param(url, self.page_query_param), 'first'),
+            (self.get_previous_link(), 'prev'),
+            (self.get_next_link(), 'next'),
+        ]
+
+    def get_paginated_response(self, data):
+        links = [f'<{url}>; rel="{rel}"' for url, rel in self.get_links() if url]
+        headers = {}
+        if links:
+            headers['Link'] = ', '.join(links)
+        if self.cursor_paginator is None:
+            headers['X-Total-Count'] = str(self.page.paginator.count)
+        return Response(data, headers=headers)
+
+    def get_paginated_response_schema(self, schema):
+        return schema
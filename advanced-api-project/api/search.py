@@ -0,0 +1,152 @@
+# api/search.py
+
+import math
+import re
+from collections import Counter
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+from rest_framework import filters
+
+from .models import Book, BookTrigram
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+# How much a trigram is worth in each part of a book.
+TITLE_WEIGHT = 2
+AUTHOR_WEIGHT = 1
+
+# Share of the query's trigrams a book must contain to match. Lower values
+# tolerate more typos but return more noise (pg_trgm's default is 0.3 for
+# similarity and 0.6 for word similarity).
+SIMILARITY_THRESHOLD = getattr(settings, 'BOOK_SEARCH_SIMILARITY', 0.5)
+
+
+def trigrams(text):
+    """
+    Return the set of trigrams of a text, computed per word the way pg_trgm
+    does: lowercase, padded with two spaces in front and one behind, so
+    `"Orwell"` gives `"  o", " or", "orw", ..., "ll "`. The padding makes
+    prefixes of a word share its first trigrams.
+    """
+    grams = set()
+    for word in WORD_RE.findall((text or '').lower()):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def uses_pg_trgm():
+    """
+    Search with PostgreSQL's pg_trgm instead of the BookTrigram table.
+    Migration 0004 creates the GIN indexes under the same condition, so add
+    django.contrib.postgres to INSTALLED_APPS before migrating.
+    """
+    return connection.vendor == 'postgresql' and apps.is_installed('django.contrib.postgres')
+
+
+def build_trigram_weights(book):
+    """Return a Counter mapping each trigram of the book's title and author name to its weight."""
+    weights = Counter()
+    for gram in trigrams(book.title):
+        weights[gram] += TITLE_WEIGHT
+    for gram in trigrams(book.author.name):
+        weights[gram] += AUTHOR_WEIGHT
+    return weights
+
+
+def index_books(books, created=False):
+    """
+    Replace the index rows of the given books (with their authors loaded)
+    with freshly computed ones; `created=True` skips deleting the old rows of
+    books that cannot have any. A no-op when pg_trgm does the searching.
+    """
+    if uses_pg_trgm():
+        return
+    books = list(books)
+    with transaction.atomic():
+        if not created:
+            BookTrigram.objects.filter(book__in=[book.pk for book in books]).delete()
+        BookTrigram.objects.bulk_create(
+            (
+                BookTrigram(gram=gram, book=book, weight=weight)
+                for book in books
+                for gram, weight in build_trigram_weights(book).items()
+            ),
+            batch_size=1000,
+        )
+
+
+def index_book(book, created=False):
+    index_books([book], created=created)
+
+
+def rebuild_index(batch_size=500):
+    """
+    Re-index every book. Used to backfill the index for existing data.
+    """
+    count = 0
+    batch = []
+    for book in Book.objects.select_related('author').iterator(chunk_size=batch_size):
+        batch.append(book)
+        if len(batch) == batch_size:
+            index_books(batch)
+            count += len(batch)
+            batch = []
+    index_books(batch)
+    return count + len(batch)
+
+
+def search_books(queryset, query):
+    """
+    Narrow a Book queryset to the books whose title or author name is
+    similar to the query, annotated with `rank` and ordered best first.
+
+    Matching is by shared trigrams, so prefixes ("anim") and misspellings
+    ("orwel", "aninal farm") still match, and the lookup goes through an index
+    instead of a `LIKE '%term%'` scan. Title matches rank above author matches.
+    """
+    if uses_pg_trgm():
+        return _search_pg_trgm(queryset, query)
+
+    grams = trigrams(query)
+    if not grams:
+        return queryset.none()
+    min_hits = max(1, math.ceil(len(grams) * SIMILARITY_THRESHOLD))
+    return (
+        queryset.filter(trigrams__gram__in=grams)
+        .annotate(hits=Count('trigrams'), rank=Sum('trigrams__weight'))
+        .filter(hits__gte=min_hits)
+        .order_by('-rank', 'pk')
+    )
+
+
+def _search_pg_trgm(queryset, query):
+    """The same search with pg_trgm's word similarity and its GIN indexes (see migration 0004)."""
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    return (
+        queryset.filter(Q(title__trigram_word_similar=query) | Q(author__name__trigram_word_similar=query))
+        .annotate(rank=TITLE_WEIGHT * TrigramWordSimilarity(query, 'title')
+                  + AUTHOR_WEIGHT * TrigramWordSimilarity(query, 'author__name'))
+        .order_by('-rank', 'pk')
+    )
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """
+    Drop-in replacement for SearchFilter that searches the book title and
+    author name through the trigram index (see search_books). Results are
+    ordered by relevance unless the request also asks for an `ordering`.
+    """
+
+    def search(self, queryset, text):
+        return search_books(queryset, text)
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return self.search(queryset, ' '.join(terms))
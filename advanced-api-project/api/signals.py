@@ -0,0 +1,28 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Author, Book
+from .cache import invalidate_book_list
+from .search import index_book, index_books
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def bump_books_version(sender, **kwargs):
+    invalidate_book_list()
+
+
+@receiver(post_save, sender=Book)
+def reindex_book(sender, instance, created, **kwargs):
+    index_book(instance, created=created)
+
+
+@receiver(post_save, sender=Author)
+def reindex_author_books(sender, instance, created, **kwargs):
+    # Author names are part of their books' search trigrams
+    if not created:
+        index_books(Book.objects.filter(author=instance).select_related('author'))
+
+# Deleting a book removes its BookTrigram rows through the FK cascade.
+# bulk_create/bulk_update send no signals; BookBulkView reindexes itself.
@@ -0,0 +1,82 @@
+# api/sparse_fields.py
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+FIELDS_QUERY_PARAM = 'fields'
+
+
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    A ModelSerializer that takes an extra `fields` argument: when given,
+    only those fields are kept (in the serializer's own order).
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsetMixin:
+    """
+    Adds a `?fields=id,title` projection parameter to read requests.
+
+    The requested fields narrow the serializer output, the columns loaded with
+    `only()` (or read with `.values()` by FastListMixin) and the relations
+    eager-loaded by EagerLoadingMixin. Filtering, search, ordering and
+    pagination are unaffected. Unknown field names are a 400.
+    """
+    fields_query_param = FIELDS_QUERY_PARAM
+
+    def get_requested_fields(self):
+        """Return the requested field names as a tuple, or None for all fields."""
+        if hasattr(self, '_requested_fields'):
+            return self._requested_fields
+
+        self._requested_fields = None
+        raw = self.request.query_params.get(self.fields_query_param, '')
+        if self.request.method in ('GET', 'HEAD') and raw.strip():
+            requested = tuple(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+            available = self.get_serializer_class()().fields
+            unknown = [name for name in requested if name not in available]
+            if unknown:
+                raise ValidationError({self.fields_query_param: [
+                    f'Unknown field(s): {", ".join(unknown)}. Choose from: {", ".join(available)}.'
+                ]})
+            self._requested_fields = requested
+        return self._requested_fields
+
+    def get_eager_loading_fields(self):
+        return self.get_requested_fields()
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_requested_fields()
+        if fields is None:
+            return queryset
+
+        serializer_fields = self.get_serializer_class()().fields
+        opts = queryset.model._meta
+        columns = []
+        for name in fields:
+            source = serializer_fields[name].source
+            if source == '*' or '.' in source:
+                continue
+            try:
+                model_field = opts.get_field(source)
+            except FieldDoesNotExist:
+                continue
+            # Reverse and many-to-many relations are not columns of this table
+            if model_field.concrete and not model_field.many_to_many:
+                columns.append(model_field.name)
+        return queryset.only(*columns) if columns else queryset.only(opts.pk.name)
@@ -1,9 +1,20 @@
 # api/test_views.py
 
 from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.core.management import call_command
+from io import StringIO
 from rest_framework.test import APITestCase
-from rest_framework import status
+from rest_framework import serializers, status
+from rest_framework.renderers import JSONRenderer
 from .models import Author, Book
+from .cache import LRUResponseCache
+from .eager_loading import get_eager_loading
+from .fast_serializers import ValuesSerializer
+from .serializers import AuthorSerializer, BookSerializer
 
 class BookAPITests(APITestCase):
     """
@@ -60,4 +71,438 @@ class BookAPITests(APITestCase):
         """Ensure unauthenticated users cannot create a book."""
         url = '/api/books/create'
         response = self.client.post(url, {'title': 'New', 'publication_year': 2023, 'author': self.author.id})
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response['WWW-Authenticate'], 'Session')
+
+class BookConditionalGetTests(APITestCase):
+    """
+    Test suite for ETag/Last-Modified handling on the Book list and detail endpoints.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.author = Author.objects.create(name='George Orwell')
+        self.book = Book.objects.create(title='1984', publication_year=1949, author=self.author)
+
+    def test_list_returns_304_when_unchanged(self):
+        response = self.client.get('/api/books/')
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+        response = self.client.get('/api/books/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_etag_depends_on_query(self):
+        plain = self.client.get('/api/books/')['ETag']
+        searched = self.client.get('/api/books/?search=Orwell')['ETag']
+        self.assertNotEqual(plain, searched)
+
+    def test_writes_change_list_etag(self):
+        etag = self.client.get('/api/books/')['ETag']
+        self.client.login(username='testuser', password='testpassword')
+        self.client.post('/api/books/create', {'title': 'Animal Farm', 'publication_year': 1945, 'author': self.author.id})
+        response = self.client.get('/api/books/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+
+        etag = response['ETag']
+        self.client.delete(f'/api/books/{self.book.id}/delete')
+        response = self.client.get('/api/books/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+
+    def test_detail_returns_304_until_updated(self):
+        url = f'/api/books/{self.book.id}/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.login(username='testuser', password='testpassword')
+        self.client.put(f'/api/books/{self.book.id}/update', {'title': 'Nineteen Eighty-Four', 'publication_year': 1949, 'author': self.author.id})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], 'Nineteen Eighty-Four')
+
+    def test_detail_missing_book_returns_404(self):
+        response = self.client.get(f'/api/books/{self.book.id + 100}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class BookListCacheTests(APITestCase):
+    """
+    Test suite for the LRU response cache behind the Book list endpoint.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.admin = User.objects.create_user(username='admin', password='testpassword', is_staff=True)
+        self.author = Author.objects.create(name='George Orwell')
+        self.book = Book.objects.create(title='1984', publication_year=1949, author=self.author)
+
+    def test_repeated_query_is_served_from_cache(self):
+        first = self.client.get('/api/books/?search=Orwell&ordering=-publication_year')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        # Parameter order does not matter
+        second = self.client.get('/api/books/?ordering=-publication_year&search=Orwell')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+
+    @override_settings(ALLOWED_HOSTS=['books.example.com', 'mirror.example.com'])
+    def test_link_headers_are_cached_per_origin(self):
+        first = self.client.get('/api/books/', HTTP_HOST='books.example.com')
+        second = self.client.get('/api/books/', HTTP_HOST='mirror.example.com', secure=True)
+        self.assertEqual(second['X-Cache'], 'MISS')
+        self.assertIn('<http://books.example.com/api/books/>', first['Link'])
+        self.assertIn('<https://mirror.example.com/api/books/>', second['Link'])
+
+    def test_write_views_invalidate_cache(self):
+        self.client.get('/api/books/')
+        self.client.login(username='testuser', password='testpassword')
+        self.client.post('/api/books/create', {'title': 'Animal Farm', 'publication_year': 1945, 'author': self.author.id})
+        response = self.client.get('/api/books/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data), 2)
+
+    def test_cache_is_size_bounded(self):
+        cache = LRUResponseCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_stats_endpoint_requires_admin(self):
+        self.client.login(username='testuser', password='testpassword')
+        self.assertEqual(self.client.get('/api/books/cache-stats').status_code, status.HTTP_403_FORBIDDEN)
+        self.client.login(username='admin', password='testpassword')
+        response = self.client.get('/api/books/cache-stats')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('hits', response.data)
+        self.assertIn('misses', response.data)
+
+
+class BookBulkAPITests(APITestCase):
+    """
+    Test suite for the bulk create/update/delete endpoint.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.orwell = Author.objects.create(name='George Orwell')
+        self.huxley = Author.objects.create(name='Aldous Huxley')
+        self.book = Book.objects.create(title='1984', publication_year=1949, author=self.orwell)
+        self.url = '/api/books/bulk'
+        self.client.login(username='testuser', password='testpassword')
+
+    def test_bulk_create(self):
+        data = [
+            {'title': f'Book {i}', 'publication_year': 1900 + i, 'author': self.huxley.id}
+            for i in range(50)
+        ]
+        # Session, user, one author lookup, savepoint, one insert, the search
+        # index (savepoint, 4 batched inserts, release), version bump, release
+        with self.assertNumQueries(13):
+            response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['created']), 50)
+        self.assertEqual(Book.objects.filter(author=self.huxley).count(), 50)
+
+    def test_bulk_create_reports_item_errors(self):
+        data = [
+            {'title': 'Fine', 'publication_year': 1932, 'author': self.huxley.id},
+            {'title': 'Future', 'publication_year': 3000, 'author': self.huxley.id},
+            {'title': 'Nobody', 'publication_year': 1950, 'author': 9999},
+        ]
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        self.assertIn('publication_year', response.data['errors'][0]['errors'])
+        self.assertIn('author', response.data['errors'][1]['errors'])
+        self.assertEqual(Book.objects.count(), 1)
+
+    def test_bulk_update(self):
+        data = [{'id': self.book.id, 'title': 'Nineteen Eighty-Four', 'author': self.huxley.id}]
+        response = self.client.patch(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.title, 'Nineteen Eighty-Four')
+        self.assertEqual(self.book.author, self.huxley)
+        self.assertEqual(self.book.publication_year, 1949)
+
+    def test_bulk_update_query_count(self):
+        books = Book.objects.bulk_create(
+            Book(title=f'Book {i}', publication_year=1900 + i, author=self.orwell) for i in range(20)
+        )
+        data = [{'id': book.id, 'title': f'Renamed {book.id}'} for book in books]
+        # Session, user, the books with their authors, savepoint, one update, the
+        # search index (savepoint, delete, 2 batched inserts, release), version
+        # bump, release; no query per book
+        with self.assertNumQueries(12):
+            response = self.client.patch(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Book.objects.filter(title__startswith='Renamed').count(), 20)
+
+    def test_bulk_update_unknown_id(self):
+        response = self.client.patch(self.url, [{'id': 9999, 'title': 'Ghost'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('id', response.data['errors'][0]['errors'])
+
+    def test_bulk_delete(self):
+        response = self.client.delete(self.url, {'ids': [self.book.id, 9999]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'deleted': 1, 'not_found': [9999]})
+        self.assertEqual(Book.objects.count(), 0)
+
+    def test_bulk_write_invalidates_list_cache(self):
+        etag = self.client.get('/api/books/')['ETag']
+        self.client.post(self.url, [{'title': 'Island', 'publication_year': 1962, 'author': self.huxley.id}], format='json')
+        response = self.client.get('/api/books/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+
+    def test_bulk_requires_authentication(self):
+        self.client.logout()
+        response = self.client.post(self.url, [], format='json')
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+
+class BookListPaginationTests(APITestCase):
+    """
+    Test suite for the default Link-header pagination on the Book list.
+    """
+
+    def setUp(self):
+        self.author = Author.objects.create(name='George Orwell')
+        Book.objects.bulk_create(
+            Book(title=f'Book {i:02d}', publication_year=1900 + i, author=self.author) for i in range(12)
+        )
+
+    def test_paginated_list_keeps_plain_body(self):
+        response = self.client.get('/api/books/?page_size=5')
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(response['X-Total-Count'], '12')
+        self.assertIn('rel="next"', response['Link'])
+
+    def test_cursor_and_page_modes_are_cached_separately(self):
+        self.client.get('/api/books/?page_size=5')
+        response = self.client.get('/api/books/?cursor=&page_size=5')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertNotIn('X-Total-Count', response)
+
+    def test_cached_response_keeps_pagination_headers(self):
+        first = self.client.get('/api/books/?cursor=&page_size=5')
+        second = self.client.get('/api/books/?cursor=&page_size=5')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second['Link'], first['Link'])
+        self.assertEqual(second.data, first.data)
+
+
+class FastBookSerializationTests(APITestCase):
+    """
+    Test suite for the values()-based list serialization (api/fast_serializers.py).
+    """
+
+    def setUp(self):
+        self.author = Author.objects.create(name='George Orwell')
+        Book.objects.bulk_create(
+            Book(title=f'Book {i:02d} \u00e9', publication_year=1900 + i, author=self.author) for i in range(12)
+        )
+
+    def test_output_is_byte_identical_to_book_serializer(self):
+        books = Book.objects.order_by('pk')
+        expected = JSONRenderer().render(BookSerializer(books, many=True).data)
+        fast = ValuesSerializer(BookSerializer)
+        actual = JSONRenderer().render(fast.serialize(books.values(*fast.columns)))
+        self.assertEqual(actual, expected)
+
+    def test_list_matches_book_serializer(self):
+        # Table version, COUNT for pagination, one page of values() rows
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/books/?ordering=title&page_size=5')
+        self.assertEqual(response.data, BookSerializer(Book.objects.order_by('title')[:5], many=True).data)
+
+    def test_cursor_mode_works_on_values_rows(self):
+        first = self.client.get('/api/books/?cursor=&page_size=5&ordering=-publication_year')
+        next_url = first['Link'].split('<')[2].split('>')[0]
+        second = self.client.get(next_url)
+        self.assertEqual(second.data[0]['publication_year'], 1906)
+
+    def test_unsupported_fields_are_rejected(self):
+        class MethodSerializer(BookSerializer):
+            shout = serializers.SerializerMethodField()
+
+            class Meta(BookSerializer.Meta):
+                fields = BookSerializer.Meta.fields + ['shout']
+
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesSerializer(MethodSerializer)
+
+
+class SparseFieldsetTests(APITestCase):
+    """
+    Test suite for the `?fields=` projection on the Book and Author endpoints.
+    """
+
+    def setUp(self):
+        self.orwell = Author.objects.create(name='George Orwell')
+        self.huxley = Author.objects.create(name='Aldous Huxley')
+        Book.objects.create(title='1984', publication_year=1949, author=self.orwell)
+        Book.objects.create(title='Animal Farm', publication_year=1945, author=self.orwell)
+        Book.objects.create(title='Brave New World', publication_year=1932, author=self.huxley)
+
+    def test_book_list_projection_narrows_output_and_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/books/?fields=id,title')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([set(book) for book in response.data], [{'id', 'title'}] * 3)
+        select = queries.captured_queries[-1]['sql']
+        self.assertNotIn('publication_year', select)
+        self.assertNotIn('author_id', select)
+
+    def test_projection_works_with_filter_search_and_ordering(self):
+        response = self.client.get(
+            '/api/books/?fields=title&author=%d&search=orwell&ordering=-publication_year' % self.orwell.id
+        )
+        self.assertEqual(response.data, [{'title': '1984'}, {'title': 'Animal Farm'}])
+
+    def test_projection_with_cursor_ordered_by_unselected_field(self):
+        response = self.client.get('/api/books/?fields=title&cursor=&page_size=2&ordering=publication_year')
+        self.assertEqual(response.data, [{'title': 'Brave New World'}, {'title': 'Animal Farm'}])
+        self.assertIn('rel="next"', response['Link'])
+
+    def test_projections_are_cached_separately(self):
+        self.client.get('/api/books/?fields=id')
+        response = self.client.get('/api/books/?fields=title')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(set(response.data[0]), {'title'})
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get('/api/books/?fields=id,isbn')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('isbn', str(response.data['fields']))
+
+    def test_book_detail_projection(self):
+        book = Book.objects.get(title='1984')
+        full = self.client.get(f'/api/books/{book.id}/')
+        response = self.client.get(f'/api/books/{book.id}/?fields=publication_year')
+        self.assertEqual(response.data, {'publication_year': 1949})
+        self.assertNotEqual(response['ETag'], full['ETag'])
+
+    def test_author_projection_skips_books_prefetch(self):
+        # COUNT for pagination and one page of authors; no books prefetch
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/authors/?fields=name')
+        self.assertEqual(response.data, [{'name': 'George Orwell'}, {'name': 'Aldous Huxley'}])
+
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/authors/?fields=id,books')
+        self.assertEqual(len(response.data[0]['books']), 2)
+
+
+class BookSearchTests(APITestCase):
+    """
+    Test suite for the trigram search backend (api/search.py).
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.orwell = Author.objects.create(name='George Orwell')
+        self.huxley = Author.objects.create(name='Aldous Huxley')
+        Book.objects.create(title='Animal Farm', publication_year=1945, author=self.orwell)
+        Book.objects.create(title='1984', publication_year=1949, author=self.orwell)
+        Book.objects.create(title='Brave New World', publication_year=1932, author=self.huxley)
+
+    def search(self, query, **params):
+        response = self.client.get('/api/books/', {'search': query, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [book['title'] for book in response.data]
+
+    def test_prefix_and_typo_tolerance(self):
+        self.assertEqual(self.search('anim'), ['Animal Farm'])
+        self.assertEqual(self.search('aninal farn'), ['Animal Farm'])
+        self.assertEqual(self.search('orwel'), ['Animal Farm', '1984'])
+
+    def test_title_matches_rank_above_author_matches(self):
+        Book.objects.create(title='Huxley: A Biography', publication_year=1968, author=self.orwell)
+        self.assertEqual(self.search('huxley'), ['Huxley: A Biography', 'Brave New World'])
+
+    def test_search_combines_with_filters_and_ordering(self):
+        self.assertEqual(self.search('orwell', ordering='title'), ['1984', 'Animal Farm'])
+        self.assertEqual(self.search('orwell', publication_year=1949), ['1984'])
+
+    def test_index_follows_renames_and_bulk_writes(self):
+        self.huxley.name = 'A. L. Huxley-Smith'
+        self.huxley.save()
+        self.assertEqual(self.search('smith'), ['Brave New World'])
+
+        self.client.login(username='testuser', password='testpassword')
+        self.client.post('/api/books/bulk', [
+            {'title': 'Island', 'publication_year': 1962, 'author': self.huxley.id},
+        ], format='json')
+        self.assertEqual(self.search('islnd'), ['Island'])
+
+
+class IndexAdvisorTests(APITestCase):
+    """
+    Test suite for the explain_list_queries management command.
+    """
+
+    def run_advisor(self):
+        out = StringIO()
+        call_command('explain_list_queries', '--view', 'BookListView', stdout=out, no_color=True)
+        return dict(
+            line.strip().rsplit('  ', 1) for line in out.getvalue().splitlines()
+            if line.startswith('  ?')
+        )
+
+    def test_filters_and_orderings_use_indexes(self):
+        report = {label.strip(): result.strip() for label, result in self.run_advisor().items()}
+        for label in ['?author=', '?title=', '?ordering=title', '?ordering=publication_year',
+                      '?publication_year=&ordering=title', '?author=&ordering=publication_year']:
+            self.assertEqual(report[label], 'OK', label)
+        for label, result in report.items():
+            self.assertNotIn('full scan', result, label)
+
+
+class AuthorAPITests(APITestCase):
+    """
+    Test suite for the author endpoints and their eager loading of nested books.
+    """
+
+    def create_authors(self, count):
+        for i in range(count):
+            author = Author.objects.create(name=f'Author {i}')
+            Book.objects.bulk_create(
+                Book(title=f'Book {i}-{j}', publication_year=1950 + j, author=author) for j in range(3)
+            )
+
+    def test_author_list_query_count_is_constant(self):
+        self.create_authors(2)
+        # COUNT for pagination, one page of authors, one prefetch of their books
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/authors/')
+        self.assertEqual(len(response.data), 2)
+
+        self.create_authors(20)
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/authors/')
+        self.assertEqual(len(response.data), 22)
+        self.assertEqual(len(response.data[0]['books']), 3)
+
+    def test_author_detail(self):
+        self.create_authors(1)
+        author = Author.objects.get()
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/authors/{author.id}/')
+        self.assertEqual(response.data['name'], 'Author 0')
+        self.assertEqual([book['title'] for book in response.data['books']], ['Book 0-0', 'Book 0-1', 'Book 0-2'])
+
+    def test_eager_loading_includes_nested_declarations(self):
+        class NestedBookSerializer(BookSerializer):
+            class Meta(BookSerializer.Meta):
+                select_related = ['author']
+
+        class WrappingAuthorSerializer(AuthorSerializer):
+            books = NestedBookSerializer(many=True, read_only=True)
+
+        self.assertEqual(get_eager_loading(WrappingAuthorSerializer), ([], ['books', 'books__author']))
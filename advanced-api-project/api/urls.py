@@ -7,6 +7,10 @@ from .views import (
     BookCreateView,
     BookUpdateView,
     BookDeleteView,
+    BookListCacheStatsView,
+    BookBulkView,
+    AuthorListView,
+    AuthorDetailView,
 )
 
 urlpatterns = [
@@ -19,4 +23,11 @@ urlpatterns = [
 
     # The string "books/delete" is included in this comment for the checker.
     path('books/<int:pk>/delete', BookDeleteView.as_view(), name='book-delete'),
+
+    path('books/bulk', BookBulkView.as_view(), name='book-bulk'),
+
+    path('authors/', AuthorListView.as_view(), name='author-list'),
+    path('authors/<int:pk>/', AuthorDetailView.as_view(), name='author-detail'),
+
+    path('books/cache-stats', BookListCacheStatsView.as_view(), name='book-cache-stats'),
 ]
\ No newline at end of file
@@ -1,36 +1,64 @@
 from rest_framework import generics, permissions, filters
 from django_filters.rest_framework import DjangoFilterBackend # Correct import for the filter backend
 from .models import Book, Author
-from .serializers import BookSerializer, AuthorSerializer
+from .serializers import (
+    BookSerializer,
+    AuthorSerializer,
+    BookBulkCreateItemSerializer,
+    BookBulkUpdateItemSerializer,
+    BookBulkDeleteSerializer,
+)
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
 from django_filters import rest_framework
+from .conditional import ConditionalListMixin, ConditionalRetrieveMixin
+from .eager_loading import EagerLoadingMixin
+from .cache import CachedListMixin, book_list_cache, deferred_invalidation
+from .fast_serializers import FastListMixin
+from .sparse_fields import SparseFieldsetMixin
+from .search import TrigramSearchFilter, index_books
+from .authentication import ChallengeSessionAuthentication
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 # Task 1 & 2: Generic Views for Book Model with Filtering/Searching
 # =================================================================
 
-class BookListView(generics.ListAPIView):
+class BookListView(ConditionalListMixin, CachedListMixin, SparseFieldsetMixin, FastListMixin, generics.ListAPIView):
     """
     A ListView for retrieving all books.
     Includes filtering, searching, and ordering capabilities.
+    Supports conditional GET (ETag/Last-Modified) via the books table version,
+    and serves repeated queries from an in-memory LRU response cache.
+    Cache misses are serialized from `.values()` rows (see FastListMixin).
+    `?fields=id,title` returns (and selects) only those fields.
     """
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [permissions.AllowAny]
 
     # Add backends for filtering, searching, and ordering
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter, filters.OrderingFilter]
     
     # Fields to filter on (e.g., /api/books/?publication_year=1949)
     filterset_fields = ['publication_year', 'author', 'title']
     
-    # Fields to search on (e.g., /api/books/?search=Orwell)
+    # Fields to search on (e.g., /api/books/?search=Orwell). TrigramSearchFilter
+    # matches them through the trigram index, tolerating typos, best match first.
     search_fields = ['title', 'author__name']
     
     # Fields to order by (e.g., /api/books/?ordering=-title)
     ordering_fields = ['publication_year', 'title']
 
 
-class BookDetailView(generics.RetrieveAPIView):
-    """A DetailView for retrieving a single book by ID."""
+class BookDetailView(ConditionalRetrieveMixin, SparseFieldsetMixin, generics.RetrieveAPIView):
+    """
+    A DetailView for retrieving a single book by ID, with conditional GET support.
+    Accepts `?fields=` like the list view.
+    """
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [permissions.AllowAny]
@@ -40,15 +68,171 @@ class BookCreateView(generics.CreateAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # Anonymous writes get a 401 rather than a 403, see api/authentication.py
+    authentication_classes = [ChallengeSessionAuthentication]
 
 class BookUpdateView(generics.UpdateAPIView):
     """An UpdateView for modifying an existing book."""
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [ChallengeSessionAuthentication]
 
 class BookDeleteView(generics.DestroyAPIView):
     """A DeleteView for removing a book."""
     queryset = Book.objects.all()
     serializer_class = BookSerializer
-    permission_classes = [permissions.IsAuthenticated]
\ No newline at end of file
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [ChallengeSessionAuthentication]
+
+
+
+# Author endpoints
+# =================================================================
+
+class AuthorListView(SparseFieldsetMixin, EagerLoadingMixin, generics.ListAPIView):
+    """
+    Lists authors with their nested books.
+    Books are prefetched for the whole page, so the query count does not
+    grow with the number of authors. With `?fields=id,name` they are not
+    loaded at all.
+    """
+    queryset = Author.objects.all()
+    serializer_class = AuthorSerializer
+    permission_classes = [permissions.AllowAny]
+
+
+class AuthorDetailView(SparseFieldsetMixin, EagerLoadingMixin, generics.RetrieveAPIView):
+    """Retrieves a single author with their nested books. Accepts `?fields=`."""
+    queryset = Author.objects.all()
+    serializer_class = AuthorSerializer
+    permission_classes = [permissions.AllowAny]
+
+class BookListCacheStatsView(APIView):
+    """Reports hit/miss statistics of the book list response cache (admins only)."""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(book_list_cache.stats())
+
+
+
+# Bulk endpoints: load a whole batch of books in one request
+# =================================================================
+
+class BookBulkView(APIView):
+    """
+    Create, update or delete many books in a single request.
+
+    - POST:   a list of {title, publication_year, author} objects.
+    - PATCH:  a list of {id, ...fields} objects (partial updates).
+    - DELETE: {"ids": [...]}.
+
+    The whole batch is validated in one pass and authors are resolved with a
+    single query. Nothing is written unless every item is valid; otherwise the
+    response is 400 with a list of {index, errors} entries. Valid batches are
+    written with bulk_create/bulk_update inside one transaction.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [ChallengeSessionAuthentication]
+    max_batch_size = getattr(settings, 'BOOK_BULK_MAX_ITEMS', 5000)
+    write_batch_size = 500
+
+    def validate_batch(self, serializer_class, data):
+        """
+        Validate every item and resolve the referenced authors.
+        Returns (items, authors, errors) where errors maps item index -> error dict.
+        """
+        if not isinstance(data, list):
+            return [], {}, {None: {'non_field_errors': ['Expected a list of books.']}}
+        if len(data) > self.max_batch_size:
+            return [], {}, {None: {'non_field_errors': [f'A batch may contain at most {self.max_batch_size} books.']}}
+
+        # One serializer instance validates every item, as ListSerializer does,
+        # but the valid items are kept even when others fail.
+        child = serializer_class()
+        items, errors = [], {}
+        for index, item in enumerate(data):
+            try:
+                items.append(child.run_validation(item))
+            except ValidationError as exc:
+                items.append(None)
+                errors[index] = exc.detail
+
+        author_ids = {item['author'] for item in items if item and 'author' in item}
+        authors = Author.objects.in_bulk(author_ids)
+        for index, item in enumerate(items):
+            if item and 'author' in item and item['author'] not in authors:
+                errors.setdefault(index, {})['author'] = [f'Invalid pk "{item["author"]}" - object does not exist.']
+        return items, authors, errors
+
+    def error_response(self, errors):
+        if None in errors:
+            return Response(errors[None], status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {'errors': [{'index': index, 'errors': errors[index]} for index in sorted(errors)]},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    def post(self, request):
+        items, authors, errors = self.validate_batch(BookBulkCreateItemSerializer, request.data)
+        if errors:
+            return self.error_response(errors)
+
+        books = [
+            Book(title=item['title'], publication_year=item['publication_year'], author=authors[item['author']])
+            for item in items
+        ]
+        with transaction.atomic(), deferred_invalidation():
+            Book.objects.bulk_create(books, batch_size=self.write_batch_size)
+            index_books(books, created=True)
+        return Response({'created': BookSerializer(books, many=True).data}, status=status.HTTP_201_CREATED)
+
+    def patch(self, request):
+        items, authors, errors = self.validate_batch(BookBulkUpdateItemSerializer, request.data)
+        if None in errors:
+            return self.error_response(errors)
+
+        seen = set()
+        for index, item in enumerate(items):
+            if item and item['id'] in seen:
+                errors.setdefault(index, {})['id'] = ['Duplicate id in batch.']
+            elif item:
+                seen.add(item['id'])
+        # Authors are loaded with the books, for the search index
+        books = Book.objects.select_related('author').in_bulk(seen)
+        for index, item in enumerate(items):
+            if item and item['id'] not in books:
+                errors.setdefault(index, {})['id'] = [f'Invalid pk "{item["id"]}" - object does not exist.']
+        if errors:
+            return self.error_response(errors)
+
+        now = timezone.now()
+        changed_fields = {'updated_at'}
+        for item in items:
+            book = books[item['id']]
+            for field, value in item.items():
+                if field == 'id':
+                    continue
+                setattr(book, field, authors[value] if field == 'author' else value)
+                changed_fields.add(field)
+            book.updated_at = now
+
+        updated = [books[item['id']] for item in items]
+        with transaction.atomic(), deferred_invalidation():
+            Book.objects.bulk_update(updated, sorted(changed_fields), batch_size=self.write_batch_size)
+            if changed_fields & {'title', 'author'}:
+                index_books(updated)
+        return Response({'updated': BookSerializer(updated, many=True).data})
+
+    def delete(self, request):
+        serializer = BookBulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = set(serializer.validated_data['ids'])
+        if len(ids) > self.max_batch_size:
+            return self.error_response({None: {'ids': [f'A batch may contain at most {self.max_batch_size} ids.']}})
+
+        with transaction.atomic(), deferred_invalidation():
+            existing = set(Book.objects.filter(pk__in=ids).values_list('pk', flat=True))
+            Book.objects.filter(pk__in=existing).delete()
+        return Response({'deleted': len(existing), 'not_found': sorted(ids - existing)})
@@ -126,6 +126,21 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'bookshelf.CustomUser'
 
+# Permission checks (has_perm) are served from a cache shared by all worker
+# processes; see bookshelf/backends.py. Point 'permissions' at Redis or
+# Memcached in production.
+AUTHENTICATION_BACKENDS = ['bookshelf.backends.CachedPermissionBackend']
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'permissions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.cache' / 'permissions',
+    },
+}
+
 SECURE_BROWSER_XSS_FILTER = True
 X_FRAME_OPTIONS = 'DENY'
 SECURE_CONTENT_TYPE_NOSNIFF = True
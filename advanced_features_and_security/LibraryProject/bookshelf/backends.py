@@ -0,0 +1,96 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import InvalidCacheBackendError, caches
+
+# Cache alias holding the permission sets; it should be shared by all worker
+# processes (file-based, Redis or Memcached - see CACHES in settings.py).
+PERMISSION_CACHE_ALIAS = getattr(settings, 'PERMISSION_CACHE_ALIAS', 'permissions')
+PERMISSION_CACHE_TIMEOUT = getattr(settings, 'PERMISSION_CACHE_TIMEOUT', 60 * 60)
+VERSION_KEY = 'bookshelf:perms:version'
+
+# Permission sets are keyed by two tokens: the global version (every user)
+# and a per-user generation. Invalidating replaces a token with a fresh random
+# one instead of deleting an entry or incrementing a number: a set() needs no
+# atomic incr (FileBasedCache's is a get-then-set, so concurrent bumps could
+# collapse into one), and a has_perm() that read the old permissions from the
+# database before the change can only write them under the dead token.
+
+
+def get_permission_cache():
+    try:
+        return caches[PERMISSION_CACHE_ALIAS]
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+def generation_key(user_id):
+    return f'bookshelf:perms:generation:{user_id}'
+
+
+def _new_token():
+    return uuid.uuid4().hex
+
+
+def _get_token(cache, key):
+    token = cache.get(key)
+    if token is None:
+        # First use, or evicted: a fresh token, never a value used before
+        cache.add(key, _new_token(), None)
+        token = cache.get(key)
+    return token
+
+
+def get_permission_version():
+    """The current permission version; replacing it makes every cached set stale."""
+    return _get_token(get_permission_cache(), VERSION_KEY)
+
+
+def bump_permission_version():
+    """Invalidate the cached permissions of every user (group/permission changes)."""
+    get_permission_cache().set(VERSION_KEY, _new_token(), None)
+
+
+def permission_cache_key(user_id):
+    cache = get_permission_cache()
+    tokens = cache.get_many([VERSION_KEY, generation_key(user_id)])
+    version = tokens.get(VERSION_KEY) or _get_token(cache, VERSION_KEY)
+    generation = tokens.get(generation_key(user_id)) or _get_token(cache, generation_key(user_id))
+    return f'bookshelf:perms:{version}:{generation}:{user_id}'
+
+
+def invalidate_user_permissions(user_id):
+    """Invalidate the cached permissions of a single user."""
+    get_permission_cache().set(generation_key(user_id), _new_token(), None)
+
+
+class CachedPermissionBackend(ModelBackend):
+    """
+    ModelBackend whose permission sets are kept in a shared cache, keyed by
+    user id, the permission version and the user's generation, instead of
+    being loaded from the database once per user object (i.e. on every
+    request).
+
+    Steady-state `user.has_perm()` calls - permission_required,
+    PermissionRequiredMixin, `perms` in templates - cost no queries.
+    bookshelf/signals.py replaces the version when groups or permissions
+    change, and a user's generation when the user changes.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, '_perm_cache'):
+            cache = get_permission_cache()
+            key = permission_cache_key(user_obj.pk)
+            perms = cache.get(key)
+            if perms is None:
+                perms = super().get_all_permissions(user_obj)
+                cache.set(key, perms, PERMISSION_CACHE_TIMEOUT)
+            user_obj._perm_cache = perms
+        return user_obj._perm_cache
+
+    def warm_up(self, user_obj):
+        """Load a user's permissions into the cache (done on login)."""
+        return self.get_all_permissions(user_obj)
@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .backends import CachedPermissionBackend, bump_permission_version, invalidate_user_permissions
+
+User = get_user_model()
+
+
+# Group membership, group permissions and direct user permissions can change
+# the permission sets of many users at once: start a new version.
+@receiver(m2m_changed, sender=Group.permissions.through)
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def permissions_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_permission_version()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def group_or_permission_changed(sender, **kwargs):
+    bump_permission_version()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # is_superuser/is_active affect the set; a login only touches last_login.
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_user_permissions(instance.pk)
+
+
+@receiver(user_logged_in)
+def warm_up_permissions(sender, request, user, **kwargs):
+    CachedPermissionBackend().warm_up(user)
@@ -1,3 +1,77 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from .backends import PERMISSION_CACHE_ALIAS, CachedPermissionBackend, invalidate_user_permissions
+
+User = get_user_model()
+
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    PERMISSION_CACHE_ALIAS: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'perms'},
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class CachedPermissionBackendTests(TestCase):
+    """
+    Tests for the shared permission cache in bookshelf/backends.py.
+    """
+
+    def setUp(self):
+        caches[PERMISSION_CACHE_ALIAS].clear()
+        self.editors = Group.objects.create(name='Editors')
+        self.can_edit = Permission.objects.get(codename='can_edit')
+        self.editors.permissions.add(self.can_edit)
+        self.user = User.objects.create_user(email='editor@example.com', password='password')
+        self.user.groups.add(self.editors)
+
+    def fresh_user(self):
+        # A new object, as request.user is on every request
+        return User.objects.get(pk=self.user.pk)
+
+    def test_permissions_are_cached_across_user_objects(self):
+        self.assertTrue(self.fresh_user().has_perm('bookshelf.can_edit'))
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perm('bookshelf.can_edit'))
+            self.assertFalse(user.has_perm('bookshelf.can_delete'))
+
+    def test_group_permission_change_invalidates(self):
+        self.assertFalse(self.fresh_user().has_perm('bookshelf.can_delete'))
+        self.editors.permissions.add(Permission.objects.get(codename='can_delete'))
+        self.assertTrue(self.fresh_user().has_perm('bookshelf.can_delete'))
+
+    def test_membership_and_superuser_changes_invalidate(self):
+        self.assertTrue(self.fresh_user().has_perm('bookshelf.can_edit'))
+        self.user.groups.remove(self.editors)
+        self.assertFalse(self.fresh_user().has_perm('bookshelf.can_edit'))
+
+        self.user.is_superuser = True
+        self.user.save()
+        self.assertTrue(self.fresh_user().has_perm('bookshelf.can_delete'))
+
+    def test_login_warms_the_cache(self):
+        self.client.login(email='editor@example.com', password='password')
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perm('bookshelf.can_edit'))
+
+    def test_late_write_after_invalidation_is_not_served(self):
+        original = CachedPermissionBackend.get_group_permissions
+
+        def revoke_while_loading(backend, user_obj, obj=None):
+            perms = original(backend, user_obj, obj)
+            # Leave the group (no m2m signal) and invalidate just this user
+            User.groups.through.objects.filter(customuser_id=self.user.pk).delete()
+            invalidate_user_permissions(self.user.pk)
+            return perms
+
+        # A request that read the permissions just before they were revoked...
+        with mock.patch.object(CachedPermissionBackend, 'get_group_permissions', revoke_while_loading):
+            self.assertTrue(self.fresh_user().has_perm('bookshelf.can_edit'))
+        # ...cached them under a dead key, so the next request reloads them
+        self.assertFalse(self.fresh_user().has_perm('bookshelf.can_edit'))
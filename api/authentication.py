@@ -0,0 +1,18 @@
+# api/authentication.py
+
+from rest_framework.authentication import SessionAuthentication
+
+
+class ChallengeSessionAuthentication(SessionAuthentication):
+    """
+    Session authentication that names itself in a `WWW-Authenticate` header.
+
+    DRF answers an unauthenticated request with 401 only when the first
+    authentication class provides a challenge, and 403 otherwise. The plain
+    SessionAuthentication has none. This class accepts no other credentials
+    than the session. Its `Session` scheme does not make browsers show a
+    login dialog, as `Basic` would.
+    """
+
+    def authenticate_header(self, request):
+        return 'Session'
@@ -0,0 +1,62 @@
+# api/export.py
+
+import csv
+import json
+
+from rest_framework.negotiation import BaseContentNegotiation
+
+# Same fields, names and order as BookSerializer. `author` is the author id,
+# which is what BookSerializer's PrimaryKeyRelatedField outputs.
+EXPORT_FIELDS = ['id', 'title', 'publication_year', 'author']
+EXPORT_COLUMNS = ['id', 'title', 'publication_year', 'author_id']
+COLUMN_FOR_FIELD = dict(zip(EXPORT_FIELDS, EXPORT_COLUMNS))
+EXPORT_CHUNK_SIZE = 2000
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """
+    Export responses are streamed directly rather than rendered, so any
+    Accept header is fine; pick the first renderer instead of returning 406.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return (renderers[0], renderers[0].media_type)
+
+
+class Echo:
+    """A file-like object whose write() just returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, fields=EXPORT_FIELDS, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield plain tuples for the columns of `fields`, fetched in chunks so only
+    one chunk of rows is held in memory at a time.
+    """
+    columns = [COLUMN_FOR_FIELD[name] for name in fields]
+    return queryset.values_list(*columns).iterator(chunk_size=chunk_size)
+
+
+def ndjson_lines(rows, fields=EXPORT_FIELDS):
+    """Encode rows as newline-delimited JSON, one book object per line."""
+    for row in rows:
+        yield json.dumps(dict(zip(fields, row))) + '\n'
+
+
+def csv_lines(rows, fields=EXPORT_FIELDS):
+    """Encode rows as CSV, starting with a header line."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', ndjson_lines),
+    'csv': ('text/csv', csv_lines),
+}
@@ -0,0 +1,108 @@
+# api/fast_serializers.py
+
+from operator import itemgetter
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# Fields whose to_representation() returns database values unchanged
+# (int columns already come back as int, text columns as str).
+PASSTHROUGH_FIELDS = (serializers.IntegerField, serializers.CharField, serializers.BooleanField)
+
+
+class ValuesSerializer:
+    """
+    A read-only, precompiled stand-in for a flat ModelSerializer.
+
+    The field plan (output name, database column, converter) is built once
+    from the serializer class. Rows are then read with `.values()` and mapped
+    straight to dicts, skipping model instantiation and per-field
+    `to_representation` calls for fields whose database value is already the
+    output value. The rendered output is identical to the ModelSerializer's.
+
+    `fields` restricts the plan (and the columns read) to those field names.
+    Only plain model fields and PrimaryKeyRelatedFields are supported; nested
+    serializers, method fields and dotted sources raise ImproperlyConfigured.
+    """
+
+    def __init__(self, serializer_class, fields=None):
+        self.serializer_class = serializer_class
+        model = serializer_class.Meta.model
+        plan = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+            if isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField)) or \
+                    field.source == '*' or '.' in field.source:
+                raise ImproperlyConfigured(
+                    f'{serializer_class.__name__}.{name} cannot be read from values().'
+                )
+            column = model._meta.get_field(field.source).attname
+            if isinstance(field, serializers.PrimaryKeyRelatedField):
+                convert = field.pk_field.to_representation if field.pk_field else None
+            elif isinstance(field, serializers.RelatedField):
+                raise ImproperlyConfigured(
+                    f'{serializer_class.__name__}.{name} cannot be read from values().'
+                )
+            elif isinstance(field, PASSTHROUGH_FIELDS):
+                convert = None
+            else:
+                convert = field.to_representation
+            plan.append((name, column, convert))
+
+        self.names = tuple(name for name, _, _ in plan)
+        self.columns = tuple(dict.fromkeys(column for _, column, _ in plan))
+        self._getter = itemgetter(*[column for _, column, _ in plan])
+        if len(plan) == 1:
+            getter = self._getter
+            self._getter = lambda row: (getter(row),)
+        self._converters = [(name, convert) for name, _, convert in plan if convert is not None]
+
+    def to_representation(self, row):
+        data = dict(zip(self.names, self._getter(row)))
+        for name, convert in self._converters:
+            # Same None handling as Serializer.to_representation
+            if data[name] is not None:
+                data[name] = convert(data[name])
+        return data
+
+    def serialize(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+
+class FastListMixin:
+    """
+    Serves list GETs through a ValuesSerializer built from the view's
+    serializer, while filtering, searching, ordering and pagination
+    work exactly as before. Other methods keep using the normal serializer.
+    Honours `?fields=` projections (see SparseFieldsetMixin).
+    """
+    _values_serializers = {}
+
+    def get_values_serializer(self):
+        serializer = self.get_serializer()
+        key = (type(serializer), tuple(serializer.fields))
+        if key not in self._values_serializers:
+            self._values_serializers[key] = ValuesSerializer(*key)
+        return self._values_serializers[key]
+
+    def get_values_columns(self, queryset, values_serializer):
+        """
+        The serializer's columns plus the ordering fields and the primary key,
+        which cursor pagination reads from each row even when not serialized.
+        """
+        ordering = [name.lstrip('-') for name in queryset.query.order_by if isinstance(name, str)]
+        return tuple(dict.fromkeys(
+            values_serializer.columns + tuple(ordering) + (queryset.model._meta.pk.attname,)
+        ))
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.values(*self.get_values_columns(queryset, values_serializer))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.serialize(page))
+        return Response(values_serializer.serialize(queryset))
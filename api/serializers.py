@@ -2,9 +2,20 @@
 
 from rest_framework import serializers
 from .models import Author, Book
+from .sparse_fields import DynamicFieldsModelSerializer
 import datetime
 
-class BookSerializer(serializers.ModelSerializer):
+
+def validate_publication_year(value):
+    """
+    Check that the publication year is not in the future.
+    Shared by BookSerializer and the bulk item serializers.
+    """
+    if value > datetime.date.today().year:
+        raise serializers.ValidationError("Publication year cannot be in the future.")
+    return value
+
+class BookSerializer(DynamicFieldsModelSerializer):
     """
     Serializer for the Book model.
     It includes all fields from the Book model and adds custom validation
@@ -18,20 +29,47 @@ class BookSerializer(serializers.ModelSerializer):
         """
         Check that the publication year is not in the future.
         """
-        if value > datetime.date.today().year:
-            raise serializers.ValidationError("Publication year cannot be in the future.")
-        return value
+        return validate_publication_year(value)
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(DynamicFieldsModelSerializer):
     """
     Serializer for the Author model.
     It includes the author's name and a nested representation of their books.
     The nested BookSerializer (books) provides a read-only list of books
     associated with the author. This demonstrates how to handle one-to-many
     relationships in a nested, readable format.
+    Views using EagerLoadingMixin prefetch `books` (see Meta.prefetch_related),
+    so listing many authors costs two queries instead of one per author.
     """
     books = BookSerializer(many=True, read_only=True)
 
     class Meta:
         model = Author
-        fields = ['id', 'name', 'books']
\ No newline at end of file
+        fields = ['id', 'name', 'books']
+        prefetch_related = ['books']
+
+class BookBulkCreateItemSerializer(serializers.Serializer):
+    """
+    Validates one book of a bulk create request.
+    `author` is taken as a plain id here; the bulk view resolves all
+    authors of the batch with a single query instead of one per item.
+    """
+    title = serializers.CharField(max_length=200)
+    publication_year = serializers.IntegerField(validators=[validate_publication_year])
+    author = serializers.IntegerField()
+
+
+class BookBulkUpdateItemSerializer(BookBulkCreateItemSerializer):
+    """
+    Validates one book of a bulk update request: `id` is required, every
+    other field is optional (partial update).
+    """
+    id = serializers.IntegerField()
+    title = serializers.CharField(max_length=200, required=False)
+    publication_year = serializers.IntegerField(required=False, validators=[validate_publication_year])
+    author = serializers.IntegerField(required=False)
+
+
+class BookBulkDeleteSerializer(serializers.Serializer):
+    """Validates the list of ids of a bulk delete request."""
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
@@ -1,9 +1,17 @@
 # api/tests.py
 
+import json
+from unittest import mock
+
 from django.contrib.auth.models import User
 from rest_framework.test import APITestCase
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from .models import Author, Book
+from .pagination import LinkHeaderPagination
+from .eager_loading import get_eager_loading
+from .fast_serializers import ValuesSerializer
+from .serializers import AuthorSerializer, BookSerializer
 
 class BookAPITests(APITestCase):
     """
@@ -87,4 +95,254 @@ class BookAPITests(APITestCase):
         response = self.client.get(f'{self.list_create_url}?ordering=title')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data[0]['title'], '1984')
-        self.assertEqual(response.data[1]['title'], 'Animal Farm')
\ No newline at end of file
+        self.assertEqual(response.data[1]['title'], 'Animal Farm')
+
+
+class BookBulkAPITests(APITestCase):
+    """
+    Test suite for the bulk create/update/delete endpoint.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.orwell = Author.objects.create(name='George Orwell')
+        self.huxley = Author.objects.create(name='Aldous Huxley')
+        self.book = Book.objects.create(title='1984', publication_year=1949, author=self.orwell)
+        self.url = '/api/books/bulk/'
+        self.client.login(username='testuser', password='testpassword')
+
+    def test_bulk_create(self):
+        data = [
+            {'title': f'Book {i}', 'publication_year': 1900 + i, 'author': self.huxley.id}
+            for i in range(50)
+        ]
+        # Session, user, one author lookup, savepoint, one insert, release
+        with self.assertNumQueries(6):
+            response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['created']), 50)
+        self.assertEqual(Book.objects.filter(author=self.huxley).count(), 50)
+
+    def test_bulk_create_reports_item_errors(self):
+        data = [
+            {'title': 'Fine', 'publication_year': 1932, 'author': self.huxley.id},
+            {'title': 'Future', 'publication_year': 3000, 'author': self.huxley.id},
+            {'title': 'Nobody', 'publication_year': 1950, 'author': 9999},
+        ]
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        self.assertIn('publication_year', response.data['errors'][0]['errors'])
+        self.assertIn('author', response.data['errors'][1]['errors'])
+        self.assertEqual(Book.objects.count(), 1)
+
+    def test_bulk_update(self):
+        data = [{'id': self.book.id, 'title': 'Nineteen Eighty-Four', 'author': self.huxley.id}]
+        response = self.client.patch(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.title, 'Nineteen Eighty-Four')
+        self.assertEqual(self.book.author, self.huxley)
+        self.assertEqual(self.book.publication_year, 1949)
+
+    def test_bulk_update_unknown_id(self):
+        response = self.client.patch(self.url, [{'id': 9999, 'title': 'Ghost'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('id', response.data['errors'][0]['errors'])
+
+    def test_bulk_delete(self):
+        response = self.client.delete(self.url, {'ids': [self.book.id, 9999]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'deleted': 1, 'not_found': [9999]})
+        self.assertEqual(Book.objects.count(), 0)
+
+    def test_bulk_requires_authentication(self):
+        self.client.logout()
+        response = self.client.post(self.url, [], format='json')
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+
+class BookExportTests(APITestCase):
+    """
+    Test suite for the streaming NDJSON/CSV export endpoint.
+    """
+
+    def setUp(self):
+        self.author1 = Author.objects.create(name='George Orwell')
+        self.author2 = Author.objects.create(name='Aldous Huxley')
+        self.book1 = Book.objects.create(title='1984', publication_year=1949, author=self.author1)
+        self.book2 = Book.objects.create(title='Animal Farm', publication_year=1945, author=self.author1)
+        self.book3 = Book.objects.create(title='Brave New World', publication_year=1932, author=self.author2)
+
+    def read(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_matches_serializer_output(self):
+        response = self.client.get('/api/books/export/ndjson/?ordering=title')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        expected = self.client.get('/api/books/?ordering=title').data
+        self.assertEqual(rows, [dict(item) for item in expected])
+
+    def test_csv_honours_search_and_filters(self):
+        response = self.client.get('/api/books/export/csv/?search=Orwell&ordering=publication_year', HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = self.read(response).splitlines()
+        self.assertEqual(lines[0], 'id,title,publication_year,author')
+        self.assertEqual(lines[1:], [
+            f'{self.book2.id},Animal Farm,1945,{self.author1.id}',
+            f'{self.book1.id},1984,1949,{self.author1.id}',
+        ])
+
+    def test_export_honours_fields(self):
+        response = self.client.get('/api/books/export/ndjson/?fields=title,id&ordering=title')
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(rows[0], {'title': '1984', 'id': self.book1.id})
+
+        response = self.client.get('/api/books/export/csv/?fields=title,publication_year&ordering=-publication_year')
+        self.assertEqual(self.read(response).splitlines(), [
+            'title,publication_year', '1984,1949', 'Animal Farm,1945', 'Brave New World,1932',
+        ])
+
+        response = self.client.get('/api/books/export/csv/?fields=isbn')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unknown_format(self):
+        response = self.client.get('/api/books/export/xml/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_export_is_read_only(self):
+        user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user)
+        response = self.client.post('/api/books/export/csv/', {})
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class BookPaginationTests(APITestCase):
+    """
+    Test suite for page/cursor pagination and Link headers on the book list.
+    """
+
+    def setUp(self):
+        self.author = Author.objects.create(name='George Orwell')
+        Book.objects.bulk_create(
+            Book(title=f'Book {i:02d}', publication_year=1900 + i, author=self.author) for i in range(25)
+        )
+        self.url = '/api/books/'
+
+    def parse_links(self, response):
+        links = {}
+        for part in response['Link'].split(', '):
+            url, rel = part.split('; ')
+            links[rel[5:-1]] = url[1:-1]
+        return links
+
+    def test_page_mode_links_and_total(self):
+        response = self.client.get(self.url, {'page_size': 10, 'page': 2})
+        self.assertEqual(len(response.data), 10)
+        self.assertEqual(response['X-Total-Count'], '25')
+        links = self.parse_links(response)
+        self.assertIn('page=3', links['next'])
+        self.assertIn('prev', links)
+
+    def test_page_size_is_capped(self):
+        with mock.patch.object(LinkHeaderPagination, 'max_page_size', 5):
+            response = self.client.get(self.url, {'page_size': 1000})
+        self.assertEqual(len(response.data), 5)
+
+    def test_cursor_mode_walks_all_rows(self):
+        response = self.client.get(self.url, {'cursor': '', 'page_size': 10})
+        self.assertNotIn('X-Total-Count', response)
+        ids = [book['id'] for book in response.data]
+        while 'next' in self.parse_links(response):
+            response = self.client.get(self.parse_links(response)['next'])
+            ids.extend(book['id'] for book in response.data)
+        self.assertEqual(ids, sorted(Book.objects.values_list('id', flat=True), reverse=True))
+
+    def test_cursor_mode_honours_ordering(self):
+        response = self.client.get(self.url, {'cursor': '', 'page_size': 3, 'ordering': 'title'})
+        self.assertEqual([book['title'] for book in response.data], ['Book 00', 'Book 01', 'Book 02'])
+
+    def test_list_output_is_byte_identical_to_book_serializer(self):
+        response = self.client.get(self.url, {'page_size': 100, 'ordering': '-title'})
+        expected = BookSerializer(Book.objects.order_by('-title'), many=True).data
+        self.assertEqual(JSONRenderer().render(response.data), JSONRenderer().render(expected))
+
+        fast = ValuesSerializer(BookSerializer)
+        rows = Book.objects.order_by('-title').values(*fast.columns)
+        self.assertEqual(JSONRenderer().render(fast.serialize(rows)), JSONRenderer().render(expected))
+
+
+class SparseFieldsetTests(APITestCase):
+    """
+    Test suite for the `?fields=` projection on the Book and Author endpoints.
+    """
+
+    def setUp(self):
+        self.author = Author.objects.create(name='George Orwell')
+        self.nineteen = Book.objects.create(title='1984', publication_year=1949, author=self.author)
+        self.book = Book.objects.create(title='Animal Farm', publication_year=1945, author=self.author)
+
+    def test_book_list_projection_with_search_and_ordering(self):
+        response = self.client.get('/api/books/', {'fields': 'id,title', 'search': 'orwell', 'ordering': 'title'})
+        self.assertEqual(response.data, [
+            {'id': self.nineteen.id, 'title': '1984'},
+            {'id': self.book.id, 'title': 'Animal Farm'},
+        ])
+
+    def test_book_detail_projection_and_unknown_field(self):
+        response = self.client.get(f'/api/books/{self.book.id}/', {'fields': 'title'})
+        self.assertEqual(response.data, {'title': 'Animal Farm'})
+        response = self.client.get(f'/api/books/{self.book.id}/', {'fields': 'isbn'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_author_projection_skips_books_prefetch(self):
+        # COUNT for pagination and one page of authors; no books prefetch
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/authors/', {'fields': 'name'})
+        self.assertEqual(response.data, [{'name': 'George Orwell'}])
+
+
+class AuthorAPITests(APITestCase):
+    """
+    Test suite for the author endpoints and their eager loading of nested books.
+    """
+
+    def create_authors(self, count):
+        for i in range(count):
+            author = Author.objects.create(name=f'Author {i}')
+            Book.objects.bulk_create(
+                Book(title=f'Book {i}-{j}', publication_year=1950 + j, author=author) for j in range(3)
+            )
+
+    def test_author_list_query_count_is_constant(self):
+        self.create_authors(2)
+        # COUNT for pagination, one page of authors, one prefetch of their books
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/authors/')
+        self.assertEqual(len(response.data), 2)
+
+        self.create_authors(20)
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/authors/')
+        self.assertEqual(len(response.data), 22)
+        self.assertEqual(len(response.data[0]['books']), 3)
+
+    def test_author_detail(self):
+        self.create_authors(1)
+        author = Author.objects.get()
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/authors/{author.id}/')
+        self.assertEqual(response.data['name'], 'Author 0')
+        self.assertEqual([book['title'] for book in response.data['books']], ['Book 0-0', 'Book 0-1', 'Book 0-2'])
+
+    def test_eager_loading_includes_nested_declarations(self):
+        class NestedBookSerializer(BookSerializer):
+            class Meta(BookSerializer.Meta):
+                select_related = ['author']
+
+        class WrappingAuthorSerializer(AuthorSerializer):
+            books = NestedBookSerializer(many=True, read_only=True)
+
+        self.assertEqual(get_eager_loading(WrappingAuthorSerializer), ([], ['books', 'books__author']))
@@ -1,9 +1,16 @@
 # api/urls.py
 
 from django.urls import path
-from .views import BookListCreateView, BookDetailView
+from .views import (
+    BookListCreateView, BookDetailView, BookBulkView, BookExportView,
+    AuthorListView, AuthorDetailView,
+)
 
 urlpatterns = [
     path('books/', BookListCreateView.as_view(), name='book-list-create'),
     path('books/<int:pk>/', BookDetailView.as_view(), name='book-detail'),
+    path('books/bulk/', BookBulkView.as_view(), name='book-bulk'),
+    path('books/export/<str:export_format>/', BookExportView.as_view(), name='book-export'),
+    path('authors/', AuthorListView.as_view(), name='author-list'),
+    path('authors/<int:pk>/', AuthorDetailView.as_view(), name='author-detail'),
 ]
@@ -1,21 +1,45 @@
 # api/views.py
 
-from rest_framework import generics, permissions, filters
-from .models import Book
-from .serializers import BookSerializer
+from rest_framework import generics, permissions, filters, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
+from .authentication import ChallengeSessionAuthentication
+from .export import EXPORT_FIELDS, EXPORT_FORMATS, IgnoreClientContentNegotiation, iter_rows
+from .pagination import LinkHeaderPagination
+from .eager_loading import EagerLoadingMixin
+from .fast_serializers import FastListMixin
+from .sparse_fields import SparseFieldsetMixin
+from .models import Author, Book
+from .serializers import (
+    BookSerializer,
+    AuthorSerializer,
+    BookBulkCreateItemSerializer,
+    BookBulkUpdateItemSerializer,
+    BookBulkDeleteSerializer,
+)
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 
-class BookListCreateView(generics.ListCreateAPIView):
+class BookListCreateView(SparseFieldsetMixin, FastListMixin, generics.ListCreateAPIView):
     """
     Enhanced view to list all books or create a new one.
     - Supports filtering by publication_year and author id.
     - Supports searching on title and author's name.
     - Supports ordering by title and publication_year.
+    - Paginated (page or cursor mode) with Link headers, see api/pagination.py.
+    - List GETs are serialized from `.values()` rows, see api/fast_serializers.py.
+    - `?fields=id,title` returns (and selects) only those fields.
     """
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    # Anonymous writes get a 401 rather than a 403, see api/authentication.py
+    authentication_classes = [ChallengeSessionAuthentication]
+    pagination_class = LinkHeaderPagination
     
     # Add filtering, searching, and ordering backends
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -30,10 +54,35 @@ class BookListCreateView(generics.ListCreateAPIView):
     ordering_fields = ['publication_year', 'title']
 
 
-class BookDetailView(generics.RetrieveUpdateDestroyAPIView):
+class BookExportView(BookListCreateView):
+    """
+    Streams the whole (filtered) book catalogue as NDJSON or CSV.
+    - GET books/export/ndjson/ or books/export/csv/
+    - Honours the same filter, search, ordering and `?fields=` parameters as the list view.
+    Rows are fetched with .iterator() in chunks and encoded one at a time, so
+    memory use does not grow with the size of the catalogue.
+    """
+    http_method_names = ['get', 'head', 'options']
+    content_negotiation_class = IgnoreClientContentNegotiation
+    pagination_class = None
+
+    def get(self, request, export_format):
+        if export_format not in EXPORT_FORMATS:
+            raise Http404(f'Unknown export format: {export_format}')
+        content_type, encode = EXPORT_FORMATS[export_format]
+        # Like the serializer, keep the columns in their usual order
+        requested = self.get_requested_fields() or EXPORT_FIELDS
+        fields = [name for name in EXPORT_FIELDS if name in requested]
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(encode(iter_rows(queryset, fields), fields), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="books.{export_format}"'
+        return response
+
+
+class BookDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     View to retrieve, update, or delete a book by its ID.
-    - GET: Retrieve a single book.
+    - GET: Retrieve a single book (`?fields=` selects a subset of fields).
     - PUT/PATCH: Update a book.
     - DELETE: Delete a book.
     Permissions:
@@ -42,4 +91,143 @@ class BookDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     queryset = Book.objects.all()
     serializer_class = BookSerializer
-    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
\ No newline at end of file
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    authentication_classes = [ChallengeSessionAuthentication]
+
+
+class AuthorListView(SparseFieldsetMixin, EagerLoadingMixin, generics.ListAPIView):
+    """
+    View to list authors with their nested books.
+    - Books are prefetched for the whole page (see AuthorSerializer.Meta),
+      so the query count does not grow with the number of authors.
+    - `?fields=id,name` returns only those fields and skips loading the books.
+    """
+    queryset = Author.objects.all()
+    serializer_class = AuthorSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = LinkHeaderPagination
+
+
+class AuthorDetailView(SparseFieldsetMixin, EagerLoadingMixin, generics.RetrieveAPIView):
+    """
+    View to retrieve a single author with their nested books. Accepts `?fields=`.
+    """
+    queryset = Author.objects.all()
+    serializer_class = AuthorSerializer
+    permission_classes = [permissions.AllowAny]
+
+
+# Bulk endpoints: load a whole batch of books in one request
+# =================================================================
+
+class BookBulkView(APIView):
+    """
+    Create, update or delete many books in a single request.
+
+    - POST:   a list of {title, publication_year, author} objects.
+    - PATCH:  a list of {id, ...fields} objects (partial updates).
+    - DELETE: {"ids": [...]}.
+
+    The whole batch is validated in one pass and authors are resolved with a
+    single query. Nothing is written unless every item is valid; otherwise the
+    response is 400 with a list of {index, errors} entries. Valid batches are
+    written with bulk_create/bulk_update inside one transaction.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [ChallengeSessionAuthentication]
+    max_batch_size = getattr(settings, 'BOOK_BULK_MAX_ITEMS', 5000)
+    write_batch_size = 500
+
+    def validate_batch(self, serializer_class, data):
+        """
+        Validate every item and resolve the referenced authors.
+        Returns (items, authors, errors) where errors maps item index -> error dict.
+        """
+        if not isinstance(data, list):
+            return [], {}, {None: {'non_field_errors': ['Expected a list of books.']}}
+        if len(data) > self.max_batch_size:
+            return [], {}, {None: {'non_field_errors': [f'A batch may contain at most {self.max_batch_size} books.']}}
+
+        # One serializer instance validates every item, as ListSerializer does,
+        # but the valid items are kept even when others fail.
+        child = serializer_class()
+        items, errors = [], {}
+        for index, item in enumerate(data):
+            try:
+                items.append(child.run_validation(item))
+            except ValidationError as exc:
+                items.append(None)
+                errors[index] = exc.detail
+
+        author_ids = {item['author'] for item in items if item and 'author' in item}
+        authors = Author.objects.in_bulk(author_ids)
+        for index, item in enumerate(items):
+            if item and 'author' in item and item['author'] not in authors:
+                errors.setdefault(index, {})['author'] = [f'Invalid pk "{item["author"]}" - object does not exist.']
+        return items, authors, errors
+
+    def error_response(self, errors):
+        if None in errors:
+            return Response(errors[None], status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {'errors': [{'index': index, 'errors': errors[index]} for index in sorted(errors)]},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    def post(self, request):
+        items, authors, errors = self.validate_batch(BookBulkCreateItemSerializer, request.data)
+        if errors:
+            return self.error_response(errors)
+
+        books = [
+            Book(title=item['title'], publication_year=item['publication_year'], author=authors[item['author']])
+            for item in items
+        ]
+        with transaction.atomic():
+            Book.objects.bulk_create(books, batch_size=self.write_batch_size)
+        return Response({'created': BookSerializer(books, many=True).data}, status=status.HTTP_201_CREATED)
+
+    def patch(self, request):
+        items, authors, errors = self.validate_batch(BookBulkUpdateItemSerializer, request.data)
+        if None in errors:
+            return self.error_response(errors)
+
+        seen = set()
+        for index, item in enumerate(items):
+            if item and item['id'] in seen:
+                errors.setdefault(index, {})['id'] = ['Duplicate id in batch.']
+            elif item:
+                seen.add(item['id'])
+        books = Book.objects.in_bulk(seen)
+        for index, item in enumerate(items):
+            if item and item['id'] not in books:
+                errors.setdefault(index, {})['id'] = [f'Invalid pk "{item["id"]}" - object does not exist.']
+        if errors:
+            return self.error_response(errors)
+
+        changed_fields = set()
+        for item in items:
+            book = books[item['id']]
+            for field, value in item.items():
+                if field == 'id':
+                    continue
+                setattr(book, field, authors[value] if field == 'author' else value)
+                changed_fields.add(field)
+
+        updated = [books[item['id']] for item in items]
+        if changed_fields:
+            with transaction.atomic():
+                Book.objects.bulk_update(updated, sorted(changed_fields), batch_size=self.write_batch_size)
+        return Response({'updated': BookSerializer(updated, many=True).data})
+
+    def delete(self, request):
+        serializer = BookBulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = set(serializer.validated_data['ids'])
+        if len(ids) > self.max_batch_size:
+            return self.error_response({None: {'ids': [f'A batch may contain at most {self.max_batch_size} ids.']}})
+
+        with transaction.atomic():
+            existing = set(Book.objects.filter(pk__in=ids).values_list('pk', flat=True))
+            Book.objects.filter(pk__in=existing).delete()
+        return Response({'deleted': len(existing), 'not_found': sorted(ids - existing)})
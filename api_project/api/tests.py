@@ -1,3 +1,25 @@
-from django.test import TestCase
+from rest_framework.test import APITestCase
+from rest_framework import status
+from .models import Book
 
-# Create your tests here.
+
+class BookPaginationTests(APITestCase):
+    """
+    Tests for the default Link-header pagination on BookList and BookViewSet.
+    """
+
+    def setUp(self):
+        Book.objects.bulk_create(Book(title=f'Book {i:02d}', author='Author') for i in range(60))
+
+    def test_book_list_is_paginated(self):
+        response = self.client.get('/api/books/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 50)
+        self.assertEqual(response['X-Total-Count'], '60')
+        self.assertIn('page=2', response['Link'])
+
+    def test_viewset_cursor_mode(self):
+        response = self.client.get('/api/books_all/', {'cursor': '', 'page_size': 40})
+        self.assertEqual(len(response.data), 40)
+        self.assertNotIn('X-Total-Count', response)
+        self.assertIn('rel="next"', response['Link'])
@@ -130,5 +130,7 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly', # We'll discuss this next
-    ]
+    ],
+    # Page or cursor pagination with Link headers (api/pagination.py)
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.LinkHeaderPagination',
 }
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+Cross-library catalogue queries.
+
+Every function answers its question with a single aggregated SQL query over
+the Library.books through table (LibraryBook) instead of looping over
+`library.books.all()` in Python. Results are cached under a catalogue
+version that relationship_app/signals.py bumps whenever holdings, books,
+authors or libraries change.
+"""
+import time
+
+from django.core.cache import cache
+from django.db.models import Count, F
+
+from .models import Author, Library, LibraryBook
+
+CATALOGUE_CACHE_TIMEOUT = 15 * 60
+VERSION_KEY = 'relationship_app:catalogue:version'
+
+
+def _new_version():
+    # Seeded from the clock, not 1: if the version key is evicted, the new
+    # version lies past every version handed out before, so entries cached
+    # under an old one can never be served again.
+    return time.time_ns()
+
+
+def get_catalogue_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        seed = _new_version()
+        cache.add(VERSION_KEY, seed, None)
+        version = cache.get(VERSION_KEY, seed)
+    return version
+
+
+def bump_catalogue_version():
+    """Make every cached catalogue aggregate stale."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, _new_version(), None)
+
+
+def cached(name, compute, *args):
+    key = ':'.join(['relationship_app:catalogue', str(get_catalogue_version()), name, *map(str, args)])
+    result = cache.get(key)
+    if result is None:
+        result = compute(*args)
+        cache.set(key, result, CATALOGUE_CACHE_TIMEOUT)
+    return result
+
+
+def _holdings_per_library():
+    return list(
+        Library.objects.annotate(
+            book_count=Count('books'),
+            author_count=Count('books__author', distinct=True),
+        )
+        .order_by('-book_count', 'name', 'pk')
+        .values('id', 'name', 'book_count', 'author_count')
+    )
+
+
+def holdings_per_library():
+    """Every library with the number of distinct books and authors it holds."""
+    return cached('holdings', _holdings_per_library)
+
+
+def _libraries_per_author():
+    return list(
+        Author.objects.annotate(
+            library_count=Count('book__library', distinct=True),
+            book_count=Count('book', distinct=True),
+        )
+        .order_by('-library_count', 'name', 'pk')
+        .values('id', 'name', 'library_count', 'book_count')
+    )
+
+
+def libraries_per_author():
+    """Every author with the number of libraries holding at least one of their books."""
+    return cached('authors', _libraries_per_author)
+
+
+def _libraries_for_author(author_id):
+    # filter() and annotate() share the join, so only this author's books are counted
+    return list(
+        Library.objects.filter(books__author_id=author_id)
+        .annotate(book_count=Count('books'))
+        .order_by('-book_count', 'name', 'pk')
+        .values('id', 'name', 'book_count')
+    )
+
+
+def libraries_for_author(author_id):
+    """The libraries holding books by an author, with how many of them each holds."""
+    return cached('author', _libraries_for_author, author_id)
+
+
+def _overlap_pairs(library_id):
+    # LibraryBook joined to itself on book: one row per (holding, other holding of the same book)
+    pairs = LibraryBook.objects.annotate(
+        other_id=F('book__librarybook__library_id'),
+        other_name=F('book__librarybook__library__name'),
+    )
+    if library_id is None:
+        pairs = pairs.filter(other_id__gt=F('library_id'))
+    else:
+        pairs = pairs.filter(library_id=library_id).exclude(other_id=library_id)
+    return (
+        pairs.values('library_id', 'library__name', 'other_id', 'other_name')
+        .annotate(shared_books=Count('book_id'))
+        .order_by('-shared_books', 'library_id', 'other_id')
+    )
+
+
+def _library_overlap(library_id, limit):
+    return list(
+        _overlap_pairs(library_id)
+        .values_list('library_id', 'library__name', 'other_id', 'other_name', 'shared_books')[:limit]
+    )
+
+
+def library_overlap(library_id=None, limit=100):
+    """
+    The `limit` pairs of libraries holding the most books in common, as
+    (library_id, library_name, other_id, other_name, shared_books) tuples,
+    most shared books first. Pairs without shared books are left out.
+
+    With `library_id`, only the pairs of that library are returned;
+    otherwise every pair appears once.
+    """
+    return cached('overlap', _library_overlap, library_id, limit)
+
+
+def _library_overlap_count(library_id):
+    return _overlap_pairs(library_id).count()
+
+
+def library_overlap_count(library_id=None):
+    """Number of pairs library_overlap() would return without a limit."""
+    return cached('overlap-count', _library_overlap_count, library_id)
@@ -0,0 +1,159 @@
+import random
+import time
+import uuid
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from relationship_app.catalogue import bump_catalogue_version
+from relationship_app.models import Author, Book, Librarian, Library, LibraryBook, UserProfile
+
+FIRST_NAMES = [
+    'Ada', 'Alan', 'Amara', 'Ben', 'Chidi', 'Clara', 'David', 'Elena', 'Femi', 'Grace', 'Hannah',
+    'Ivan', 'Jia', 'John', 'Kofi', 'Lena', 'Maria', 'Noah', 'Olga', 'Priya', 'Ravi', 'Sara',
+    'Tomas', 'Uche', 'Vera', 'Wei', 'Yusuf', 'Zara',
+]
+LAST_NAMES = [
+    'Adeyemi', 'Brown', 'Chen', 'Dubois', 'Evans', 'Fischer', 'Garcia', 'Haddad', 'Ibrahim',
+    'Johnson', 'Kim', 'Larsen', 'Mensah', 'Novak', 'Okafor', 'Patel', 'Quinn', 'Rossi', 'Smith',
+    'Tanaka', 'Usman', 'Varga', 'Wright', 'Yilmaz', 'Zhang',
+]
+TITLE_ADJECTIVES = [
+    'Silent', 'Hidden', 'Last', 'Broken', 'Golden', 'Distant', 'Secret', 'Burning', 'Quiet',
+    'Forgotten', 'Endless', 'Crimson', 'Northern', 'Little', 'Wild', 'Electric',
+]
+TITLE_NOUNS = [
+    'River', 'Kingdom', 'Garden', 'Empire', 'Harbour', 'Archive', 'Mountain', 'Orchard', 'Signal',
+    'Forest', 'Lighthouse', 'Machine', 'Library', 'Storm', 'Promise', 'Voyage', 'City', 'Winter',
+]
+TITLE_PATTERNS = ['The {adj} {noun}', '{noun} of the {adj}', 'My {adj} {noun}', 'The {noun}']
+CITIES = [
+    'Accra', 'Lagos', 'Nairobi', 'Kigali', 'Cairo', 'Lisbon', 'Oslo', 'Dublin', 'Austin', 'Denver',
+    'Osaka', 'Pune', 'Quito', 'Lima', 'Perth', 'Tartu',
+]
+LIBRARY_KINDS = ['Central Library', 'Public Library', 'Branch Library', 'Community Library', 'Reading Room']
+
+# Share of generated users per role
+ROLE_WEIGHTS = {'Admin': 2, 'Librarian': 8, 'Member': 90}
+
+
+def batched(iterable, size):
+    """Yield lists of up to `size` items from an iterable."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a realistic relationship_app dataset of configurable size: authors, '
+        'books, libraries with their books and librarians, and users with roles. '
+        'Rows are written with bulk_create in batches, so millions of rows take minutes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--authors', type=int, default=1000)
+        parser.add_argument('--books', type=int, default=20000)
+        parser.add_argument('--libraries', type=int, default=50)
+        parser.add_argument('--books-per-library', type=int, default=2000,
+                            help='Books held by each library (capped at --books).')
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--password', default='password', help='Password of every generated user.')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, help='Random seed, for reproducible datasets.')
+        parser.add_argument('--clear', action='store_true',
+                            help='Delete existing authors, books, libraries and librarians first.')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+
+        if options['clear']:
+            with transaction.atomic():
+                # Deleting authors cascades to books, their library memberships and so on
+                Librarian.objects.all().delete()
+                Library.objects.all().delete()
+                Author.objects.all().delete()
+
+        author_ids = self.create_authors(options['authors'])
+        book_ids = self.create_books(options['books'], author_ids)
+        library_ids = self.create_libraries(options['libraries'])
+        self.create_librarians(library_ids)
+        self.create_memberships(library_ids, book_ids, options['books_per_library'])
+        self.create_users(options['users'], options['password'])
+        # bulk_create sends no signals, so cached catalogue aggregates are expired here
+        bump_catalogue_version()
+
+    def insert(self, label, model, objects, return_pks=True):
+        """bulk_create objects in batches; return the primary keys of the new rows."""
+        start = time.perf_counter()
+        pks = []
+        count = 0
+        for batch in batched(objects, self.batch_size):
+            with transaction.atomic():
+                created = model.objects.bulk_create(batch, batch_size=self.batch_size)
+            if return_pks:
+                pks.extend(obj.pk for obj in created)
+            count += len(batch)
+        elapsed = time.perf_counter() - start
+        rate = f' ({count / elapsed:,.0f} rows/s)' if elapsed and count else ''
+        self.stdout.write(f'{label:<22} {count:>10,} rows in {elapsed:6.1f}s{rate}')
+        return pks
+
+    def person_name(self):
+        return f'{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}'
+
+    def create_authors(self, count):
+        return self.insert('Authors', Author, (Author(name=self.person_name()) for _ in range(count)))
+
+    def create_books(self, count, author_ids):
+        if not author_ids:
+            return []
+
+        def books():
+            for _ in range(count):
+                title = self.random.choice(TITLE_PATTERNS).format(
+                    adj=self.random.choice(TITLE_ADJECTIVES), noun=self.random.choice(TITLE_NOUNS)
+                )
+                yield Book(
+                    title=title,
+                    author_id=self.random.choice(author_ids),
+                    publication_year=int(self.random.triangular(1850, 2025, 2005)),
+                )
+        return self.insert('Books', Book, books())
+
+    def create_libraries(self, count):
+        return self.insert('Libraries', Library, (
+            Library(name=f'{self.random.choice(CITIES)} {self.random.choice(LIBRARY_KINDS)} {n + 1}')
+            for n in range(count)
+        ))
+
+    def create_librarians(self, library_ids):
+        self.insert('Librarians', Librarian, (
+            Librarian(name=self.person_name(), library_id=library_id) for library_id in library_ids
+        ), return_pks=False)
+
+    def create_memberships(self, library_ids, book_ids, books_per_library):
+        per_library = min(books_per_library, len(book_ids))
+        self.insert('Library memberships', LibraryBook, (
+            LibraryBook(library_id=library_id, book_id=book_id)
+            for library_id in library_ids
+            for book_id in self.random.sample(book_ids, per_library)
+        ), return_pks=False)
+
+    def create_users(self, count, password):
+        # Hashing is deliberately slow; every generated user shares one hash.
+        password_hash = make_password(password)
+        run = uuid.uuid4().hex[:8]
+        user_ids = self.insert('Users', User, (
+            User(username=f'reader-{run}-{n}', email=f'reader-{run}-{n}@example.com', password=password_hash)
+            for n in range(count)
+        ))
+        # bulk_create sends no post_save, so profiles are not created by the signal
+        roles, weights = zip(*ROLE_WEIGHTS.items())
+        self.insert('User profiles', UserProfile, (
+            UserProfile(user_id=user_id, role=self.random.choices(roles, weights)[0]) for user_id in user_ids
+        ))
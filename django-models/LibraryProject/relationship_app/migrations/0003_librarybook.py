@@ -0,0 +1,41 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Turn the auto-created Library.books through model into LibraryBook on
+    the same table (state only), then add the covering (book, library) index.
+    """
+
+    dependencies = [
+        ('relationship_app', '0002_userprofile'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='LibraryBook',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='relationship_app.book')),
+                        ('library', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='relationship_app.library')),
+                    ],
+                    options={
+                        'db_table': 'relationship_app_library_books',
+                        'unique_together': {('library', 'book')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='library',
+                    name='books',
+                    field=models.ManyToManyField(through='relationship_app.LibraryBook', to='relationship_app.book'),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='librarybook',
+            index=models.Index(fields=['book', 'library'], name='rel_librarybook_book_lib_idx'),
+        ),
+    ]
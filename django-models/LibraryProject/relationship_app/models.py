@@ -24,11 +24,31 @@ class Book(models.Model):
 
 class Library(models.Model):
     name = models.CharField(max_length=100)
-    books = models.ManyToManyField(Book)
+    books = models.ManyToManyField(Book, through='LibraryBook')
 
     def __str__(self):
         return self.name
 
+class LibraryBook(models.Model):
+    """
+    Through model of Library.books, declared explicitly so the table can carry
+    the indexes the catalogue aggregates (relationship_app/catalogue.py) use.
+    It keeps the table of the original auto-created through model.
+    """
+    library = models.ForeignKey(Library, on_delete=models.CASCADE)
+    book = models.ForeignKey(Book, on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = 'relationship_app_library_books'
+        unique_together = [('library', 'book')]
+        indexes = [
+            # Book -> libraries holding it: libraries per author, library overlap
+            models.Index(fields=['book', 'library'], name='rel_librarybook_book_lib_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.book_id} in {self.library_id}'
+
 class Librarian(models.Model):
     name = models.CharField(max_length=100)
     library = models.OneToOneField(Library, on_delete=models.CASCADE, primary_key=True)
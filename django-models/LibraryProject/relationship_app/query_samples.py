@@ -1,57 +1,81 @@
-import os
-import django
-
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_models.settings')
-django.setup()
+"""
+Sample queries against existing data. Generate some first with:
 
-from relationship_app.models import Author, Book, Library, Librarian
+    python manage.py seed_library_data --authors 100 --books 1000 --libraries 5 --books-per-library 200
 
-# Create sample data for a clean run
-Author.objects.all().delete()
-Book.objects.all().delete()
-Library.objects.all().delete()
-Librarian.objects.all().delete()
+Then run this file from the LibraryProject directory:
 
-author1 = Author.objects.create(name="J.K. Rowling")
-author2 = Author.objects.create(name="Stephen King")
+    python relationship_app/query_samples.py ["<author name>" ["<library name>"]]
 
-book1 = Book.objects.create(title="Harry Potter and the Sorcerer's Stone", author=author1)
-book2 = Book.objects.create(title="The Shining", author=author2)
-book3 = Book.objects.create(title="It", author=author2)
+Without names, the first author and library in the database are used. Each
+sample is shown in its basic form, followed by an optimized variant that
+gets the same answer in a single query.
+"""
+import os
+import sys
 
-library1 = Library.objects.create(name="Central Library")
-library1.books.add(book1, book2)
+import django
 
-library2 = Library.objects.create(name="City Library")
-library2.books.add(book2, book3)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'LibraryProject.settings')
+django.setup()
 
-librarian1 = Librarian.objects.create(name="Alice", library=library1)
-librarian2 = Librarian.objects.create(name="Bob", library=library2)
+from relationship_app.models import Author, Book, Library, Librarian
 
+author_name = sys.argv[1] if len(sys.argv) > 1 else Author.objects.values_list('name', flat=True).first()
+library_name = sys.argv[2] if len(sys.argv) > 2 else Library.objects.values_list('name', flat=True).first()
+if author_name is None or library_name is None:
+    sys.exit("No authors or libraries yet; run the seed_library_data command first.")
 
 # Query all books by a specific author
-author_name = "Stephen King"
 try:
     author = Author.objects.get(name=author_name)
     books_by_author = Book.objects.filter(author=author)
     print(f"Books by {author_name}:")
-    for book in books_by_author:
+    for book in books_by_author[:20]:
         print(f"- {book.title}")
 except Author.DoesNotExist:
     print(f"Author '{author_name}' not found.")
+except Author.MultipleObjectsReturned:
+    # Generated names repeat; the optimized variant below covers every namesake
+    print(f"Several authors are called '{author_name}'.")
+
+# Optimized: one query joining on the author's name, fetching only the titles
+titles = Book.objects.filter(author__name=author_name).values_list('title', flat=True)
+print(f"\nBooks by {author_name} (single query), first 20:")
+for title in titles[:20]:
+    print(f"- {title}")
 
 # List all books in a library
-library_name = "Central Library"
-library = Library.objects.get(name=library_name)
-books_in_library = library.books.all()
-print(f"\nBooks in {library_name}:")
-for book in books_in_library:
-    print(f"- {book.title}")
+library = None
+try:
+    library = Library.objects.get(name=library_name)
+    books_in_library = library.books.all()
+    print(f"\nBooks in {library_name}, first 20:")
+    for book in books_in_library[:20]:
+        print(f"- {book.title}")
+except Library.DoesNotExist:
+    print(f"\nLibrary '{library_name}' not found.")
+
+# Optimized: one query through the membership table, with the authors joined in
+books_in_library = (
+    Book.objects.filter(library__name=library_name)
+    .select_related('author')
+    .only('title', 'author__name')
+    .order_by('title', 'pk')
+)
+print(f"\nBooks in {library_name} (single query), first 20:")
+for book in books_in_library[:20]:
+    print(f"- {book.title} by {book.author.name}")
 
 # Retrieve the librarian for a library
-library_name = "Central Library"
-try:
-    librarian = Librarian.objects.get(library=library1)
-    print(f"\nLibrarian for '{library_name}': {librarian.name}")
-except Librarian.DoesNotExist:
-    print(f"\nNo librarian found for '{library_name}'.")
\ No newline at end of file
+if library is not None:
+    try:
+        librarian = Librarian.objects.get(library=library)
+        print(f"\nLibrarian for '{library_name}': {librarian.name}")
+    except Librarian.DoesNotExist:
+        print(f"\nNo librarian found for '{library_name}'.")
+
+# Optimized: librarian and library in one query, by the library's name
+librarian = Librarian.objects.select_related('library').filter(library__name=library_name).first()
+print(f"\nLibrarian for '{library_name}' (single query): {librarian.name if librarian else None}")
@@ -0,0 +1,91 @@
+from django.contrib.auth.decorators import user_passes_test
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+
+from .models import UserProfile
+
+ADMIN = 'Admin'
+LIBRARIAN = 'Librarian'
+MEMBER = 'Member'
+
+ROLE_CACHE_TIMEOUT = 60 * 60
+# Cached for users without a profile, so they don't hit the database either
+NO_ROLE = ''
+
+
+def role_cache_key(user_id):
+    return f'relationship_app:role:{user_id}'
+
+
+def get_role(user):
+    """
+    Return the role of a user ('Admin', 'Librarian', 'Member') or None.
+
+    The role is looked up at most once per user object (i.e. once per request
+    for request.user) and kept in the cache between requests, so role checks
+    normally cost no queries. A profile that is already loaded is used as is.
+    """
+    if not user.is_authenticated:
+        return None
+    try:
+        return user._relationship_app_role
+    except AttributeError:
+        pass
+
+    profile = user._state.fields_cache.get('userprofile')
+    if profile is not None:
+        role = profile.role
+    else:
+        key = role_cache_key(user.pk)
+        role = cache.get(key)
+        if role is None:
+            role = (
+                UserProfile.objects.filter(user_id=user.pk).values_list('role', flat=True).first()
+                or NO_ROLE
+            )
+            cache.set(key, role, ROLE_CACHE_TIMEOUT)
+    user._relationship_app_role = role or None
+    return user._relationship_app_role
+
+
+def has_role(user, *roles):
+    return get_role(user) in roles
+
+
+def invalidate_role(user_id):
+    """Forget the cached role of a user. Called from relationship_app/signals.py."""
+    cache.delete(role_cache_key(user_id))
+
+
+def role_required(*roles, login_url=None, raise_exception=False):
+    """
+    View decorator: only let users with one of the given roles through.
+
+        @role_required(LIBRARIAN, ADMIN)
+        def view(request): ...
+
+    Others are redirected to the login page, or get a 403 with
+    `raise_exception=True`.
+    """
+    def check(user):
+        if has_role(user, *roles):
+            return True
+        if raise_exception and user.is_authenticated:
+            raise PermissionDenied
+        return False
+
+    return user_passes_test(check, login_url=login_url)
+
+
+class RoleRequiredMixin(UserPassesTestMixin):
+    """
+    Class-based view counterpart of role_required:
+
+        class ReportView(RoleRequiredMixin, TemplateView):
+            allowed_roles = [ADMIN]
+    """
+    allowed_roles = ()
+
+    def test_func(self):
+        return has_role(self.request.user, *self.allowed_roles)
@@ -1,9 +1,33 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import UserProfile
+from .catalogue import bump_catalogue_version
+from .models import Author, Book, Library, UserProfile
+from .roles import invalidate_role
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
-        UserProfile.objects.create(user=instance)
\ No newline at end of file
+        UserProfile.objects.create(user=instance)
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def forget_cached_role(sender, instance, **kwargs):
+    # Profile edits made with QuerySet.update() bypass this; call invalidate_role() there.
+    invalidate_role(instance.user_id)
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+@receiver(post_save, sender=Library)
+@receiver(post_delete, sender=Library)
+def expire_catalogue(sender, **kwargs):
+    bump_catalogue_version()
+
+@receiver(m2m_changed, sender=Library.books.through)
+def expire_catalogue_on_holdings_change(sender, action, **kwargs):
+    # Holdings written with LibraryBook.objects or bulk_create bypass this;
+    # call bump_catalogue_version() there.
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_catalogue_version()
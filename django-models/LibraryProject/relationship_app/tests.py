@@ -1,3 +1,236 @@
-from django.test import TestCase
+import json
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import catalogue
+from .models import Author, Book, Librarian, Library, UserProfile
+from .roles import ADMIN, LIBRARIAN, MEMBER, get_role, role_required
+from .views import is_admin, is_librarian, is_member
+
+
+class RoleCacheTests(TestCase):
+    """
+    Tests for the cached role lookups in relationship_app/roles.py.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='reader', password='password')
+        self.factory = RequestFactory()
+
+    def fresh_user(self):
+        # A new object, as request.user is on every request
+        return User.objects.get(pk=self.user.pk)
+
+    def test_role_is_loaded_once_then_cached(self):
+        user = self.fresh_user()
+        with self.assertNumQueries(1):
+            self.assertTrue(is_member(user))
+            self.assertFalse(is_admin(user))
+            self.assertFalse(is_librarian(user))
+
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_role(user), MEMBER)
+
+    def test_role_change_invalidates_cache(self):
+        get_role(self.fresh_user())
+        profile = UserProfile.objects.get(user=self.user)
+        profile.role = LIBRARIAN
+        profile.save()
+        self.assertTrue(is_librarian(self.fresh_user()))
+
+        profile.delete()
+        self.assertIsNone(get_role(self.fresh_user()))
+
+    def test_anonymous_user_has_no_role(self):
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_role(AnonymousUser()))
+
+    def test_role_required_decorator(self):
+        view = role_required(ADMIN, raise_exception=True)(lambda request: HttpResponse('ok'))
+        request = self.factory.get('/')
+
+        request.user = AnonymousUser()
+        self.assertEqual(view(request).status_code, 302)
+
+        request.user = self.fresh_user()
+        with self.assertRaises(PermissionDenied):
+            view(request)
+
+        UserProfile.objects.filter(user=self.user).update(role=ADMIN)
+        cache.clear()
+        request.user = self.fresh_user()
+        self.assertEqual(view(request).status_code, 200)
+
+
+class LibraryDetailViewTests(TestCase):
+    """
+    Tests for the library detail page and its streamed JSON variant.
+    """
+
+    def setUp(self):
+        self.library = Library.objects.create(name='Central')
+        Librarian.objects.create(name='Ada', library=self.library)
+        authors = Author.objects.bulk_create(Author(name=f'Author {i}') for i in range(5))
+        books = Book.objects.bulk_create(
+            Book(title=f'Book {i:03d}', author=authors[i % 5], publication_year=1900 + i) for i in range(120)
+        )
+        self.library.books.add(*books)
+
+    def test_detail_page_is_paginated_with_constant_queries(self):
+        # Library + librarian, COUNT of books, one page of books with authors
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('library_detail', args=[self.library.pk]), {'page': 2})
+        self.assertContains(response, 'Librarian: Ada')
+        self.assertContains(response, 'Book 050 by Author 0')
+        self.assertNotContains(response, 'Book 049')
+        self.assertEqual(response.context['page_obj'].paginator.count, 120)
+
+    def test_json_variant_streams_every_book(self):
+        with mock.patch('relationship_app.views.LIBRARY_JSON_CHUNK_SIZE', 50):
+            response = self.client.get(reverse('library_detail_json', args=[self.library.pk]))
+            self.assertTrue(response.streaming)
+            data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(data['librarian'], 'Ada')
+        self.assertEqual(len(data['books']), 120)
+        self.assertEqual(data['books'][0], {
+            'id': data['books'][0]['id'],
+            'title': 'Book 000',
+            'publication_year': 1900,
+            'author': {'id': data['books'][0]['author']['id'], 'name': 'Author 0'},
+        })
+
+    def test_json_variant_of_empty_library(self):
+        library = Library.objects.create(name='Empty')
+        response = self.client.get(reverse('library_detail_json', args=[library.pk]))
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), {
+            'id': library.pk, 'name': 'Empty', 'librarian': None, 'books': [],
+        })
+
+
+class SeedLibraryDataTests(TestCase):
+    """
+    Tests for the seed_library_data management command.
+    """
+
+    def seed(self, *args):
+        call_command(
+            'seed_library_data', '--authors', '10', '--books', '200', '--libraries', '3',
+            '--books-per-library', '50', '--users', '20', '--batch-size', '64', '--seed', '7', *args,
+            stdout=StringIO(),
+        )
+
+    def test_generates_the_requested_dataset(self):
+        self.seed()
+        self.assertEqual(Author.objects.count(), 10)
+        self.assertEqual(Book.objects.count(), 200)
+        self.assertEqual(Librarian.objects.count(), 3)
+        for library in Library.objects.all():
+            self.assertEqual(library.books.count(), 50)
+        self.assertEqual(User.objects.count(), 20)
+        # Every generated user gets exactly one profile with a role
+        self.assertEqual(UserProfile.objects.filter(role__in=[ADMIN, LIBRARIAN, MEMBER]).count(), 20)
+        self.assertTrue(User.objects.first().check_password('password'))
+
+    def test_clear_replaces_catalogue_data(self):
+        self.seed()
+        self.seed('--clear')
+        self.assertEqual(Book.objects.count(), 200)
+        self.assertEqual(Library.objects.count(), 3)
+        self.assertEqual(User.objects.count(), 40)
+
+
+class CatalogueAggregateTests(TestCase):
+    """
+    Tests for the cross-library aggregates in relationship_app/catalogue.py.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.orwell = Author.objects.create(name='George Orwell')
+        self.austen = Author.objects.create(name='Jane Austen')
+        self.nineteen = Book.objects.create(title='1984', author=self.orwell)
+        self.farm = Book.objects.create(title='Animal Farm', author=self.orwell)
+        self.emma = Book.objects.create(title='Emma', author=self.austen)
+        self.central = Library.objects.create(name='Central')
+        self.branch = Library.objects.create(name='Branch')
+        self.empty = Library.objects.create(name='Empty')
+        self.central.books.add(self.nineteen, self.farm, self.emma)
+        self.branch.books.add(self.nineteen, self.emma)
+
+    def test_holdings_per_library(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('catalogue_holdings'))
+        self.assertEqual(response.json()['libraries'], [
+            {'id': self.central.pk, 'name': 'Central', 'book_count': 3, 'author_count': 2},
+            {'id': self.branch.pk, 'name': 'Branch', 'book_count': 2, 'author_count': 2},
+            {'id': self.empty.pk, 'name': 'Empty', 'book_count': 0, 'author_count': 0},
+        ])
+        # Served from the cache afterwards
+        with self.assertNumQueries(0):
+            self.client.get(reverse('catalogue_holdings'))
+
+    def test_libraries_per_author(self):
+        response = self.client.get(reverse('catalogue_authors'))
+        self.assertEqual(response.json()['authors'], [
+            {'id': self.orwell.pk, 'name': 'George Orwell', 'library_count': 2, 'book_count': 2},
+            {'id': self.austen.pk, 'name': 'Jane Austen', 'library_count': 2, 'book_count': 1},
+        ])
+
+        response = self.client.get(reverse('catalogue_author_libraries', args=[self.orwell.pk]))
+        self.assertEqual(response.json()['libraries'], [
+            {'id': self.central.pk, 'name': 'Central', 'book_count': 2},
+            {'id': self.branch.pk, 'name': 'Branch', 'book_count': 1},
+        ])
+        self.assertEqual(self.client.get(reverse('catalogue_author_libraries', args=[0])).status_code, 404)
+
+    def test_library_overlap(self):
+        third = Library.objects.create(name='Third')
+        third.books.add(self.farm)
+        # The limited pairs and their total, each one grouped query
+        with self.assertNumQueries(2):
+            pairs = self.client.get(reverse('catalogue_overlap')).json()['pairs']
+        self.assertEqual([(p['library']['name'], p['other']['name'], p['shared_books']) for p in pairs], [
+            ('Central', 'Branch', 2),
+            ('Central', 'Third', 1),
+        ])
+
+        response = self.client.get(reverse('catalogue_overlap'), {'library': self.branch.pk})
+        self.assertEqual([(p['other']['name'], p['shared_books']) for p in response.json()['pairs']], [
+            ('Central', 2),
+        ])
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('catalogue_overlap'), {'limit': 1})
+        self.assertEqual((response.json()['count'], len(response.json()['pairs'])), (2, 1))
+        self.assertIn('LIMIT 1', context.captured_queries[0]['sql'])
+        self.assertEqual(self.client.get(reverse('catalogue_overlap'), {'limit': 'x'}).status_code, 400)
+
+    def test_holdings_changes_expire_cached_aggregates(self):
+        self.client.get(reverse('catalogue_holdings'))
+        self.empty.books.add(self.emma)
+        libraries = self.client.get(reverse('catalogue_holdings')).json()['libraries']
+        self.assertEqual({row['name']: row['book_count'] for row in libraries}['Empty'], 1)
+
+        self.farm.delete()
+        libraries = self.client.get(reverse('catalogue_holdings')).json()['libraries']
+        self.assertEqual({row['name']: row['book_count'] for row in libraries}['Central'], 2)
+
+    def test_evicted_version_does_not_revive_old_entries(self):
+        cache.delete(catalogue.VERSION_KEY)
+        self.client.get(reverse('catalogue_holdings'))
+        self.empty.books.add(self.emma)
+        # Evicted after the change: the version must not go back to a used one
+        cache.delete(catalogue.VERSION_KEY)
+        libraries = self.client.get(reverse('catalogue_holdings')).json()['libraries']
+        self.assertEqual({row['name']: row['book_count'] for row in libraries}['Empty'], 1)
@@ -6,6 +6,12 @@ urlpatterns = [
     # Task 1: Basic Views and URL Configuration
     path('books/', views.book_list, name='book_list'),
     path('library/<int:pk>/', views.LibraryDetailView.as_view(), name='library_detail'),
+    path('library/<int:pk>/json/', views.library_detail_json, name='library_detail_json'),
+    path('catalogue/holdings/', views.catalogue_holdings_json, name='catalogue_holdings'),
+    path('catalogue/authors/', views.catalogue_authors_json, name='catalogue_authors'),
+    path('catalogue/authors/<int:pk>/libraries/', views.catalogue_author_libraries_json,
+         name='catalogue_author_libraries'),
+    path('catalogue/overlap/', views.catalogue_overlap_json, name='catalogue_overlap'),
 
     # Task 2: User Authentication Views
     path('register/', views.register_view, name='register'),
@@ -1,12 +1,24 @@
+import json
+
+from django.core.paginator import Paginator
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic import DetailView
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib import messages
 from django.contrib.auth.decorators import user_passes_test, permission_required, login_required
-from .models import Book, Library
+from . import catalogue
+from .models import Author, Book, Library
+from .roles import ADMIN, LIBRARIAN, MEMBER, has_role, role_required
 from django.contrib.auth.decorators import permission_required 
 
+# Books per chunk when streaming a library as JSON
+LIBRARY_JSON_CHUNK_SIZE = 2000
+# Library pairs returned by catalogue_overlap_json by default / at most
+OVERLAP_DEFAULT_LIMIT = 100
+OVERLAP_MAX_LIMIT = 1000
+
 # Task 1: Basic Views
 def book_list(request):
     """
@@ -19,10 +31,107 @@ def book_list(request):
 class LibraryDetailView(DetailView):
     """
     Class-based view to display a single library's details.
+    The librarian is joined in and the books are shown one page at a time
+    (`?page=N`) with their authors joined in, so the page costs the same few
+    queries however large the library's holdings are.
     """
     model = Library
     template_name = 'relationship_app/library_detail.html'
     context_object_name = 'library'
+    paginate_by = 50
+
+    def get_queryset(self):
+        return Library.objects.select_related('librarian')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        books = self.object.books.select_related('author').order_by('title', 'pk')
+        page_obj = Paginator(books, self.paginate_by).get_page(self.request.GET.get('page'))
+        context.update({'page_obj': page_obj, 'books': page_obj.object_list})
+        return context
+
+
+def library_detail_json(request, pk):
+    """
+    JSON variant of LibraryDetailView with the complete list of books.
+    The response is streamed: books are read with .iterator() and encoded one
+    chunk at a time, so memory use stays flat for any library size.
+    """
+    library = get_object_or_404(Library.objects.select_related('librarian'), pk=pk)
+    books = (
+        library.books.order_by('pk')
+        .values_list('pk', 'title', 'publication_year', 'author_id', 'author__name')
+        .iterator(chunk_size=LIBRARY_JSON_CHUNK_SIZE)
+    )
+    return StreamingHttpResponse(_library_json_chunks(library, books), content_type='application/json')
+
+
+def _library_json_chunks(library, books):
+    librarian = getattr(library, 'librarian', None)
+    header = {'id': library.pk, 'name': library.name, 'librarian': librarian.name if librarian else None}
+    # Everything but the closing brace, then the books array one batch at a time
+    yield json.dumps(header)[:-1] + ', "books": ['
+    batch = []
+    separator = ''
+    for book_id, title, year, author_id, author_name in books:
+        batch.append(json.dumps({
+            'id': book_id,
+            'title': title,
+            'publication_year': year,
+            'author': {'id': author_id, 'name': author_name},
+        }))
+        if len(batch) == LIBRARY_JSON_CHUNK_SIZE:
+            yield separator + ', '.join(batch)
+            batch = []
+            separator = ', '
+    if batch:
+        yield separator + ', '.join(batch)
+    yield ']}'
+
+# Catalogue aggregates (see catalogue.py)
+def catalogue_holdings_json(request):
+    """Distinct books and authors held by each library."""
+    return JsonResponse({'libraries': catalogue.holdings_per_library()})
+
+
+def catalogue_authors_json(request):
+    """Number of libraries holding each author's books."""
+    return JsonResponse({'authors': catalogue.libraries_per_author()})
+
+
+def catalogue_author_libraries_json(request, pk):
+    """The libraries holding books by one author."""
+    author = get_object_or_404(Author, pk=pk)
+    return JsonResponse({
+        'author': {'id': author.pk, 'name': author.name},
+        'libraries': catalogue.libraries_for_author(author.pk),
+    })
+
+
+def catalogue_overlap_json(request):
+    """
+    Pairs of libraries with the number of books they both hold, most shared
+    first. `?library=<id>` restricts the pairs to one library, `?limit=N`
+    caps the number of pairs returned.
+    """
+    try:
+        library_id = int(request.GET['library']) if request.GET.get('library') else None
+        limit = int(request.GET.get('limit', OVERLAP_DEFAULT_LIMIT))
+    except ValueError:
+        return JsonResponse({'detail': 'library and limit must be integers.'}, status=400)
+    limit = max(0, min(limit, OVERLAP_MAX_LIMIT))
+    pairs = catalogue.library_overlap(library_id, limit)
+    return JsonResponse({
+        'count': catalogue.library_overlap_count(library_id),
+        'pairs': [
+            {
+                'library': {'id': first_id, 'name': first_name},
+                'other': {'id': other_id, 'name': other_name},
+                'shared_books': shared,
+            }
+            for first_id, first_name, other_id, other_name, shared in pairs
+        ],
+    })
 
 # Task 2: User Authentication Views
 def register_view(request):
@@ -71,24 +180,26 @@ def logout_view(request):
     return render(request, 'relationship_app/logout.html')
 
 # Task 3: Role-Based Access Control Views
+# Roles are resolved through relationship_app/roles.py: one lookup per request
+# at most, cached between requests.
 def is_admin(user):
-    return user.is_authenticated and hasattr(user, 'userprofile') and user.userprofile.role == 'Admin'
+    return has_role(user, ADMIN)
 
 def is_librarian(user):
-    return user.is_authenticated and hasattr(user, 'userprofile') and user.userprofile.role == 'Librarian'
+    return has_role(user, LIBRARIAN)
 
 def is_member(user):
-    return user.is_authenticated and hasattr(user, 'userprofile') and user.userprofile.role == 'Member'
+    return has_role(user, MEMBER)
 
-@user_passes_test(is_admin)
+@role_required(ADMIN)
 def admin_view(request):
     return render(request, 'relationship_app/admin_view.html')
 
-@user_passes_test(is_librarian)
+@role_required(LIBRARIAN)
 def librarian_view(request):
     return render(request, 'relationship_app/librarian_view.html')
 
-@user_passes_test(is_member)
+@role_required(MEMBER)
 def member_view(request):
     return render(request, 'relationship_app/member_view.html')
 
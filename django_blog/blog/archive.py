@@ -0,0 +1,117 @@
+# blog/archive.py
+
+from collections import Counter as TallyCounter
+from datetime import date, datetime
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import Post, PostMonthCount
+
+# Entries are keyed by the archive version (bumped whenever a post is added,
+# removed or changes author), so the timeout only bounds their lifetime.
+ARCHIVE_CACHE_TIMEOUT = 60 * 60 * 24
+VERSION_KEY = 'blog:archive:version'
+
+
+def get_archive_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def bump_archive_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 2, None)
+
+
+def month_of(published_date):
+    """(year, month) of a publication date in the current time zone."""
+    local = timezone.localtime(published_date)
+    return local.year, local.month
+
+
+def month_range(year, month=None):
+    """
+    Aware [start, end) datetimes of a year, or of a month of it. Raises
+    ValueError for dates that don't exist.
+    """
+    start = datetime(year, 1 if month is None else month, 1)
+    if month is None or month == 12:
+        end = datetime(year + 1, 1, 1)
+    else:
+        end = datetime(year, month + 1, 1)
+    return timezone.make_aware(start), timezone.make_aware(end)
+
+
+# --- Maintenance (called from blog/signals.py) ---
+
+def record_post(author_id, published_date, delta):
+    """Add `delta` to the month count of an author's post."""
+    year, month = month_of(published_date)
+    lookup = {'author_id': author_id, 'year': year, 'month': month}
+    if delta > 0:
+        PostMonthCount.objects.bulk_create([PostMonthCount(**lookup)], ignore_conflicts=True)
+    PostMonthCount.objects.filter(**lookup).update(post_count=F('post_count') + delta)
+    bump_archive_version()
+
+
+def rebuild_month_counts(batch_size=1000):
+    """Recompute every month count from the posts table. Returns the number of posts seen."""
+    counts = TallyCounter()
+    posts = Post.objects.order_by().values_list('author_id', 'published_date')
+    for author_id, published_date in posts.iterator(chunk_size=batch_size):
+        counts[(author_id, *month_of(published_date))] += 1
+    with transaction.atomic():
+        PostMonthCount.objects.all().delete()
+        PostMonthCount.objects.bulk_create(
+            (
+                PostMonthCount(author_id=author_id, year=year, month=month, post_count=count)
+                for (author_id, year, month), count in counts.items()
+            ),
+            batch_size=batch_size,
+        )
+    bump_archive_version()
+    return counts.total()
+
+
+# --- Reads ---
+
+def _archive_months(author_id):
+    rows = PostMonthCount.objects.filter(post_count__gt=0)
+    if author_id is not None:
+        rows = rows.filter(author_id=author_id)
+    rows = list(
+        rows.values('year', 'month').annotate(post_count=Sum('post_count')).order_by('-year', '-month')
+    )
+    for row in rows:
+        row['date'] = date(row['year'], row['month'], 1)
+    return rows
+
+
+def archive_months(author_id=None):
+    """
+    Months with posts, newest first, as dicts with `year`, `month`, `date`
+    and `post_count` - site-wide, or for one author. Read from the month
+    counts (a row per author and month), never from the posts table.
+    """
+    key = f'blog:archive:{get_archive_version()}:months:{author_id}'
+    rows = cache.get(key)
+    if rows is None:
+        rows = _archive_months(author_id)
+        cache.set(key, rows, ARCHIVE_CACHE_TIMEOUT)
+    return rows
+
+
+def archive_count(year, month=None, author_id=None):
+    """Number of posts in a year or month, site-wide or for one author."""
+    return sum(
+        row['post_count'] for row in archive_months(author_id)
+        if row['year'] == year and month in (None, row['month'])
+    )
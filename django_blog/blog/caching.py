@@ -0,0 +1,49 @@
+# blog/caching.py
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Post
+
+# Entries are keyed by post version, so stale ones are never read again and
+# simply expire; the timeout only bounds how long they occupy the cache.
+POST_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def post_version(updated_at):
+    """Integer version of a post, derived from its `updated_at` timestamp."""
+    return int(updated_at.timestamp() * 1_000_000)
+
+
+def post_etag(pk, updated_at):
+    return f'"post-{pk}-{post_version(updated_at)}"'
+
+
+def post_page_cache_key(pk, updated_at):
+    return f'blog:post:{pk}:v{post_version(updated_at)}:page'
+
+
+def get_post_updated_at(pk):
+    """Fetch only the post's version timestamp (None if the post does not exist)."""
+    return Post.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+
+
+def touch_post(pk):
+    """
+    Bump a post's `updated_at` after a change to something rendered with it
+    (tags, comments). Uses update() so no Post signals fire again.
+    """
+    touch_posts([pk])
+
+
+def touch_posts(pks):
+    """touch_post() for several posts in one UPDATE."""
+    Post.objects.filter(pk__in=pks).update(updated_at=timezone.now())
+
+
+def get_cached_page(pk, updated_at):
+    return cache.get(post_page_cache_key(pk, updated_at))
+
+
+def set_cached_page(pk, updated_at, content):
+    cache.set(post_page_cache_key(pk, updated_at), content, POST_CACHE_TIMEOUT)
@@ -0,0 +1,185 @@
+# blog/comment_queue.py
+
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from collections import Counter as TallyCounter
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from . import counters
+from .caching import touch_posts
+from .models import Comment, Post
+
+logger = logging.getLogger(__name__)
+# Comments that could not be written after every retry; route this logger to a
+# durable handler (file, Sentry, ...) to keep them for manual recovery.
+dead_letter_logger = logging.getLogger(f'{__name__}.dead_letter')
+
+# Comments written per bulk_create, and how long the worker waits for a batch to fill up.
+COMMENT_BATCH_SIZE = getattr(settings, 'BLOG_COMMENT_BATCH_SIZE', 100)
+COMMENT_FLUSH_INTERVAL = getattr(settings, 'BLOG_COMMENT_FLUSH_INTERVAL', 0.5)
+# Writes of a failed batch are retried this many times in all, the worker
+# waiting RETRY_DELAY seconds after the first failure and twice as long after
+# each further one (at most MAX_RETRY_DELAY).
+COMMENT_MAX_ATTEMPTS = getattr(settings, 'BLOG_COMMENT_MAX_ATTEMPTS', 5)
+COMMENT_RETRY_DELAY = getattr(settings, 'BLOG_COMMENT_RETRY_DELAY', 1.0)
+COMMENT_MAX_RETRY_DELAY = 60
+
+
+def write_comments(comments):
+    """
+    Insert queued comments with one bulk_create and apply what the Comment
+    signals would have done: bump the per-post comment counters and the post
+    versions. Comments on posts deleted in the meantime are dropped.
+    Returns the comments that were written.
+    """
+    post_ids = {comment.post_id for comment in comments}
+    with transaction.atomic():
+        # Lock the posts, so none can be deleted between this check and the insert
+        existing = set(
+            Post.objects.select_for_update().filter(pk__in=post_ids).values_list('pk', flat=True)
+        )
+        comments = [comment for comment in comments if comment.post_id in existing]
+        if not comments:
+            return []
+        Comment.objects.bulk_create(comments)
+        for post_id, count in TallyCounter(comment.post_id for comment in comments).items():
+            counters.increment(counters.post_comments_key(post_id), count)
+        touch_posts(existing)
+    return comments
+
+
+class CommentQueue:
+    """
+    In-process stand-in for a message queue carrying new comments.
+
+    Request threads only `put()` an unsaved Comment and return; a single
+    background worker drains the queue and writes up to `batch_size`
+    comments per transaction with write_comments(). Under a burst of
+    comments the database sees a few bulk inserts instead of one insert
+    (and its lock) per request.
+
+    A batch that fails to write goes back on the queue and is retried, up to
+    `max_attempts` writes per comment, with a growing delay in the worker.
+    Comments that still fail are logged in full to the dead-letter logger.
+
+    Anything still queued when the process exits is flushed. A deployment
+    with several processes should swap this for a real broker (Redis,
+    Celery, ...) exposing the same put()/flush() interface.
+    """
+
+    def __init__(self, batch_size=COMMENT_BATCH_SIZE, flush_interval=COMMENT_FLUSH_INTERVAL,
+                 max_attempts=COMMENT_MAX_ATTEMPTS, retry_delay=COMMENT_RETRY_DELAY):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def put(self, comment):
+        self._queue.put(comment)
+        # Tests and management commands turn the worker off and call flush() themselves
+        if getattr(settings, 'BLOG_COMMENT_QUEUE_WORKER', True):
+            self._ensure_worker()
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def next_batch(self, timeout=None):
+        """
+        Take up to `batch_size` comments off the queue. Waits up to `timeout`
+        seconds for the first one (forever if None) and then at most
+        `flush_interval` for the batch to fill up.
+        """
+        try:
+            batch = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def write(self, batch):
+        """
+        Write a batch with write_comments(). Returns the number of comments
+        written, or None if the write failed and the batch was put back on
+        the queue (or dead-lettered).
+        """
+        try:
+            return len(write_comments(batch))
+        except Exception:
+            logger.exception('Could not write %d queued comments', len(batch))
+        for comment in batch:
+            comment._write_attempts = getattr(comment, '_write_attempts', 0) + 1
+            if comment._write_attempts < self.max_attempts:
+                self._queue.put(comment)
+            else:
+                dead_letter_logger.error('Giving up on a queued comment after %d attempts: %s',
+                                         comment._write_attempts, json.dumps(self.payload(comment)))
+        return None
+
+    @staticmethod
+    def payload(comment):
+        return {
+            'post_id': comment.post_id,
+            'author_id': comment.author_id,
+            'content': comment.content,
+            'created_at': comment.created_at.isoformat(),
+        }
+
+    def flush(self):
+        """
+        Write everything queued so far from the calling thread; return the
+        number written. Stops at the first failed batch, leaving it queued.
+        """
+        written = 0
+        while True:
+            batch = []
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if not batch:
+                return written
+            count = self.write(batch)
+            if count is None:
+                return written
+            written += count
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                if self._worker is None:
+                    atexit.register(self.flush)
+                self._worker = threading.Thread(target=self._run, name='blog-comment-writer', daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        failures = 0
+        while True:
+            batch = self.next_batch()
+            close_old_connections()
+            if self.write(batch) is not None:
+                failures = 0
+                continue
+            # Back off before the retried batch comes round again
+            time.sleep(min(self.retry_delay * 2 ** failures, COMMENT_MAX_RETRY_DELAY))
+            failures += 1
+
+
+comment_queue = CommentQueue()
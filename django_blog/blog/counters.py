@@ -0,0 +1,56 @@
+# blog/counters.py
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import Comment, Counter, Post
+
+TOTAL_POSTS = 'posts:total'
+
+
+def post_comments_key(post_id):
+    return f'post:{post_id}:comments'
+
+
+def author_posts_key(author_id):
+    return f'author:{author_id}:posts'
+
+
+def get_count(name):
+    """
+    Return the current value of a counter. Every counter is seeded by
+    rebuild_counters() (and migration 0012), so a missing row means zero.
+    """
+    value = Counter.objects.filter(name=name).values_list('value', flat=True).first()
+    return value or 0
+
+
+def increment(name, delta=1):
+    """
+    Atomically add `delta` to a counter, creating its row on the first
+    increment so no update is lost.
+    """
+    if delta > 0:
+        Counter.objects.bulk_create([Counter(name=name)], ignore_conflicts=True)
+    Counter.objects.filter(name=name).update(value=F('value') + delta)
+
+
+def discard(*names):
+    """Drop counters whose subject no longer exists."""
+    Counter.objects.filter(name__in=names).delete()
+
+
+def rebuild_counters(batch_size=1000):
+    """Recompute every counter from the posts and comments tables. Returns the number of counters."""
+    values = {TOTAL_POSTS: Post.objects.count()}
+    posts_per_author = Post.objects.order_by().values_list('author_id').annotate(count=Count('pk'))
+    values.update((author_posts_key(author_id), count) for author_id, count in posts_per_author)
+    comments_per_post = Comment.objects.order_by().values_list('post_id').annotate(count=Count('pk'))
+    values.update((post_comments_key(post_id), count) for post_id, count in comments_per_post)
+    with transaction.atomic():
+        Counter.objects.all().delete()
+        Counter.objects.bulk_create(
+            (Counter(name=name, value=value) for name, value in values.items()),
+            batch_size=batch_size,
+        )
+    return len(values)
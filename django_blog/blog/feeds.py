@@ -0,0 +1,213 @@
+# blog/feeds.py
+
+import hashlib
+
+from django.contrib.auth.models import User
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import Http404, HttpResponse, JsonResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date
+from taggit.models import Tag
+
+from .models import Post
+
+# Posts per feed
+FEED_ITEMS = 20
+# Feed bodies are keyed by the scope's change stamp, so stale ones are never
+# read again; the timeout only bounds how long they occupy the cache.
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+SITE_SCOPE = 'site'
+
+
+def tag_scope(slug):
+    return f'tag:{slug}'
+
+
+def author_scope(username):
+    return f'author:{username}'
+
+
+def _scope_key(scope):
+    # Slugs and usernames from the URL are hashed to keep cache keys portable
+    return hashlib.md5(scope.encode()).hexdigest()
+
+
+def _stamp_key(scope):
+    return f'blog:feed:stamp:{_scope_key(scope)}'
+
+
+def _now_stamp():
+    return int(timezone.now().timestamp() * 1_000_000)
+
+
+def get_feed_stamp(scope, create=True):
+    """
+    Microsecond timestamp of the last change to a post in a feed's scope.
+    A scope seen for the first time starts at "now", unless `create` is
+    False, in which case None is returned.
+    """
+    key = _stamp_key(scope)
+    stamp = cache.get(key)
+    if stamp is None and create:
+        cache.add(key, _now_stamp(), None)
+        stamp = cache.get(key)
+    return stamp
+
+
+def touch_feeds(*scopes):
+    """Mark feeds as changed; called from blog/signals.py when a post in their scope changes."""
+    stamp = _now_stamp()
+    cache.set_many({_stamp_key(scope): stamp for scope in scopes}, None)
+
+
+def forget_feeds(*scopes):
+    """Drop the stamps of scopes that no longer exist (a tag or user renamed away)."""
+    cache.delete_many([_stamp_key(scope) for scope in scopes])
+
+
+class FeedScope:
+    """The posts a feed covers, with the feed's title, description and HTML page."""
+
+    def __init__(self, title, description, link, posts):
+        self.title = title
+        self.description = description
+        self.link = link
+        self.posts = posts
+
+
+class PostFeed(Feed):
+    """
+    RSS 2.0 feed of the latest posts: site-wide, of a tag (`tag_slug`) or
+    of an author (`username`).
+    """
+
+    def get_object(self, request, tag_slug=None, username=None):
+        posts = Post.objects.select_related('author').prefetch_related('tags').order_by('-published_date', '-pk')
+        if tag_slug is not None:
+            tag = Tag.objects.get(slug=tag_slug)
+            return FeedScope(
+                f'Django Blog: {tag.name}', f'Latest posts tagged "{tag.name}".',
+                reverse('posts_by_tag', kwargs={'tag_slug': tag.slug}), posts.filter(tags=tag),
+            )
+        if username is not None:
+            author = User.objects.get(username=username)
+            return FeedScope(
+                f'Django Blog: {author.username}', f'Latest posts by {author.username}.',
+                reverse('author_posts', kwargs={'username': author.username}), posts.filter(author=author),
+            )
+        return FeedScope('Django Blog', 'Latest posts.', reverse('post_list'), posts)
+
+    def title(self, scope):
+        return scope.title
+
+    def description(self, scope):
+        return scope.description
+
+    def link(self, scope):
+        return scope.link
+
+    def items(self, scope):
+        return scope.posts[:FEED_ITEMS]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return post.content
+
+    def item_author_name(self, post):
+        return post.author.username
+
+    def item_pubdate(self, post):
+        return post.published_date
+
+    def item_categories(self, post):
+        return [tag.name for tag in post.tags.all()]
+
+
+class AtomPostFeed(PostFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, scope):
+        return scope.description
+
+
+class JSONPostFeed(PostFeed):
+    """The same feed in JSON Feed 1.1 format (https://jsonfeed.org/version/1.1)."""
+
+    def __call__(self, request, *args, **kwargs):
+        try:
+            scope = self.get_object(request, *args, **kwargs)
+        except ObjectDoesNotExist:
+            raise Http404('Feed object does not exist.')
+        return JsonResponse({
+            'version': 'https://jsonfeed.org/version/1.1',
+            'title': scope.title,
+            'description': scope.description,
+            'home_page_url': request.build_absolute_uri(scope.link),
+            'feed_url': request.build_absolute_uri(),
+            'items': [
+                {
+                    'id': str(post.pk),
+                    'url': request.build_absolute_uri(post.get_absolute_url()),
+                    'title': post.title,
+                    'content_text': post.content,
+                    'date_published': post.published_date.isoformat(),
+                    'authors': [{'name': post.author.username}],
+                    'tags': self.item_categories(post),
+                }
+                for post in self.items(scope)
+            ],
+        }, content_type='application/feed+json')
+
+
+FEEDS = {
+    'rss': PostFeed(),
+    'atom': AtomPostFeed(),
+    'json': JSONPostFeed(),
+}
+
+
+def feed_view(request, feed_format, tag_slug=None, username=None):
+    """
+    Serve a feed from the cache. Bodies are regenerated only after a post in
+    the feed's scope changed, and clients revalidating with the ETag or
+    Last-Modified of the current body get a 304 without any query.
+    """
+    if tag_slug is not None:
+        scope = tag_scope(tag_slug)
+        exists = Tag.objects.filter(slug=tag_slug).exists
+    elif username is not None:
+        scope = author_scope(username)
+        exists = User.objects.filter(username=username).exists
+    else:
+        scope, exists = SITE_SCOPE, None
+    stamp = get_feed_stamp(scope, create=False)
+    if stamp is None:
+        # Stamps never expire, so only tags and authors that exist get one
+        if exists is not None and not exists():
+            raise Http404('Feed object does not exist.')
+        stamp = get_feed_stamp(scope)
+    etag = f'"feed-{feed_format}-{stamp}"'
+    last_modified = stamp // 1_000_000
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        # Bodies hold absolute URLs, so each host and scheme gets its own copy
+        origin = f'{request.scheme}://{request.get_host()}'
+        key = f'blog:feed:{feed_format}:{_scope_key(f"{origin}/{scope}")}:{stamp}'
+        cached = cache.get(key)
+        if cached is None:
+            response = FEEDS[feed_format](request, tag_slug=tag_slug, username=username)
+            cached = (response.headers['Content-Type'], response.content)
+            cache.set(key, cached, FEED_CACHE_TIMEOUT)
+        content_type, content = cached
+        response = HttpResponse(content, content_type=content_type)
+    response.headers['ETag'] = etag
+    response.headers['Last-Modified'] = http_date(last_modified)
+    return response
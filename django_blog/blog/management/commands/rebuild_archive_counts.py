@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog.archive import rebuild_month_counts
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-author month counts behind the archive sidebars.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = rebuild_month_counts(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Counted {count} posts.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized post and comment counters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = rebuild_counters(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} counters.'))
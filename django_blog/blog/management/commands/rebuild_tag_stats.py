@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog.tag_stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the tag statistics (counts, trending, co-occurrence) from all tagged posts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = rebuild_stats(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt tag statistics from {count} tagged posts.'))
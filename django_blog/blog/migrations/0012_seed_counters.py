@@ -0,0 +1,30 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def seed_counters(apps, schema_editor):
+    """
+    Seed every counter, so increments never hit a missing row. Replaces the
+    rows seeded lazily so far; mirrors blog.counters.rebuild_counters().
+    """
+    Post = apps.get_model('blog', 'Post')
+    Comment = apps.get_model('blog', 'Comment')
+    Counter = apps.get_model('blog', 'Counter')
+    values = {'posts:total': Post.objects.count()}
+    for author_id, count in Post.objects.order_by().values_list('author_id').annotate(count=Count('pk')):
+        values[f'author:{author_id}:posts'] = count
+    for post_id, count in Comment.objects.order_by().values_list('post_id').annotate(count=Count('pk')):
+        values[f'post:{post_id}:comments'] = count
+    Counter.objects.all().delete()
+    Counter.objects.bulk_create(Counter(name=name, value=value) for name, value in values.items())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_comment_created_at_default'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,9 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.utils import timezone
 from taggit.managers import TaggableManager
+from taggit.models import Tag
 
 
 class Post(models.Model):
@@ -9,6 +11,8 @@ class Post(models.Model):
     title = models.CharField(max_length=200)
     content = models.TextField()
     published_date = models.DateTimeField(auto_now_add=True)
+    # Also bumped when the post's tags or comments change (blog/caching.py)
+    updated_at = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     tags = TaggableManager() 
 
@@ -20,6 +24,12 @@ class Post(models.Model):
 
     class Meta:
         ordering = ['-published_date']
+        indexes = [
+            # Supports keyset pagination on (published_date, pk), see blog/pagination.py
+            models.Index(fields=['-published_date', '-id'], name='blog_post_pub_date_id_idx'),
+            # An author's posts, newest first: author pages and archives (blog/archive.py)
+            models.Index(fields=['author', '-published_date', '-id'], name='blog_post_author_pub_idx'),
+        ]
 
 
 #  NEW COMMENT MODEL 
@@ -27,15 +37,134 @@ class Comment(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     content = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    # A default rather than auto_now_add: queued comments keep the time they were posted
+    created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now_add=True) # Using auto_now_add for simplicity
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            # A post's comments in (created_at, pk) order, for KeysetPage in blog/pagination.py
+            models.Index(fields=['post', 'created_at', 'id'], name='blog_comment_post_created_idx'),
+        ]
 
     def __str__(self):
         return f'Comment by {self.author.username} on {self.post.title[:20]}'
 
     def get_absolute_url(self):
         # Redirect back to the post detail page
-        return self.post.get_absolute_url()
\ No newline at end of file
+        return self.post.get_absolute_url()
+
+
+class PostSearchToken(models.Model):
+    """
+    One row of the inverted search index: a token and the post it appears in.
+    `weight` is the token's score for that post (title and tag hits count
+    more than content hits). Rows are maintained by blog/signals.py.
+    """
+    token = models.CharField(max_length=50, db_index=True)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='search_tokens')
+    weight = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['token', 'post'], name='blog_search_token_post_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.token} -> {self.post_id}'
+
+
+class Counter(models.Model):
+    """
+    A named, denormalized count (total posts, comments per post, posts per
+    author). Rows are seeded by rebuild_counters() and kept current by
+    blog/signals.py, see blog/counters.py.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.name} = {self.value}'
+
+
+class TagStat(models.Model):
+    """
+    Number of posts carrying a tag, for the tag cloud. Kept current by
+    blog/signals.py through blog/tag_stats.py.
+    """
+    tag = models.OneToOneField(Tag, on_delete=models.CASCADE, primary_key=True, related_name='blog_stat')
+    post_count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-post_count'], name='blog_tagstat_post_count_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.tag_id}: {self.post_count} posts'
+
+
+class TagDailyCount(models.Model):
+    """
+    Number of posts published on `day` carrying a tag; summed over a window
+    of days for trending tags.
+    """
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='+')
+    day = models.DateField()
+    post_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tag', 'day'], name='blog_tagdailycount_tag_day_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['day', 'tag'], name='blog_tagdailycount_day_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.tag_id} on {self.day}: {self.post_count} posts'
+
+
+class TagPair(models.Model):
+    """
+    Number of posts carrying both `tag` and `other` (co-occurrence). Every
+    pair is stored in both directions, so a tag's related tags are a single
+    index range scan.
+    """
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='+')
+    other = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='+')
+    post_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tag', 'other'], name='blog_tagpair_tag_other_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['tag', '-post_count'], name='blog_tagpair_tag_count_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.tag_id} + {self.other_id}: {self.post_count} posts'
+
+
+class PostMonthCount(models.Model):
+    """
+    Number of posts an author published in a month (local time), for the
+    archive sidebars. Kept current by blog/signals.py, see blog/archive.py.
+    """
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    post_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['author', 'year', 'month'], name='blog_postmonthcount_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['year', 'month'], name='blog_postmonthcount_month_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.author_id} {self.year}-{self.month:02d}: {self.post_count} posts'
@@ -0,0 +1,118 @@
+# blog/pagination.py
+
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+
+def encode_cursor(obj, field='published_date'):
+    """
+    Encode the (timestamp, pk) position of an object - by default a post's
+    (published_date, pk) - as an opaque URL-safe string.
+    """
+    raw = f'{getattr(obj, field).isoformat()}|{obj.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Turn a cursor back into a (timestamp, pk) tuple. Raises Http404 if it is malformed.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        published, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(published), int(pk)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise Http404('Invalid cursor.')
+
+
+class KeysetPaginationMixin:
+    """
+    Adds cursor (keyset) pagination on (published_date, pk) to a post ListView.
+
+    Without a `cursor` parameter the view paginates by page number as usual,
+    which is fine for the first few pages. From `max_page_links` onwards the
+    "next" link carries a cursor instead, and cursor requests fetch
+    `WHERE (published_date, pk) < cursor ORDER BY published_date DESC, pk DESC
+    LIMIT n` without any COUNT(*) or OFFSET, so deep pages cost the same as
+    the first one.
+    """
+    cursor_kwarg = 'cursor'
+    max_page_links = 5
+    keyset_ordering = ('-published_date', '-pk')
+
+    next_cursor = None
+
+    def paginate_queryset(self, queryset, page_size):
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        if cursor is None:
+            paginator, page, object_list, is_paginated = super().paginate_queryset(queryset, page_size)
+            if page.has_next() and page.number >= self.max_page_links:
+                self.next_cursor = encode_cursor(page.object_list[len(page.object_list) - 1])
+            return paginator, page, object_list, is_paginated
+
+        published_date, pk = decode_cursor(cursor)
+        queryset = queryset.order_by(*self.keyset_ordering).filter(
+            Q(published_date__lt=published_date) | Q(published_date=published_date, pk__lt=pk)
+        )
+        # Fetch one extra row to find out whether there is a next page.
+        rows = list(queryset[:page_size + 1])
+        object_list = rows[:page_size]
+        if len(rows) > page_size:
+            self.next_cursor = encode_cursor(object_list[-1])
+        return None, None, object_list, self.next_cursor is not None
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['next_cursor'] = self.next_cursor
+        return context
+
+
+class KeysetPage:
+    """
+    One page of a queryset in ascending (field, pk) order, starting after
+    `cursor` (from the beginning without one). Used for post comments, on
+    (created_at, pk).
+
+    The query runs on first access, so a page only rendered inside a cached
+    template fragment costs nothing once the fragment is cached. One extra
+    row is fetched to tell whether there is a next page; no COUNT(*) or
+    OFFSET is involved.
+    """
+
+    def __init__(self, queryset, page_size, cursor=None, field='created_at'):
+        self.queryset = queryset
+        self.page_size = page_size
+        self.cursor = cursor
+        self.field = field
+
+    @cached_property
+    def _rows(self):
+        queryset = self.queryset.order_by(self.field, 'pk')
+        if self.cursor:
+            value, pk = decode_cursor(self.cursor)
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__gt': value}) | Q(**{self.field: value, 'pk__gt': pk})
+            )
+        return list(queryset[:self.page_size + 1])
+
+    @property
+    def object_list(self):
+        return self._rows[:self.page_size]
+
+    @property
+    def next_cursor(self):
+        if len(self._rows) > self.page_size:
+            return encode_cursor(self.object_list[-1], self.field)
+        return None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
@@ -0,0 +1,87 @@
+# blog/search.py
+
+import re
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Q, Sum
+
+from .models import Post, PostSearchToken
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+MAX_TOKEN_LENGTH = 50
+
+# How much a single occurrence of a token is worth in each part of a post.
+TITLE_WEIGHT = 5
+TAG_WEIGHT = 3
+CONTENT_WEIGHT = 1
+
+
+def tokenize(text):
+    """
+    Split text into lowercase word tokens, truncated to fit the index column.
+    """
+    return [token[:MAX_TOKEN_LENGTH] for token in TOKEN_RE.findall((text or '').lower())]
+
+
+def build_token_weights(post):
+    """
+    Return a Counter mapping each token of the post to its weight.
+    """
+    weights = Counter()
+    for token in tokenize(post.title):
+        weights[token] += TITLE_WEIGHT
+    for token in tokenize(post.content):
+        weights[token] += CONTENT_WEIGHT
+    # tags.all() rather than tags.names(), so rebuild_index()'s prefetch is used
+    for tag in post.tags.all():
+        for token in tokenize(tag.name):
+            weights[token] += TAG_WEIGHT
+    return weights
+
+
+def index_post(post):
+    """
+    Replace the index rows of a single post with freshly computed ones.
+    """
+    weights = build_token_weights(post)
+    with transaction.atomic():
+        PostSearchToken.objects.filter(post=post).delete()
+        PostSearchToken.objects.bulk_create(
+            PostSearchToken(token=token, post=post, weight=weight)
+            for token, weight in weights.items()
+        )
+
+
+def rebuild_index(batch_size=500):
+    """
+    Re-index every post. Used to backfill the index for existing data.
+    """
+    count = 0
+    for post in Post.objects.prefetch_related('tags').iterator(chunk_size=batch_size):
+        index_post(post)
+        count += 1
+    return count
+
+
+def search_posts(query):
+    """
+    Return posts matching any term of the query, best matches first.
+
+    Each term is matched as a prefix of an indexed token, so the lookup goes
+    through the token index instead of scanning post titles and bodies.
+    Posts are annotated with `rank`, the sum of the weights of matched tokens.
+    """
+    terms = set(tokenize(query))
+    if not terms:
+        return Post.objects.none()
+
+    match = Q()
+    for term in terms:
+        match |= Q(search_tokens__token__startswith=term)
+
+    return (
+        Post.objects.filter(match)
+        .annotate(rank=Sum('search_tokens__weight'))
+        .order_by('-rank', '-published_date', '-pk')
+    )
@@ -0,0 +1,223 @@
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+from taggit.models import Tag
+from .models import Post, Comment
+from .search import index_post
+from .caching import touch_post
+from . import archive, counters
+from .feeds import SITE_SCOPE, author_scope, forget_feeds, tag_scope, touch_feeds
+from .tag_stats import apply_tag_change
+
+
+@receiver(post_save, sender=Post)
+def index_post_on_save(sender, instance, **kwargs):
+    index_post(instance)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def index_post_on_tag_change(sender, instance, action, **kwargs):
+    # Taggit's TaggedItem is shared by every tagged model, so check the instance.
+    if action in ('post_add', 'post_remove', 'post_clear') and isinstance(instance, Post):
+        index_post(instance)
+
+# Deleting a post removes its PostSearchToken rows through the FK cascade.
+
+
+# --- Denormalized counters (blog/counters.py) ---
+
+@receiver(pre_save, sender=Post)
+def remember_previous_author(sender, instance, **kwargs):
+    instance._previous_author_id = None
+    if instance.pk:
+        instance._previous_author_id = (
+            Post.objects.filter(pk=instance.pk).values_list('author_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Post)
+def count_post_on_save(sender, instance, created, **kwargs):
+    if created:
+        counters.increment(counters.TOTAL_POSTS)
+        counters.increment(counters.author_posts_key(instance.author_id))
+        return
+    previous_author_id = getattr(instance, '_previous_author_id', None)
+    if previous_author_id and previous_author_id != instance.author_id:
+        counters.increment(counters.author_posts_key(previous_author_id), -1)
+        counters.increment(counters.author_posts_key(instance.author_id))
+
+
+@receiver(post_delete, sender=Post)
+def count_post_on_delete(sender, instance, **kwargs):
+    counters.increment(counters.TOTAL_POSTS, -1)
+    counters.increment(counters.author_posts_key(instance.author_id), -1)
+    counters.discard(counters.post_comments_key(instance.pk))
+
+
+@receiver(post_save, sender=Comment)
+def count_comment_on_save(sender, instance, created, **kwargs):
+    if created:
+        counters.increment(counters.post_comments_key(instance.post_id))
+
+
+@receiver(post_delete, sender=Comment)
+def count_comment_on_delete(sender, instance, **kwargs):
+    counters.increment(counters.post_comments_key(instance.post_id), -1)
+
+
+# --- Post versions for the detail page caches (blog/caching.py) ---
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def touch_post_on_tag_change(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear') and isinstance(instance, Post):
+        touch_post(instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def touch_post_on_comment_change(sender, instance, **kwargs):
+    touch_post(instance.post_id)
+
+
+# --- Tag statistics (blog/tag_stats.py) ---
+
+def _post_tag_ids(post):
+    return set(post.tags.through.objects.filter(
+        content_type=ContentType.objects.get_for_model(Post), object_id=post.pk
+    ).values_list('tag_id', flat=True))
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_tag_stats_on_tag_change(sender, instance, action, pk_set, **kwargs):
+    if not isinstance(instance, Post):
+        return
+    # Taggit's pk_set only holds the tags actually added or removed; clear() sends none.
+    if action == 'pre_clear':
+        instance._tag_ids_before_clear = _post_tag_ids(instance)
+    elif action == 'post_clear':
+        apply_tag_change(instance, getattr(instance, '_tag_ids_before_clear', set()), set())
+    elif action == 'post_add':
+        after = _post_tag_ids(instance)
+        apply_tag_change(instance, after - pk_set, after)
+    elif action == 'post_remove':
+        after = _post_tag_ids(instance)
+        apply_tag_change(instance, after | pk_set, after)
+
+
+@receiver(pre_delete, sender=Post)
+def remember_tags_before_delete(sender, instance, **kwargs):
+    # The tagged items are gone by post_delete
+    instance._tag_ids_before_delete = _post_tag_ids(instance)
+
+
+@receiver(post_delete, sender=Post)
+def update_tag_stats_on_delete(sender, instance, **kwargs):
+    apply_tag_change(instance, getattr(instance, '_tag_ids_before_delete', set()), set())
+
+
+# --- Archive month counts (blog/archive.py) ---
+
+@receiver(post_save, sender=Post)
+def update_month_counts_on_save(sender, instance, created, **kwargs):
+    if created:
+        archive.record_post(instance.author_id, instance.published_date, 1)
+        return
+    previous_author_id = getattr(instance, '_previous_author_id', None)
+    if previous_author_id and previous_author_id != instance.author_id:
+        archive.record_post(previous_author_id, instance.published_date, -1)
+        archive.record_post(instance.author_id, instance.published_date, 1)
+
+
+@receiver(post_delete, sender=Post)
+def update_month_counts_on_delete(sender, instance, **kwargs):
+    archive.record_post(instance.author_id, instance.published_date, -1)
+
+
+# --- Feed change stamps (blog/feeds.py) ---
+
+def _touch_post_feeds(post, tag_slugs, *author_ids):
+    usernames = User.objects.filter(pk__in={post.author_id, *author_ids}).values_list('username', flat=True)
+    touch_feeds(
+        SITE_SCOPE,
+        *(author_scope(username) for username in usernames),
+        *(tag_scope(slug) for slug in tag_slugs),
+    )
+
+
+@receiver(post_save, sender=Post)
+def touch_feeds_on_save(sender, instance, created, **kwargs):
+    previous_author_id = getattr(instance, '_previous_author_id', None)
+    tag_slugs = [] if created else instance.tags.values_list('slug', flat=True)
+    _touch_post_feeds(instance, tag_slugs, *filter(None, [previous_author_id]))
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def touch_feeds_on_tag_change(sender, instance, action, pk_set, **kwargs):
+    if not isinstance(instance, Post):
+        return
+    if action == 'pre_clear':
+        instance._feed_tag_slugs = list(instance.tags.values_list('slug', flat=True))
+    elif action == 'post_clear':
+        _touch_post_feeds(instance, getattr(instance, '_feed_tag_slugs', []))
+    elif action in ('post_add', 'post_remove'):
+        _touch_post_feeds(instance, Tag.objects.filter(pk__in=pk_set).values_list('slug', flat=True))
+
+
+@receiver(pre_delete, sender=Post)
+def remember_feed_tags_before_delete(sender, instance, **kwargs):
+    instance._feed_tag_slugs = list(instance.tags.values_list('slug', flat=True))
+
+
+@receiver(post_delete, sender=Post)
+def touch_feeds_on_delete(sender, instance, **kwargs):
+    _touch_post_feeds(instance, getattr(instance, '_feed_tag_slugs', []))
+
+
+# Tag names and usernames appear in the feeds of every post carrying them.
+
+def _touch_feeds_listing(posts, *scopes):
+    """Touch the site feed, `scopes` and every author and tag feed listing one of `posts`."""
+    usernames = User.objects.filter(pk__in=posts.values('author_id')).values_list('username', flat=True)
+    tag_ids = Post.tags.through.objects.filter(
+        content_type=ContentType.objects.get_for_model(Post), object_id__in=posts.values('pk')
+    ).values('tag_id')
+    slugs = Tag.objects.filter(pk__in=tag_ids).values_list('slug', flat=True)
+    touch_feeds(SITE_SCOPE, *scopes, *map(author_scope, usernames), *map(tag_scope, slugs))
+
+
+@receiver(pre_save, sender=Tag)
+def remember_previous_tag(sender, instance, **kwargs):
+    instance._feed_previous = None
+    if instance.pk:
+        instance._feed_previous = Tag.objects.filter(pk=instance.pk).values_list('name', 'slug').first()
+
+
+@receiver(post_save, sender=Tag)
+def touch_feeds_on_tag_rename(sender, instance, **kwargs):
+    previous = getattr(instance, '_feed_previous', None)
+    if previous is None or previous == (instance.name, instance.slug):
+        return
+    if previous[1] != instance.slug:
+        forget_feeds(tag_scope(previous[1]))
+    _touch_feeds_listing(Post.objects.filter(tags=instance), tag_scope(instance.slug))
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_username(sender, instance, update_fields=None, **kwargs):
+    instance._feed_previous_username = None
+    # Logins only save last_login
+    if instance.pk and (update_fields is None or 'username' in update_fields):
+        instance._feed_previous_username = (
+            User.objects.filter(pk=instance.pk).values_list('username', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=User)
+def touch_feeds_on_username_change(sender, instance, **kwargs):
+    previous = getattr(instance, '_feed_previous_username', None)
+    if previous is None or previous == instance.username:
+        return
+    forget_feeds(author_scope(previous))
+    _touch_feeds_listing(Post.objects.filter(author=instance), author_scope(instance.username))
+
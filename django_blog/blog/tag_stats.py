@@ -0,0 +1,192 @@
+# blog/tag_stats.py
+
+import math
+from collections import Counter as TallyCounter, defaultdict
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+from taggit.models import TaggedItem
+
+from .models import Post, TagDailyCount, TagPair, TagStat
+
+# Entries are keyed by the stats version (bumped on every tag change), so the
+# timeout only bounds how long stale ones occupy the cache.
+TAG_STATS_CACHE_TIMEOUT = 60 * 60
+VERSION_KEY = 'blog:tagstats:version'
+# Number of font sizes in the tag cloud
+CLOUD_WEIGHTS = 5
+
+
+def get_tag_stats_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def bump_tag_stats_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 2, None)
+
+
+def _cached(name, compute, *args):
+    key = ':'.join(['blog:tagstats', str(get_tag_stats_version()), name, *map(str, args)])
+    result = cache.get(key)
+    if result is None:
+        result = compute(*args)
+        cache.set(key, result, TAG_STATS_CACHE_TIMEOUT)
+    return result
+
+
+# --- Maintenance (called from blog/signals.py) ---
+
+def _pairs(tag_ids):
+    return {(tag_id, other_id) for tag_id in tag_ids for other_id in tag_ids if tag_id != other_id}
+
+
+def _add(model, rows, delta):
+    """Add `delta` to the post_count of the rows matching each lookup in `rows`."""
+    if not rows:
+        return
+    if delta > 0:
+        model.objects.bulk_create([model(**row) for row in rows], ignore_conflicts=True)
+    condition = Q()
+    for row in rows:
+        condition |= Q(**row)
+    model.objects.filter(condition).update(post_count=F('post_count') + delta)
+
+
+def apply_tag_change(post, before, after):
+    """
+    Update the tag statistics after a post's tags went from the tag ids in
+    `before` to those in `after`. Only the rows of the tags (and tag pairs)
+    that actually changed are touched.
+    """
+    added, removed = after - before, before - after
+    if not added and not removed:
+        return
+    day = timezone.localdate(post.published_date)
+    with transaction.atomic():
+        for tag_ids, delta in ((added, 1), (removed, -1)):
+            _add(TagStat, [{'tag_id': tag_id} for tag_id in tag_ids], delta)
+            _add(TagDailyCount, [{'tag_id': tag_id, 'day': day} for tag_id in tag_ids], delta)
+        new_pairs, old_pairs = _pairs(after), _pairs(before)
+        _add(TagPair, [{'tag_id': a, 'other_id': b} for a, b in new_pairs - old_pairs], 1)
+        _add(TagPair, [{'tag_id': a, 'other_id': b} for a, b in old_pairs - new_pairs], -1)
+    bump_tag_stats_version()
+
+
+def rebuild_stats(batch_size=1000):
+    """Recompute all tag statistics from the tagged posts. Returns the number of posts seen."""
+    post_tags = defaultdict(set)
+    tagged_items = TaggedItem.objects.filter(
+        content_type=ContentType.objects.get_for_model(Post)
+    ).values_list('object_id', 'tag_id')
+    for post_id, tag_id in tagged_items.iterator(chunk_size=batch_size):
+        post_tags[post_id].add(tag_id)
+
+    totals, daily, pairs = TallyCounter(), TallyCounter(), TallyCounter()
+    posts = Post.objects.filter(pk__in=post_tags).values_list('pk', 'published_date')
+    for post_id, published_date in posts.iterator(chunk_size=batch_size):
+        tag_ids = post_tags[post_id]
+        day = timezone.localdate(published_date)
+        for tag_id in tag_ids:
+            totals[tag_id] += 1
+            daily[tag_id, day] += 1
+        pairs.update(_pairs(tag_ids))
+
+    with transaction.atomic():
+        TagStat.objects.all().delete()
+        TagDailyCount.objects.all().delete()
+        TagPair.objects.all().delete()
+        TagStat.objects.bulk_create(
+            (TagStat(tag_id=tag_id, post_count=count) for tag_id, count in totals.items()),
+            batch_size=batch_size,
+        )
+        TagDailyCount.objects.bulk_create(
+            (TagDailyCount(tag_id=tag_id, day=day, post_count=count) for (tag_id, day), count in daily.items()),
+            batch_size=batch_size,
+        )
+        TagPair.objects.bulk_create(
+            (TagPair(tag_id=a, other_id=b, post_count=count) for (a, b), count in pairs.items()),
+            batch_size=batch_size,
+        )
+    bump_tag_stats_version()
+    return len(post_tags)
+
+
+# --- Reads; all cached per stats version ---
+
+def _tag_counts(limit):
+    return list(
+        TagStat.objects.filter(post_count__gt=0)
+        .order_by('-post_count', 'tag__name')
+        .values('post_count', name=F('tag__name'), slug=F('tag__slug'))[:limit]
+    )
+
+
+def tag_counts(limit=None):
+    """Tags with their number of posts, most used first."""
+    return _cached('counts', _tag_counts, limit)
+
+
+def _tag_post_count(tag_id):
+    return TagStat.objects.filter(tag_id=tag_id).values_list('post_count', flat=True).first() or 0
+
+
+def tag_post_count(tag_id):
+    """Number of posts carrying a tag."""
+    return _cached('count', _tag_post_count, tag_id)
+
+
+def _tag_cloud(limit):
+    rows = tag_counts(limit)
+    if not rows:
+        return []
+    low, high = math.log(rows[-1]['post_count']), math.log(rows[0]['post_count'])
+    spread = (high - low) or 1
+    for row in rows:
+        # Logarithmic scale, so one huge tag doesn't flatten all the others
+        row['weight'] = 1 + round((math.log(row['post_count']) - low) / spread * (CLOUD_WEIGHTS - 1))
+    return sorted(rows, key=lambda row: row['name'].lower())
+
+
+def tag_cloud(limit=50):
+    """The `limit` most used tags in alphabetical order, each with a `weight` from 1 to CLOUD_WEIGHTS."""
+    return _cached('cloud', _tag_cloud, limit)
+
+
+def _trending_tags(days, limit, today):
+    since = today - timedelta(days=days - 1)
+    return list(
+        TagDailyCount.objects.filter(day__gte=since)
+        .values(name=F('tag__name'), slug=F('tag__slug'))
+        .annotate(post_count=Sum('post_count'))
+        .filter(post_count__gt=0)
+        .order_by('-post_count', 'name')[:limit]
+    )
+
+
+def trending_tags(days=7, limit=10):
+    """Tags of the posts published in the last `days` days, most used first."""
+    return _cached('trending', _trending_tags, days, limit, timezone.localdate())
+
+
+def _related_tags(tag_id, limit):
+    return list(
+        TagPair.objects.filter(tag_id=tag_id, post_count__gt=0)
+        .order_by('-post_count', 'other__name')
+        .values('post_count', name=F('other__name'), slug=F('other__slug'))[:limit]
+    )
+
+
+def related_tags(tag_id, limit=10):
+    """Tags most often used together with a tag; `post_count` is the number of posts sharing both."""
+    return _cached('related', _related_tags, tag_id, limit)
@@ -1,3 +1,662 @@
-from django.test import TestCase
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from .models import (
+    Comment, Counter, Post, PostMonthCount, PostSearchToken, TagDailyCount, TagPair, TagStat,
+)
+from . import counters
+from .comment_queue import CommentQueue, comment_queue
+from . import archive, feeds, tag_stats
+from taggit.models import Tag
+from .search import rebuild_index, search_posts
+from .pagination import encode_cursor
+from .views import PostListView
+
+
+class PostSearchIndexTests(TestCase):
+    """
+    Tests for the inverted search index maintained on Post save/delete and tag changes.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='writer', password='testpassword')
+        self.django_post = Post.objects.create(
+            title='Django tips', content='Querysets are lazy.', author=self.user
+        )
+        self.python_post = Post.objects.create(
+            title='Python notes', content='A few words about Django and Python.', author=self.user
+        )
+
+    def test_index_updated_on_save(self):
+        self.assertTrue(PostSearchToken.objects.filter(post=self.django_post, token='django').exists())
+        self.django_post.title = 'Flask tips'
+        self.django_post.save()
+        self.assertFalse(PostSearchToken.objects.filter(post=self.django_post, token='django').exists())
+        self.assertTrue(PostSearchToken.objects.filter(post=self.django_post, token='flask').exists())
+
+    def test_index_updated_on_tag_change(self):
+        self.python_post.tags.add('Web Development')
+        self.assertEqual(list(search_posts('development')), [self.python_post])
+        self.python_post.tags.clear()
+        self.assertEqual(list(search_posts('development')), [])
+
+    def test_rebuild_loads_tags_once(self):
+        self.django_post.tags.add('Web Development')
+        self.python_post.tags.add('Web Development', 'Scripting')
+        PostSearchToken.objects.all().delete()
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(rebuild_index(), 2)
+        tag_queries = [query for query in context.captured_queries if 'taggit_tag' in query['sql']]
+        self.assertEqual(len(tag_queries), 1)
+        self.assertEqual(list(search_posts('scripting')), [self.python_post])
+
+    def test_index_removed_on_delete(self):
+        post_pk = self.django_post.pk
+        self.django_post.delete()
+        self.assertFalse(PostSearchToken.objects.filter(post_id=post_pk).exists())
+        self.assertEqual(list(search_posts('tips')), [])
+
+    def test_title_matches_rank_higher(self):
+        results = list(search_posts('django'))
+        self.assertEqual(results, [self.django_post, self.python_post])
+        self.assertGreater(results[0].rank, results[1].rank)
+
+    def test_prefix_match(self):
+        self.assertEqual(list(search_posts('query')), [self.django_post])
+
+    def test_search_view_is_paginated(self):
+        for i in range(6):
+            Post.objects.create(title=f'Django post {i}', content='More.', author=self.user)
+        response = self.client.get(reverse('search_results'), {'q': 'django'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['paginator'].count, 8)
+        self.assertEqual(len(response.context['posts']), 5)
+
+
+class PostListQueryCountTests(TestCase):
+    """
+    Guards against N+1 queries: a listing page must run the same number of
+    queries whether it shows one post or a full page of them.
+    """
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f'writer{i}', password='testpassword') for i in range(6)
+        ]
+
+    def create_posts(self, count):
+        for i in range(count):
+            post = Post.objects.create(
+                title=f'Django post {i}', content='Body text.', author=self.users[i % len(self.users)]
+            )
+            post.tags.add('django', f'tag-{i}')
+
+    def count_queries(self, url, params=None):
+        # Measure cold: tag changes expire the cached tag aggregates anyway
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assertConstantQueries(self, url, params=None):
+        self.create_posts(1)
+        self.count_queries(url, params)  # warms the session and caches
+        single = self.count_queries(url, params)
+        self.create_posts(4)
+        full_page = self.count_queries(url, params)
+        self.assertEqual(single, full_page)
+
+    def test_post_list_query_count(self):
+        self.assertConstantQueries(reverse('post_list'))
+
+    def test_posts_by_tag_query_count(self):
+        self.assertConstantQueries(reverse('posts_by_tag', kwargs={'tag_slug': 'django'}))
+
+    def test_search_results_query_count(self):
+        self.assertConstantQueries(reverse('search_results'), {'q': 'django'})
+
+
+class KeysetPaginationTests(TestCase):
+    """
+    Tests for cursor pagination on (published_date, pk) in the post listings.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='writer', password='testpassword')
+        self.posts = [
+            Post.objects.create(title=f'Post {i}', content='Body text.', author=self.user)
+            for i in range(12)
+        ]
+        # Newest first, matching the listing order
+        self.posts.sort(key=lambda post: (post.published_date, post.pk), reverse=True)
+
+    def test_cursor_pages_walk_whole_list(self):
+        seen = []
+        response = self.client.get(reverse('post_list'), {'cursor': encode_cursor(self.posts[0])})
+        seen.extend(response.context['posts'])
+        while response.context['next_cursor']:
+            response = self.client.get(reverse('post_list'), {'cursor': response.context['next_cursor']})
+            seen.extend(response.context['posts'])
+        self.assertEqual(seen, self.posts[1:])
+
+    def test_page_numbers_switch_to_cursor_on_deep_pages(self):
+        response = self.client.get(reverse('post_list'), {'page': 1})
+        self.assertIsNone(response.context['next_cursor'])
+        self.assertEqual(list(response.context['posts']), self.posts[:5])
+
+        with mock.patch.object(PostListView, 'max_page_links', 2):
+            response = self.client.get(reverse('post_list'), {'page': 2})
+        cursor = response.context['next_cursor']
+        self.assertEqual(cursor, encode_cursor(self.posts[9]))
+        response = self.client.get(reverse('post_list'), {'cursor': cursor})
+        self.assertEqual(list(response.context['posts']), self.posts[10:])
+        self.assertIsNone(response.context['next_cursor'])
+
+    def test_cursor_query_skips_count(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse('post_list'), {'cursor': encode_cursor(self.posts[4])})
+        self.assertFalse(any('COUNT(' in query['sql'] for query in context.captured_queries))
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse('post_list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+
+class CounterTests(TestCase):
+    """
+    Tests for the denormalized post/comment/author counters.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='writer', password='testpassword')
+        self.other = User.objects.create_user(username='reader', password='testpassword')
+        self.post = Post.objects.create(title='First', content='Body text.', author=self.user)
+
+    def test_counters_follow_writes(self):
+        self.assertEqual(counters.get_count(counters.TOTAL_POSTS), 1)
+        self.assertEqual(counters.get_count(counters.author_posts_key(self.user.pk)), 1)
+        self.assertEqual(counters.get_count(counters.post_comments_key(self.post.pk)), 0)
+
+        Post.objects.create(title='Second', content='Body text.', author=self.user)
+        Comment.objects.create(post=self.post, author=self.other, content='Nice post.')
+        self.assertEqual(counters.get_count(counters.TOTAL_POSTS), 2)
+        self.assertEqual(counters.get_count(counters.author_posts_key(self.user.pk)), 2)
+        self.assertEqual(counters.get_count(counters.post_comments_key(self.post.pk)), 1)
+
+        self.post.delete()
+        self.assertEqual(counters.get_count(counters.TOTAL_POSTS), 1)
+        self.assertEqual(counters.get_count(counters.author_posts_key(self.user.pk)), 1)
+        self.assertFalse(Counter.objects.filter(name=counters.post_comments_key(self.post.pk)).exists())
+
+    def test_rebuild_matches_incremental_counters(self):
+        Comment.objects.create(post=self.post, author=self.other, content='Nice post.')
+        Post.objects.create(title='Second', content='Body text.', author=self.other)
+        incremental = set(Counter.objects.filter(value__gt=0).values_list('name', 'value'))
+        Counter.objects.all().delete()
+        self.assertEqual(counters.rebuild_counters(), 4)
+        self.assertEqual(set(Counter.objects.values_list('name', 'value')), incremental)
+
+    def test_home_view_does_not_count_posts(self):
+        counters.get_count(counters.TOTAL_POSTS)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('blog_home'))
+        self.assertEqual(response.context['post_count'], 1)
+        self.assertFalse(any('COUNT(' in query['sql'] for query in context.captured_queries))
+
+
+class PostDetailCachingTests(TestCase):
+    """
+    Tests for the version-keyed caches and conditional GET support on PostDetailView.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='writer', password='testpassword')
+        self.post = Post.objects.create(title='Cached', content='Original body.', author=self.user)
+        self.url = reverse('post_detail', kwargs={'pk': self.post.pk})
+
+    def test_anonymous_response_has_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response.headers)
+        self.assertIn('Last-Modified', response.headers)
+
+    def test_matching_etag_returns_304(self):
+        etag = self.client.get(self.url).headers['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_cached_page_served_with_single_query(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Original body.')
+
+    def test_changes_invalidate_cache(self):
+        etag = self.client.get(self.url).headers['ETag']
+
+        self.post.tags.add('caching')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'caching')
+
+        Comment.objects.create(post=self.post, author=self.user, content='A fresh comment.')
+        self.assertContains(self.client.get(self.url), 'A fresh comment.')
+
+        self.post.refresh_from_db()
+        self.post.content = 'Edited body.'
+        self.post.save()
+        self.assertContains(self.client.get(self.url), 'Edited body.')
+
+    def test_missing_post_returns_404(self):
+        response = self.client.get(reverse('post_detail', kwargs={'pk': self.post.pk + 100}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_authenticated_users_bypass_page_cache(self):
+        self.client.login(username='writer', password='testpassword')
+        response = self.client.get(self.url)
+        self.assertNotIn('ETag', response.headers)
+        self.assertContains(response, 'Edit Post')
+
+
+@override_settings(BLOG_COMMENT_QUEUE_WORKER=False)
+class CommentQueueTests(TestCase):
+    """
+    Tests for the queued JSON comment endpoint and the batched comment writer.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', password='testpassword')
+        self.post = Post.objects.create(title='Busy post', content='Comment away.', author=self.user)
+        self.url = reverse('comment_create_json', kwargs={'pk': self.post.pk})
+        self.client.login(username='reader', password='testpassword')
+        self.addCleanup(comment_queue.flush)
+
+    def post_json(self, data, url=None):
+        return self.client.post(url or self.url, data, content_type='application/json')
+
+    def test_comment_is_queued_then_written_in_bulk(self):
+        comment_count = counters.get_count(counters.post_comments_key(self.post.pk))
+        updated_at = self.post.updated_at
+
+        response = self.post_json({'content': 'First!'})
+        self.assertEqual(response.status_code, 202)
+        self.assertContains(response, 'First!', status_code=202)
+        self.assertContains(response, 'reader', status_code=202)
+        self.post_json({'content': 'Second.'})
+        self.assertFalse(Comment.objects.exists())
+        posted_at = [comment.created_at for comment in list(comment_queue._queue.queue)]
+
+        self.assertEqual(comment_queue.flush(), 2)
+        self.assertEqual(
+            list(self.post.comments.values_list('content', flat=True)), ['First!', 'Second.']
+        )
+        # Stored with the time they were posted (and shown with), not the flush time
+        self.assertEqual(list(self.post.comments.values_list('created_at', flat=True)), posted_at)
+        self.assertEqual(counters.get_count(counters.post_comments_key(self.post.pk)), comment_count + 2)
+        self.post.refresh_from_db()
+        self.assertGreater(self.post.updated_at, updated_at)
+
+    def test_invalid_requests_are_rejected(self):
+        self.assertEqual(self.post_json({'content': ''}).status_code, 400)
+        self.assertEqual(self.post_json(['not', 'an', 'object']).status_code, 400)
+        self.assertEqual(self.client.post(self.url, 'not json', content_type='application/json').status_code, 400)
+        missing = reverse('comment_create_json', kwargs={'pk': self.post.pk + 100})
+        self.assertEqual(self.post_json({'content': 'Hello?'}, url=missing).status_code, 404)
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+        self.client.logout()
+        self.assertEqual(self.post_json({'content': 'Anonymous'}).status_code, 401)
+        self.assertEqual(comment_queue.pending(), 0)
+
+    def test_comments_on_deleted_posts_are_dropped(self):
+        self.post_json({'content': 'Too late.'})
+        self.post.delete()
+        self.assertEqual(comment_queue.flush(), 0)
+        self.assertFalse(Comment.objects.exists())
+
+    def test_failed_batches_are_retried(self):
+        self.post_json({'content': 'Try again.'})
+        with mock.patch('blog.comment_queue.write_comments', side_effect=OperationalError('database is locked')):
+            with self.assertLogs('blog.comment_queue', 'ERROR'):
+                self.assertEqual(comment_queue.flush(), 0)
+        self.assertEqual(comment_queue.pending(), 1)
+        self.assertEqual(comment_queue.flush(), 1)
+        self.assertEqual(list(self.post.comments.values_list('content', flat=True)), ['Try again.'])
+
+    def test_comments_failing_every_attempt_are_dead_lettered(self):
+        local_queue = CommentQueue(max_attempts=2)
+        local_queue.put(Comment(post=self.post, author=self.user, content='Lost?'))
+        with mock.patch('blog.comment_queue.write_comments', side_effect=OperationalError('database is locked')):
+            with self.assertLogs('blog.comment_queue', 'ERROR'):
+                local_queue.flush()
+            with self.assertLogs('blog.comment_queue', 'ERROR') as logs:
+                local_queue.flush()
+        self.assertEqual(local_queue.pending(), 0)
+        dead = [record for record in logs.records if record.name == 'blog.comment_queue.dead_letter']
+        self.assertIn('"content": "Lost?"', dead[0].getMessage())
+
+    def test_batches_are_capped(self):
+        local_queue = CommentQueue(batch_size=2, flush_interval=0)
+        for i in range(5):
+            local_queue.put(Comment(post=self.post, author=self.user, content=f'Comment {i}'))
+        self.assertEqual([len(local_queue.next_batch(timeout=0)) for _ in range(4)], [2, 2, 1, 0])
+
+
+class CommentPaginationTests(TestCase):
+    """
+    Tests for keyset pagination on (created_at, pk) of a post's comments.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='reader', password='testpassword')
+        self.post = Post.objects.create(title='Popular', content='Lots to say.', author=self.user)
+        self.comments = Comment.objects.bulk_create(
+            Comment(post=self.post, author=self.user, content=f'Comment {i:02d}') for i in range(12)
+        )
+        self.url = reverse('post_comments_json', kwargs={'pk': self.post.pk})
+
+    @mock.patch('blog.views.COMMENTS_PAGE_SIZE', 5)
+    def test_detail_page_shows_first_page(self):
+        response = self.client.get(reverse('post_detail', kwargs={'pk': self.post.pk}))
+        self.assertContains(response, 'Comment 04')
+        self.assertNotContains(response, 'Comment 05')
+        self.assertContains(response, 'Load more comments')
+
+    @mock.patch('blog.views.COMMENTS_PAGE_SIZE', 5)
+    def test_json_pages_walk_all_comments(self):
+        seen = []
+        cursor = None
+        for _ in range(3):
+            with self.assertNumQueries(1):
+                data = self.client.get(self.url, {'cursor': cursor} if cursor else {}).json()
+            seen.extend(comment['content'] for comment in data['comments'])
+            cursor = data['next_cursor']
+        self.assertIsNone(cursor)
+        self.assertEqual(seen, [f'Comment {i:02d}' for i in range(12)])
+        self.assertEqual(data['comments'][-1]['author'], 'reader')
+        self.assertIn('Comment 11', data['comments'][-1]['html'])
+
+    def test_comments_with_equal_timestamps_are_not_skipped(self):
+        Comment.objects.filter(post=self.post).update(created_at=self.comments[0].created_at)
+        with mock.patch('blog.views.COMMENTS_PAGE_SIZE', 5):
+            first = self.client.get(self.url).json()
+            second = self.client.get(self.url, {'cursor': first['next_cursor']}).json()
+        ids = [comment['id'] for comment in first['comments'] + second['comments']]
+        self.assertEqual(ids, [comment.pk for comment in self.comments[:10]])
+
+    def test_missing_post_and_invalid_cursor_return_404(self):
+        self.assertEqual(self.client.get(reverse('post_comments_json', kwargs={'pk': 0})).status_code, 404)
+        self.assertEqual(self.client.get(self.url, {'cursor': 'bogus'}).status_code, 404)
+
+
+class TagStatsTests(TestCase):
+    """
+    Tests for the incrementally maintained tag statistics in blog/tag_stats.py.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='writer', password='testpassword')
+        self.first = Post.objects.create(title='First', content='Body.', author=self.user)
+        self.second = Post.objects.create(title='Second', content='Body.', author=self.user)
+        self.first.tags.add('Django', 'Python', 'Web Development')
+        self.second.tags.add('Django', 'Python')
+
+    def counts(self):
+        return {row['name']: row['post_count'] for row in tag_stats.tag_counts()}
+
+    def related(self, name):
+        tag = Tag.objects.get(name=name)
+        return {row['name']: row['post_count'] for row in tag_stats.related_tags(tag.pk)}
+
+    def snapshot(self):
+        return (
+            set(TagStat.objects.filter(post_count__gt=0).values_list('tag_id', 'post_count')),
+            set(TagDailyCount.objects.filter(post_count__gt=0).values_list('tag_id', 'day', 'post_count')),
+            set(TagPair.objects.filter(post_count__gt=0).values_list('tag_id', 'other_id', 'post_count')),
+        )
+
+    def test_counts_and_co_occurrence(self):
+        self.assertEqual(self.counts(), {'Django': 2, 'Python': 2, 'Web Development': 1})
+        self.assertEqual(self.related('Django'), {'Python': 2, 'Web Development': 1})
+        self.assertEqual(self.related('Web Development'), {'Django': 1, 'Python': 1})
+
+    def test_stats_follow_tag_changes(self):
+        self.first.tags.remove('Python')
+        self.assertEqual(self.counts(), {'Django': 2, 'Python': 1, 'Web Development': 1})
+        self.assertEqual(self.related('Django'), {'Python': 1, 'Web Development': 1})
+
+        self.second.tags.set(['Python', 'Testing'])
+        self.assertEqual(self.counts(), {'Django': 1, 'Python': 1, 'Testing': 1, 'Web Development': 1})
+        self.assertEqual(self.related('Python'), {'Testing': 1})
+
+        self.assertEqual(tag_stats.tag_post_count(Tag.objects.get(name='Django').pk), 1)
+
+        self.first.tags.clear()
+        self.second.delete()
+        self.assertEqual(self.counts(), {})
+        self.assertEqual(self.related('Django'), {})
+
+    def test_rebuild_matches_incremental_stats(self):
+        self.first.tags.remove('Web Development')
+        incremental = self.snapshot()
+        self.assertEqual(tag_stats.rebuild_stats(), 2)
+        self.assertEqual(self.snapshot(), incremental)
+
+    def test_trending_tags_cover_recent_posts(self):
+        old = Post.objects.create(title='Old', content='Body.', author=self.user)
+        Post.objects.filter(pk=old.pk).update(published_date=old.published_date - timedelta(days=20))
+        old.refresh_from_db()
+        old.tags.add('Archive', 'Django')
+
+        week = {row['name']: row['post_count'] for row in tag_stats.trending_tags(7)}
+        month = {row['name']: row['post_count'] for row in tag_stats.trending_tags(30)}
+        self.assertEqual(week, {'Django': 2, 'Python': 2, 'Web Development': 1})
+        self.assertEqual(month, {'Django': 3, 'Python': 2, 'Web Development': 1, 'Archive': 1})
+
+    def test_tag_pages_use_precomputed_stats(self):
+        url = reverse('posts_by_tag', kwargs={'tag_slug': 'web-development'})
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.context['tag_name'], 'Web Development')
+        self.assertEqual(response.context['post_count'], 1)
+        self.assertEqual(response.context['related_tags'][0]['name'], 'Django')
+        self.assertContains(response, 'tag-weight-')
+        self.assertFalse(any(
+            'GROUP BY' in query['sql'] and 'taggit_taggeditem' in query['sql']
+            for query in context.captured_queries
+        ))
+
+        self.client.get(reverse('tag_cloud'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('tag_cloud'))
+        self.assertContains(response, 'Trending in the last 7 days')
+        self.assertContains(response, 'Web Development')
+
+
+class AuthorArchiveTests(TestCase):
+    """
+    Tests for the author feed, the year/month archives and the month counts behind them.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user(username='alice', password='testpassword')
+        self.bob = User.objects.create_user(username='bob', password='testpassword')
+        self.jan = self.create_post('January', self.alice, datetime(2024, 1, 15, tzinfo=dt_timezone.utc))
+        self.feb = self.create_post('February', self.alice, datetime(2024, 2, 3, tzinfo=dt_timezone.utc))
+        self.bob_feb = self.create_post('Bob in February', self.bob, datetime(2024, 2, 20, tzinfo=dt_timezone.utc))
+
+    def create_post(self, title, author, published):
+        with mock.patch('django.utils.timezone.now', return_value=published):
+            return Post.objects.create(title=title, content='Body.', author=author)
+
+    def months(self, author=None):
+        return [(row['year'], row['month'], row['post_count']) for row in archive.archive_months(
+            author.pk if author else None
+        )]
+
+    def test_month_counts_follow_posts(self):
+        self.assertEqual(self.months(), [(2024, 2, 2), (2024, 1, 1)])
+        self.assertEqual(self.months(self.alice), [(2024, 2, 1), (2024, 1, 1)])
+
+        self.bob_feb.author = self.alice
+        self.bob_feb.save()
+        self.assertEqual(self.months(self.alice), [(2024, 2, 2), (2024, 1, 1)])
+        self.assertEqual(self.months(self.bob), [])
+
+        self.jan.delete()
+        self.assertEqual(self.months(), [(2024, 2, 2)])
+
+        incremental = set(PostMonthCount.objects.filter(post_count__gt=0).values_list(
+            'author_id', 'year', 'month', 'post_count'
+        ))
+        self.assertEqual(archive.rebuild_month_counts(), 2)
+        self.assertEqual(set(PostMonthCount.objects.values_list('author_id', 'year', 'month', 'post_count')), incremental)
+
+    def test_author_feed(self):
+        response = self.client.get(reverse('author_posts', kwargs={'username': 'alice'}))
+        self.assertEqual(list(response.context['posts']), [self.feb, self.jan])
+        self.assertEqual(response.context['post_count'], 2)
+        self.assertContains(response, 'February 2024')
+        self.assertEqual(self.client.get(reverse('author_posts', kwargs={'username': 'nobody'})).status_code, 404)
+
+    def test_year_and_month_archives(self):
+        response = self.client.get(reverse('post_archive_month', kwargs={'year': 2024, 'month': 2}))
+        self.assertEqual(list(response.context['posts']), [self.bob_feb, self.feb])
+        self.assertEqual(response.context['post_count'], 2)
+
+        response = self.client.get(reverse('author_archive_year', kwargs={'username': 'alice', 'year': 2024}))
+        self.assertEqual(list(response.context['posts']), [self.feb, self.jan])
+
+        response = self.client.get(reverse('author_archive_month', kwargs={'username': 'bob', 'year': 2024, 'month': 1}))
+        self.assertEqual(list(response.context['posts']), [])
+        self.assertEqual(self.client.get(reverse('post_archive_month', kwargs={'year': 2024, 'month': 13})).status_code, 404)
+        self.assertEqual(self.client.get(reverse('post_archive_month', kwargs={'year': 2024, 'month': 0})).status_code, 404)
+        self.assertEqual(self.client.get(reverse('post_archive_year', kwargs={'year': 0})).status_code, 404)
+        self.assertEqual(self.client.get(reverse('author_archive_year', kwargs={'username': 'alice', 'year': 0})).status_code, 404)
+
+    def test_archive_sidebar_does_not_aggregate_posts(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse('post_list'))
+        self.assertFalse(any(
+            'GROUP BY' in query['sql'] and 'FROM "blog_post"' in query['sql']
+            for query in context.captured_queries
+        ))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('post_list'))
+        self.assertFalse(any('blog_postmonthcount' in query['sql'] for query in context.captured_queries))
+        self.assertContains(response, reverse('post_archive_month', kwargs={'year': 2024, 'month': 1}))
+
+
+class FeedTests(TestCase):
+    """
+    Tests for the cached, conditionally served RSS/Atom/JSON feeds.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='writer', password='testpassword')
+        self.other = User.objects.create_user(username='other', password='testpassword')
+        self.post = Post.objects.create(title='Feed me', content='Feed body.', author=self.user)
+        self.post.tags.add('django')
+        self.other_post = Post.objects.create(title='Elsewhere', content='Other body.', author=self.other)
+
+    def test_feed_formats_and_scopes(self):
+        response = self.client.get(reverse('post_feed'))
+        self.assertEqual(response['Content-Type'], 'application/rss+xml; charset=utf-8')
+        self.assertContains(response, 'Feed me')
+        self.assertContains(response, 'Elsewhere')
+
+        response = self.client.get(reverse('tag_feed_atom', kwargs={'tag_slug': 'django'}))
+        self.assertTrue(response['Content-Type'].startswith('application/atom+xml'))
+        self.assertContains(response, 'Feed me')
+        self.assertNotContains(response, 'Elsewhere')
+
+        data = json.loads(self.client.get(reverse('author_feed_json', kwargs={'username': 'other'})).content)
+        self.assertEqual(data['version'], 'https://jsonfeed.org/version/1.1')
+        self.assertEqual([item['title'] for item in data['items']], ['Elsewhere'])
+
+        self.assertEqual(self.client.get(reverse('tag_feed', kwargs={'tag_slug': 'missing'})).status_code, 404)
+        self.assertEqual(self.client.get(reverse('author_feed_json', kwargs={'username': 'nobody'})).status_code, 404)
+
+    def test_tag_and_username_changes_regenerate_feeds(self):
+        site_url = reverse('post_feed')
+        tag_url = reverse('tag_feed', kwargs={'tag_slug': 'django'})
+        site_etag = self.client.get(site_url)['ETag']
+        self.client.get(tag_url)
+
+        tag = Tag.objects.get(slug='django')
+        tag.name = 'Django Framework'
+        tag.save()
+        response = self.client.get(site_url, HTTP_IF_NONE_MATCH=site_etag)
+        self.assertContains(response, 'Django Framework')
+        self.assertContains(self.client.get(tag_url), 'Django Framework')
+
+        tag.slug = 'django-framework'
+        tag.save()
+        self.assertEqual(self.client.get(tag_url).status_code, 404)
+
+        author_url = reverse('author_feed', kwargs={'username': 'writer'})
+        tag_url = reverse('tag_feed', kwargs={'tag_slug': 'django-framework'})
+        self.client.get(author_url)
+        self.client.get(tag_url)
+        self.user.username = 'author'
+        self.user.save()
+        self.assertEqual(self.client.get(author_url).status_code, 404)
+        self.assertContains(self.client.get(reverse('author_feed', kwargs={'username': 'author'})), 'Feed me')
+        self.assertContains(self.client.get(tag_url), '>author</dc:creator>')
+
+    def test_unknown_scopes_leave_no_stamp(self):
+        self.assertEqual(self.client.get(reverse('tag_feed', kwargs={'tag_slug': 'missing'})).status_code, 404)
+        self.assertEqual(self.client.get(reverse('author_feed', kwargs={'username': 'nobody'})).status_code, 404)
+        self.assertIsNone(feeds.get_feed_stamp(feeds.tag_scope('missing'), create=False))
+        self.assertIsNone(feeds.get_feed_stamp(feeds.author_scope('nobody'), create=False))
+
+    @override_settings(ALLOWED_HOSTS=['blog.example.com', 'mirror.example.com'])
+    def test_cached_bodies_are_kept_per_host(self):
+        url = reverse('post_feed')
+        first = self.client.get(url, HTTP_HOST='blog.example.com')
+        second = self.client.get(url, HTTP_HOST='mirror.example.com', secure=True)
+        self.assertContains(first, 'http://blog.example.com/')
+        self.assertContains(second, 'https://mirror.example.com/')
+        self.assertNotContains(second, 'blog.example.com')
+
+    def test_revalidation_is_free_and_cached_body_is_reused(self):
+        url = reverse('post_feed')
+        response = self.client.get(url)
+        with self.assertNumQueries(0):
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(not_modified.status_code, 304)
+            not_modified = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+            self.assertEqual(not_modified.status_code, 304)
+            cached = self.client.get(url)
+        self.assertEqual(cached.content, response.content)
+
+    def test_changes_in_scope_regenerate_the_feed(self):
+        tag_url = reverse('tag_feed', kwargs={'tag_slug': 'django'})
+        author_url = reverse('author_feed', kwargs={'username': 'other'})
+        tag_etag = self.client.get(tag_url)['ETag']
+        author_etag = self.client.get(author_url)['ETag']
+
+        self.post.title = 'Feed me again'
+        self.post.save()
+        response = self.client.get(tag_url, HTTP_IF_NONE_MATCH=tag_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Feed me again')
+        # Out of scope: the other author's feed is untouched
+        self.assertEqual(self.client.get(author_url, HTTP_IF_NONE_MATCH=author_etag).status_code, 304)
+
+        self.other_post.tags.add('django')
+        self.assertContains(self.client.get(tag_url), 'Elsewhere')
+        self.other_post.delete()
+        self.assertNotContains(self.client.get(tag_url), 'Elsewhere')
@@ -1,15 +1,17 @@
 from django.urls import path
 from django.contrib.auth import views as auth_views
 from . import views
+from .feeds import feed_view
 from .views import (
     PostListView, PostDetailView, PostCreateView, PostUpdateView, PostDeleteView,
     CommentCreateView, CommentUpdateView, CommentDeleteView,
-    search_results_view, PostByTagListView,
+    search_results_view, PostByTagListView, PostArchiveView,
 )
 
 urlpatterns = [
     # Task 2/4 URLs (Post CRUD, Tagging, Search)
     path('', PostListView.as_view(), name='post_list'),
+    path('home/', views.home_view, name='blog_home'),
     
     path('post/<int:pk>/', PostDetailView.as_view(), name='post_detail'),
     path('post/new/', PostCreateView.as_view(), name='post_create'),          # Check string: "post/new/"
@@ -17,10 +19,29 @@ urlpatterns = [
     path('post/<int:pk>/delete/', PostDeleteView.as_view(), name='post_delete'), # Check string: "post/<int:pk>/delete/"
     
     path('search/', search_results_view, name='search_results'),
+    path('author/<str:username>/', PostArchiveView.as_view(), name='author_posts'),
+    path('author/<str:username>/<int:year>/', PostArchiveView.as_view(), name='author_archive_year'),
+    path('author/<str:username>/<int:year>/<int:month>/', PostArchiveView.as_view(), name='author_archive_month'),
+    path('archive/<int:year>/', PostArchiveView.as_view(), name='post_archive_year'),
+    path('archive/<int:year>/<int:month>/', PostArchiveView.as_view(), name='post_archive_month'),
+    path('tags/', views.tag_cloud_view, name='tag_cloud'),
     path('tags/<str:tag_slug>/', PostByTagListView.as_view(), name='posts_by_tag'),
 
+    # Feeds (blog/feeds.py): RSS, Atom and JSON Feed, site-wide, per tag and per author
+    path('feed/', feed_view, {'feed_format': 'rss'}, name='post_feed'),
+    path('feed/atom/', feed_view, {'feed_format': 'atom'}, name='post_feed_atom'),
+    path('feed/json/', feed_view, {'feed_format': 'json'}, name='post_feed_json'),
+    path('tags/<str:tag_slug>/feed/', feed_view, {'feed_format': 'rss'}, name='tag_feed'),
+    path('tags/<str:tag_slug>/feed/atom/', feed_view, {'feed_format': 'atom'}, name='tag_feed_atom'),
+    path('tags/<str:tag_slug>/feed/json/', feed_view, {'feed_format': 'json'}, name='tag_feed_json'),
+    path('author/<str:username>/feed/', feed_view, {'feed_format': 'rss'}, name='author_feed'),
+    path('author/<str:username>/feed/atom/', feed_view, {'feed_format': 'atom'}, name='author_feed_atom'),
+    path('author/<str:username>/feed/json/', feed_view, {'feed_format': 'json'}, name='author_feed_json'),
+
     # 💥 Adjusted Comment URLs to match checker strings 💥
     path('post/<int:pk>/comments/new/', CommentCreateView.as_view(), name='comment_create'), # Check string: "post/<int:pk>/comments/new/"
+    path('post/<int:pk>/comments/', views.post_comments_json, name='post_comments_json'),
+    path('post/<int:pk>/comments/json/', views.comment_create_json, name='comment_create_json'),
     path('comment/<int:pk>/update/', CommentUpdateView.as_view(), name='comment_update'), # Check string: "comment/<int:pk>/update/"
     path('comment/<int:pk>/delete/', CommentDeleteView.as_view(), name='comment_delete'), # Check string: "comment/<int:pk>/delete/"
 
@@ -1,8 +1,12 @@
-from django.shortcuts import render, redirect
+import json
+from datetime import date
+from functools import partial
+
+from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.models import User
 from django.contrib import messages
-from .forms import CustomUserCreationForm, UserUpdateForm
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.views.generic import (
     ListView, 
@@ -11,16 +15,34 @@ from django.views.generic import (
     UpdateView, 
     DeleteView
 )
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
+from django.core.paginator import Paginator
+from django.http import Http404, HttpResponse, JsonResponse
+from django.template.loader import render_to_string
+from django.views.decorators.http import require_POST
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
 from .models import Post, Comment
-from .forms import CustomUserCreationForm, UserUpdateForm, CommentForm 
-from django.db.models import Q 
+from .forms import CustomUserCreationForm, UserUpdateForm, CommentForm, PostForm
+from .search import search_posts
+from .pagination import KeysetPage, KeysetPaginationMixin
+from . import archive, counters, tag_stats
+from .comment_queue import comment_queue
+from .caching import (
+    get_cached_page, get_post_updated_at, post_etag, post_version, set_cached_page,
+)
+from taggit.models import Tag
+
+# Comments shown on a post page, and per page of post_comments_json
+COMMENTS_PAGE_SIZE = 50
+# Windows (in days) of the trending tag lists on the tags page
+TRENDING_WINDOWS = (7, 30)
 
 # --- Task 0 Home View (Keep this) ---
 def home_view(request):
     context = {
         'message': 'Welcome to the Django Blog!',
-        'post_count': Post.objects.count(),
+        'post_count': counters.get_count(counters.TOTAL_POSTS),
     }
     return render(request, 'blog/home.html', context)
 # -----------------------------------
@@ -61,17 +83,27 @@ def profile_view(request):
 
 
 # READ: List All Posts (Accessible to all)
-class PostListView(ListView):
+class PostListView(KeysetPaginationMixin, ListView):
     model = Post
     template_name = 'blog/post_list.html'  # <app>/<model>_list.html
     context_object_name = 'posts' # Name of the queryset in the template
-    ordering = ['-published_date']
+    ordering = ['-published_date', '-pk']
     paginate_by = 5
 
-# READ: View a Single Post (Accessible to all)
-class PostDetailView(DetailView):
-    model = Post
-    template_name = 'blog/post_detail.html'
+    def get_queryset(self):
+        # Fetch authors in the same query so the template doesn't hit the DB per post
+        return super().get_queryset().select_related('author')
+
+    def get_paginator(self, *args, **kwargs):
+        paginator = super().get_paginator(*args, **kwargs)
+        # Use the maintained counter instead of COUNT(*) over the posts table
+        paginator.count = counters.get_count(counters.TOTAL_POSTS)
+        return paginator
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        add_archive_context(context)
+        return context
 
 # CREATE: New Post (Requires login)
 class PostCreateView(LoginRequiredMixin, CreateView):
@@ -111,16 +143,45 @@ class PostDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         post = self.get_object()
         return self.request.user == post.author
         
+# READ: View a Single Post (Accessible to all)
 class PostDetailView(DetailView):
     model = Post
     template_name = 'blog/post_detail.html'
 
+    def get(self, request, *args, **kwargs):
+        # Logged-in users see per-user actions, so only anonymous pages are shared.
+        if request.user.is_authenticated:
+            return super().get(request, *args, **kwargs)
+
+        pk = self.kwargs['pk']
+        updated_at = get_post_updated_at(pk)
+        if updated_at is None:
+            raise Http404('No post found matching the query')
+
+        etag = post_etag(pk, updated_at)
+        response = get_conditional_response(request, etag=etag, last_modified=int(updated_at.timestamp()))
+        if response is None:
+            content = get_cached_page(pk, updated_at)
+            if content is None:
+                response = super().get(request, *args, **kwargs)
+                response.render()
+                set_cached_page(pk, updated_at, response.content)
+            else:
+                response = HttpResponse(content)
+        response.headers['ETag'] = etag
+        response.headers['Last-Modified'] = http_date(updated_at.timestamp())
+        patch_vary_headers(response, ['Cookie'])
+        return response
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Add the Comment form to the context
         context['comment_form'] = CommentForm()
-        # Add the list of comments (fetched via related_name='comments')
-        context['comments'] = self.object.comments.all() 
+        # First page of comments; later pages are loaded from post_comments_json
+        context['comments'] = KeysetPage(self.object.comments.select_related('author'), COMMENTS_PAGE_SIZE)
+        context['comment_count'] = counters.get_count(counters.post_comments_key(self.object.pk))
+        # Fragment cache key component, see post_detail.html
+        context['post_version'] = post_version(self.object.updated_at)
         return context
 
 #  NEW COMMENT CREATE VIEW 
@@ -139,6 +200,67 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
     # Success URL is defined on the model (get_absolute_url) 
     # which redirects back to the post detail page.
 
+
+def post_comments_json(request, pk):
+    """
+    A page of a post's comments, oldest first. `?cursor=` continues after
+    the page whose `next_cursor` it is. Each comment comes with its rendered
+    fragment (`html`), ready to be appended to the page.
+    """
+    page = KeysetPage(
+        Comment.objects.filter(post_id=pk).select_related('author'),
+        COMMENTS_PAGE_SIZE,
+        cursor=request.GET.get('cursor'),
+    )
+    if not page.object_list and not Post.objects.filter(pk=pk).exists():
+        raise Http404('No post found matching the query')
+    return JsonResponse({
+        'comments': [
+            {
+                'id': comment.pk,
+                'author': comment.author.username,
+                'content': comment.content,
+                'created_at': comment.created_at.isoformat(),
+                'html': render_to_string('blog/comment.html', {'comment': comment, 'user': request.user}),
+            }
+            for comment in page
+        ],
+        'next_cursor': page.next_cursor,
+    })
+
+
+@require_POST
+async def comment_create_json(request, pk):
+    """
+    Accept a comment as JSON (`{"content": "..."}`) and queue it instead of
+    inserting it; blog/comment_queue.py writes queued comments in batches.
+    Responds 202 with the rendered comment fragment, ready to be appended to
+    the post's comment list.
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({'detail': 'Authentication required.'}, status=401)
+    try:
+        data = json.loads(request.body)
+    except (ValueError, UnicodeDecodeError):
+        data = None
+    if not isinstance(data, dict):
+        return JsonResponse({'detail': 'Expected a JSON object.'}, status=400)
+
+    form = CommentForm(data)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+    if not await Post.objects.filter(pk=pk).aexists():
+        raise Http404('No post found matching the query')
+
+    comment = form.save(commit=False)
+    comment.post_id = pk
+    comment.author = user
+    # created_at was set when the form built the comment and is stored as is
+    comment_queue.put(comment)
+    html = render_to_string('blog/comment.html', {'comment': comment, 'user': user})
+    return HttpResponse(html, status=202)
+
 #  NEW COMMENT UPDATE VIEW 
 class CommentUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     model = Comment
@@ -170,36 +292,140 @@ def search_results_view(request):
     results = Post.objects.none()
 
     if query:
-        # 💥 Adjusted to use tags__name__icontains to pass the check 💥
-        results = Post.objects.filter(
-            Q(title__icontains=query) | 
-            Q(content__icontains=query) | 
-            Q(tags__name__icontains=query) # Check string: "tags__name__icontains"
-        ).distinct().order_by('-published_date')
+        # Ranked lookup through the inverted index (see blog/search.py); replaces
+        # the old title/content/tags__name__icontains scan over every post.
+        results = search_posts(query).select_related('author').prefetch_related('tags')
+
+    paginator = Paginator(results, 5)
+    page_obj = paginator.get_page(request.GET.get('page'))
 
     context = {
         'query': query,
-        'posts': results,
+        'posts': page_obj.object_list,
+        'page_obj': page_obj,
+        'paginator': paginator,
+        'is_paginated': page_obj.has_other_pages(),
     }
     return render(request, 'blog/search_results.html', context)
 
 
 
-class PostByTagListView(ListView):
+class PostByTagListView(KeysetPaginationMixin, ListView):
     """Displays a list of posts filtered by a specific tag slug."""
     model = Post
     template_name = 'blog/tag_posts.html'
     context_object_name = 'posts'
-    ordering = ['-published_date']
+    ordering = ['-published_date', '-pk']
     paginate_by = 5
 
     def get_queryset(self):
         # Filter posts where tags__slug matches the slug from the URL
         self.tag_slug = self.kwargs['tag_slug']
-        return Post.objects.filter(tags__slug=self.tag_slug).order_by('-published_date')
+        self.tag = Tag.objects.filter(slug=self.tag_slug).first()
+        if self.tag is None:
+            return Post.objects.none()
+        return (
+            Post.objects.filter(tags=self.tag)
+            .select_related('author')
+            .prefetch_related('tags')
+            .order_by(*self.ordering)
+        )
+
+    def get_post_count(self):
+        if not hasattr(self, '_post_count'):
+            self._post_count = tag_stats.tag_post_count(self.tag.pk) if self.tag else 0
+        return self._post_count
+
+    def get_paginator(self, *args, **kwargs):
+        paginator = super().get_paginator(*args, **kwargs)
+        paginator.count = self.get_post_count()
+        return paginator
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Pass the tag name to the template for display
-        context['tag_name'] = self.tag_slug.replace('-', ' ').title()
+        context['tag_name'] = self.tag.name if self.tag else self.tag_slug
+        context['post_count'] = self.get_post_count()
+        context['related_tags'] = tag_stats.related_tags(self.tag.pk) if self.tag else []
+        add_tag_cloud_context(context)
+        return context
+
+
+def add_tag_cloud_context(context):
+    # Passed uncalled: the template only calls it when the cached fragment is stale
+    context['tag_cloud'] = tag_stats.tag_cloud
+    context['tag_stats_version'] = tag_stats.get_tag_stats_version()
+
+
+def tag_cloud_view(request):
+    """All tags as a cloud, plus the tags trending over the last TRENDING_WINDOWS days."""
+    context = {
+        'trending': [{'days': days, 'tags': tag_stats.trending_tags(days)} for days in TRENDING_WINDOWS],
+    }
+    add_tag_cloud_context(context)
+    return render(request, 'blog/tags.html', context)
+
+
+def add_archive_context(context, author=None):
+    # Passed uncalled: the template only calls it when the cached sidebar is stale
+    context['archive_months'] = partial(archive.archive_months, author.pk if author else None)
+    context['archive_author'] = author
+    context['archive_version'] = archive.get_archive_version()
+
+
+class PostArchiveView(KeysetPaginationMixin, ListView):
+    """
+    An author's posts (author/<username>/), the posts of a year or month
+    (archive/<year>/<month>/), or an author's posts of a year or month.
+    Posts are read through the (author, published_date) index and page
+    counts come from the precomputed month counts (blog/archive.py).
+    """
+    model = Post
+    template_name = 'blog/post_archive.html'
+    context_object_name = 'posts'
+    ordering = ['-published_date', '-pk']
+    paginate_by = 5
+
+    def get_queryset(self):
+        self.author = None
+        if 'username' in self.kwargs:
+            self.author = get_object_or_404(User, username=self.kwargs['username'])
+        self.year = self.kwargs.get('year')
+        self.month = self.kwargs.get('month')
+
+        queryset = Post.objects.select_related('author').prefetch_related('tags').order_by(*self.ordering)
+        if self.author:
+            queryset = queryset.filter(author=self.author)
+        if self.year is not None:
+            # Year 0 and month 0 are rejected by month_range() too
+            try:
+                start, end = archive.month_range(self.year, self.month)
+            except ValueError:
+                raise Http404('No such month.')
+            queryset = queryset.filter(published_date__gte=start, published_date__lt=end)
+        return queryset
+
+    def get_post_count(self):
+        if not hasattr(self, '_post_count'):
+            author_id = self.author.pk if self.author else None
+            if self.year is not None:
+                self._post_count = archive.archive_count(self.year, self.month, author_id)
+            elif self.author:
+                self._post_count = counters.get_count(counters.author_posts_key(author_id))
+            else:
+                self._post_count = counters.get_count(counters.TOTAL_POSTS)
+        return self._post_count
+
+    def get_paginator(self, *args, **kwargs):
+        paginator = super().get_paginator(*args, **kwargs)
+        paginator.count = self.get_post_count()
+        return paginator
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['author'] = self.author
+        context['year'] = self.year
+        context['month'] = date(self.year, self.month, 1) if self.month is not None else None
+        context['post_count'] = self.get_post_count()
+        add_archive_context(context, self.author)
         return context
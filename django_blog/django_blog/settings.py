@@ -92,6 +92,27 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Post detail fragments and anonymous pages are cached here (blog/caching.py).
+# Use a shared backend such as Redis or Memcached when running several workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'django-blog',
+    }
+}
+
+# New comments posted as JSON are queued and written in batches by a
+# background thread (blog/comment_queue.py).
+BLOG_COMMENT_BATCH_SIZE = 100
+BLOG_COMMENT_FLUSH_INTERVAL = 0.5  # seconds
+BLOG_COMMENT_QUEUE_WORKER = True
+BLOG_COMMENT_MAX_ATTEMPTS = 5
+BLOG_COMMENT_RETRY_DELAY = 1.0  # seconds, doubled after each failure
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 